@@ -4,6 +4,7 @@
 
 from media_viewer import (
     vars,
+    sequences,
     props,
     opsdata,
     ops,
@@ -38,6 +39,7 @@ if _need_reload:
     import importlib
 
     vars = importlib.reload(vars)
+    sequences = importlib.reload(sequences)
     props = importlib.reload(props)
     opsdata = importlib.reload(opsdata)
     log = importlib.reload(log)
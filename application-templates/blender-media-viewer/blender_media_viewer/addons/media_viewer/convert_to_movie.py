@@ -3,70 +3,14 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import sys
-import re
 from pathlib import Path
 import bpy
-from typing import List, Union, Any, Dict, Optional
 
-PATTERN_FRAME_COUNTER = r"\d+$"
-
-
-def get_frame_counter(filepath: Path) -> Optional[str]:
-    # Match for frame counter
-    match = re.search(PATTERN_FRAME_COUNTER, filepath.stem)
-
-    # If input filepath has no counter
-    if not match:
-        return None
-
-    return match.group(0)
-
-
-def get_image_sequence(filepath: Path) -> List[Path]:
-    """
-    Returns list of filepath objects. If input filepath is part
-    of an image sequence it will return all found items of sequence.
-    If filepath is not part of sequence it will just return it
-    as a single item list.
-    """
-    # Matches continuos number sequence end of string.
-    # Which follows format for most frame counters.
-
-    # Match for frame counter
-    frame_counter = get_frame_counter(filepath)
-
-    # If input filepath has no counter
-    # return list with only input item.
-    if not frame_counter:
-        return [filepath]
-
-    filename_no_counter = filepath.stem.replace(frame_counter, "")
-    files: List[Path] = []
-
-    for item in filepath.parent.iterdir():
-
-        # Continue if directory.
-        if not item.is_file():
-            continue
-
-        # Continue if different suffix.
-        if item.suffix != filepath.suffix:
-            continue
-
-        # Continue if file has no counter.
-        frame_counter = get_frame_counter(item)
-        if not frame_counter:
-            continue
-
-        # If filename is same as filename_no_counter it
-        # is part of a the same sequence.
-        if item.stem.replace(frame_counter, "") == filename_no_counter:
-            files.append(item)
-
-    # Sort files list.
-    files.sort(key=lambda file: file.name)
-
-    return files
+# This script runs in a separate Blender process, media_viewer is not
+# registered there. sequences.py only depends on the standard library,
+# so import it directly from this folder.
+sys.path.append(Path(__file__).parent.as_posix())
+from sequences import get_sequence  # noqa: E402
 
 
 # Get cli input.
@@ -88,9 +32,16 @@ except IndexError:
 
 input_path = Path(argv[0])
 output_path = Path(argv[1])
-filepath_list = get_image_sequence(input_path)
+sequence = get_sequence(input_path)
+filepath_list = sequence.filepaths if sequence else [input_path]
 start_frame = 1
 
+if sequence and sequence.gaps:
+    print(
+        f"WARNING: Image sequence is missing {len(sequence.missing_frames)} frames, "
+        "they will be skipped in the movie."
+    )
+
 # Load image sequence in Sequence Editor.
 # Create new image strip.
 strip = bpy.context.scene.sequence_editor.strips.new_image(
@@ -241,10 +241,15 @@ class MV_OT_load_media_image(bpy.types.Operator):
         # Is reported here: https://developer.blender.org/T94599
         # opsdata.del_all_images()
 
+        sequence = None
         if self.load_sequence:
             # Detect image sequence.
-            file_list = opsdata.get_image_sequence(filepath)
+            sequence = opsdata.get_sequence(filepath)
+
+        if sequence and len(sequence) > 1:
+            file_list = sequence.filepaths
         else:
+            sequence = None
             file_list = [filepath]
 
         # Create new image datablock.
@@ -260,19 +265,23 @@ class MV_OT_load_media_image(bpy.types.Operator):
 
         # If sequence should be loaded and sequence actually detected
         # set source to SEQUENCE and correct frame range settings
-        if self.load_sequence and len(file_list) > 1:
+        if sequence:
             image.source = "SEQUENCE"
 
-            # Get frame counters from filepaths. Will always work because
-            # we already check for image sequence len. Check: opsdata.get_image_sequence
-            first_frame = opsdata.get_frame_counter(file_list[0])
-            last_frame = opsdata.get_frame_counter(file_list[-1])
+            first_frame = sequence.first_frame
+            last_frame = sequence.last_frame
             current_frame = opsdata.get_frame_counter(filepath)
 
             logger.info("Detected image sequence (%s - %s)", first_frame, last_frame)
+            if not sequence.is_complete:
+                logger.warning(
+                    "Image sequence is missing %i frames: %s",
+                    len(sequence.missing_frames),
+                    ", ".join(f"{start}-{end}" if start != end else str(start) for start, end in sequence.gaps),
+                )
 
-            context.scene.frame_start = int(first_frame)
-            context.scene.frame_end = int(last_frame)
+            context.scene.frame_start = first_frame
+            context.scene.frame_end = last_frame
 
             # Set playhead frame counter of clicked image.
             if current_frame:
@@ -939,15 +948,11 @@ class MV_OT_next_media_file(bpy.types.Operator):
             return {"FINISHED"}
 
         # Get all files and folders and sort them alphabetically.
-        file_list = [
-            p for p in Path(prev_dirpath).iterdir() if not p.name.startswith(".")
-        ]
+        file_list = opsdata.get_directory_entries(Path(prev_dirpath))
         if not file_list:
             logger.info("Empty directory: %s", prev_dirpath.as_posix())
             return {"CANCELLED"}
 
-        file_list.sort(key=lambda p: p.name)
-
         # If there was not previous filepath take the first file.
         if not prev_relpath:
             filepath = file_list[0]
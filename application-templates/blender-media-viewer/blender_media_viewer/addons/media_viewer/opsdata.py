@@ -11,7 +11,7 @@ from datetime import datetime
 
 import bpy
 
-from media_viewer import vars
+from media_viewer import vars, sequences
 from media_viewer.log import LoggerFactory
 
 # MEDIA VIEWER
@@ -278,45 +278,21 @@ def get_image_sequence(filepath: Path) -> List[Path]:
     of an image sequence it will return all found items of sequence.
     If filepath is not part of sequence it will just return it
     as a single item list.
+    Directory listings are cached, check: sequences.get_directory_index
     """
-    # Matches continuos number sequence end of string.
-    # Which follows format for most frame counters.
+    return sequences.get_image_sequence(filepath)
 
-    # Match for frame counter
-    frame_counter = get_frame_counter(filepath)
-
-    # If input filepath has no counter
-    # return list with only input item.
-    if not frame_counter:
-        return [filepath]
-
-    filename_no_counter = filepath.stem.replace(frame_counter, "")
-    files: List[Path] = []
 
-    for item in filepath.parent.iterdir():
+def get_sequence(filepath: Path) -> Optional[sequences.ImageSequence]:
+    return sequences.get_sequence(filepath)
 
-        # Continue if directory.
-        if not item.is_file():
-            continue
-
-        # Continue if different suffix.
-        if item.suffix != filepath.suffix:
-            continue
 
-        # Continue if file has no counter.
-        frame_counter = get_frame_counter(item)
-        if not frame_counter:
-            continue
-
-        # If filename is same as filename_no_counter it
-        # is part of a the same sequence.
-        if item.stem.replace(frame_counter, "") == filename_no_counter:
-            files.append(item)
-
-    # Sort files list.
-    files.sort(key=lambda file: file.name)
-
-    return files
+def get_directory_entries(directory: Path) -> List[Path]:
+    """
+    Returns all non hidden files and folders of directory sorted by name.
+    Uses the same cached scan as the image sequence detection.
+    """
+    return sequences.get_directory_index(directory).paths
 
 
 def get_frame_counter(filepath: Path) -> Optional[str]:
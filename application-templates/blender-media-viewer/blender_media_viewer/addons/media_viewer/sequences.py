@@ -0,0 +1,267 @@
+# SPDX-FileCopyrightText: 2021 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Image sequence detection for whole directories.
+
+A directory is scanned once with os.scandir and every file that ends on a
+frame counter is grouped into an ImageSequence by (prefix, padding, suffix). The
+result is cached per directory and only rebuilt when the directory mtime changes,
+so clicking through the frames of a sequence does not touch the disk again.
+
+This module only depends on the standard library so it can also be imported
+by convert_to_movie.py, which runs in a separate background Blender process.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Matches continuous number sequence at end of string.
+# Which follows format for most frame counters.
+PATTERN_FRAME_COUNTER = re.compile(r"\d+$")
+
+# Directories modified less than this many seconds before they were scanned are
+# scanned again on the next access, since a change in the same mtime tick would
+# go unnoticed.
+RACY_SECONDS = 2.0
+
+SequenceKey = Tuple[str, int, str]
+
+
+@dataclass
+class ImageSequence:
+    """
+    Group of files in one directory that share prefix, suffix and padding and
+    only differ by their frame counter, e.G: shot_0010.jpg, shot_0011.jpg.
+    """
+
+    directory: Path
+    prefix: str
+    suffix: str
+    padding: int
+    # Frame number -> filename.
+    frames: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def key(self) -> SequenceKey:
+        return (self.prefix, self.padding, self.suffix)
+
+    @property
+    def frame_numbers(self) -> List[int]:
+        return sorted(self.frames)
+
+    @property
+    def first_frame(self) -> int:
+        return min(self.frames)
+
+    @property
+    def last_frame(self) -> int:
+        return max(self.frames)
+
+    @property
+    def filepaths(self) -> List[Path]:
+        return [self.directory.joinpath(self.frames[f]) for f in self.frame_numbers]
+
+    @property
+    def missing_frames(self) -> List[int]:
+        """
+        Returns list of frame numbers between first and last frame that have no file.
+        """
+        return [
+            f for f in range(self.first_frame, self.last_frame + 1) if f not in self.frames
+        ]
+
+    @property
+    def gaps(self) -> List[Tuple[int, int]]:
+        """
+        Returns list of (first_missing, last_missing) frame ranges, both inclusive.
+        """
+        gaps: List[Tuple[int, int]] = []
+        frame_numbers = self.frame_numbers
+        for prev, cur in zip(frame_numbers, frame_numbers[1:]):
+            if cur - prev > 1:
+                gaps.append((prev + 1, cur - 1))
+        return gaps
+
+    @property
+    def is_complete(self) -> bool:
+        return len(self.frames) == self.last_frame - self.first_frame + 1
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+@dataclass
+class DirectoryIndex:
+    """
+    Result of one scan of a directory. Holds all visible entry names
+    and all image sequences found in it.
+    """
+
+    directory: Path
+    mtime_ns: int
+    scan_time: float = field(default_factory=time.time)
+    # All non hidden entries (files and folders), sorted by name.
+    names: List[str] = field(default_factory=list)
+    sequences: Dict[SequenceKey, ImageSequence] = field(default_factory=dict)
+    # Filename -> sequence key for every file that has a frame counter.
+    _file_to_key: Dict[str, SequenceKey] = field(default_factory=dict)
+
+    def get_sequence(self, filename: str) -> Optional[ImageSequence]:
+        key = self._file_to_key.get(filename)
+        if key is None:
+            return None
+        return self.sequences[key]
+
+    @property
+    def paths(self) -> List[Path]:
+        return [self.directory.joinpath(name) for name in self.names]
+
+    def is_valid(self, mtime_ns: int) -> bool:
+        if mtime_ns != self.mtime_ns:
+            return False
+        return self.scan_time - mtime_ns / 1e9 > RACY_SECONDS
+
+
+# Directory path -> DirectoryIndex.
+_index_cache: Dict[str, DirectoryIndex] = {}
+
+
+def split_frame_counter(filename: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Splits filename in (prefix, frame_counter, suffix).
+    Returns None if the filename stem does not end on a frame counter.
+    """
+    stem, suffix = os.path.splitext(filename)
+    match = PATTERN_FRAME_COUNTER.search(stem)
+    if not match:
+        return None
+    return stem[: match.start()], match.group(0), suffix
+
+
+def is_zero_padded(counter: str) -> bool:
+    return len(counter) > 1 and counter.startswith("0")
+
+
+def get_counter_padding(counter: str, paddings: List[int], default: int) -> int:
+    """
+    Returns the padding of the sequence a frame counter belongs to. Zero padded
+    counters define the padding. Counters without leading zero fit any padding
+    up to their length (shot_1000 is part of shot_0001), so they are assigned
+    to the largest of those paddings, or to default if there is none. scan_directory
+    moves them to their own sequence if their frame is already taken.
+    """
+    if is_zero_padded(counter):
+        return len(counter)
+    fitting = [p for p in paddings if p <= len(counter)]
+    return max(fitting) if fitting else default
+
+
+def scan_directory(directory: Path) -> DirectoryIndex:
+    """
+    Builds a DirectoryIndex with a single os.scandir pass.
+    Only the directory itself is stat'ed, entries are classified with
+    the type information scandir already provides.
+    """
+    index = DirectoryIndex(directory=directory, mtime_ns=os.stat(directory).st_mtime_ns)
+    # (prefix, suffix) -> [(frame counter, filename)].
+    counters: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+
+            index.names.append(entry.name)
+
+            if not entry.is_file():
+                continue
+
+            split = split_frame_counter(entry.name)
+            if not split:
+                continue
+
+            prefix, counter, suffix = split
+            counters.setdefault((prefix, suffix), []).append((counter, entry.name))
+
+    for (prefix, suffix), entries in counters.items():
+        # Split files with the same prefix and suffix by padding, so shot_001 and
+        # shot_0001 end up in different sequences instead of replacing each other.
+        paddings = sorted({len(c) for c, _name in entries if is_zero_padded(c)})
+        # Counters without padding, like shot_9, shot_10, form a single sequence.
+        default = min(paddings or [len(c) for c, _name in entries])
+        # Add zero padded counters first, so the collision check below doesn't
+        # depend on the order of the directory entries.
+        entries.sort(key=lambda entry: not is_zero_padded(entry[0]))
+        for counter, name in entries:
+            padding = get_counter_padding(counter, paddings, default)
+            key = (prefix, padding, suffix)
+            sequence = index.sequences.get(key)
+            if sequence and int(counter) in sequence.frames:
+                # An unpadded counter shorter than the padding, like shot_10 next
+                # to shot_0010, gets its own sequence instead of replacing the frame.
+                padding = len(counter)
+                key = (prefix, padding, suffix)
+                sequence = index.sequences.get(key)
+            if not sequence:
+                sequence = ImageSequence(
+                    directory=directory, prefix=prefix, suffix=suffix, padding=padding
+                )
+                index.sequences[key] = sequence
+            sequence.frames[int(counter)] = name
+            index._file_to_key[name] = key
+
+    index.names.sort()
+    return index
+
+
+def get_directory_index(directory: Path) -> DirectoryIndex:
+    """
+    Returns cached DirectoryIndex of directory. Cache is invalidated
+    when the directory mtime changes (files were added, removed or renamed),
+    or when the directory was modified too shortly before it was scanned.
+    """
+    directory = Path(directory)
+    cache_key = directory.as_posix()
+    mtime_ns = os.stat(directory).st_mtime_ns
+
+    index = _index_cache.get(cache_key)
+    if index and index.is_valid(mtime_ns):
+        return index
+
+    index = scan_directory(directory)
+    _index_cache[cache_key] = index
+    return index
+
+
+def get_sequence(filepath: Path) -> Optional[ImageSequence]:
+    """
+    Returns the ImageSequence filepath is part of or None if
+    filepath has no frame counter.
+    """
+    filepath = Path(filepath)
+    if not split_frame_counter(filepath.name):
+        return None
+    return get_directory_index(filepath.parent).get_sequence(filepath.name)
+
+
+def get_image_sequence(filepath: Path) -> List[Path]:
+    """
+    Returns list of filepath objects. If input filepath is part
+    of an image sequence it will return all found items of sequence,
+    sorted by frame number. If filepath is not part of sequence it will
+    just return it as a single item list.
+    """
+    sequence = get_sequence(filepath)
+    if not sequence:
+        return [Path(filepath)]
+    return sequence.filepaths
+
+
+def clear_cache() -> None:
+    _index_cache.clear()
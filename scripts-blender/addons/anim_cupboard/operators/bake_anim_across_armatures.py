@@ -2,10 +2,13 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from typing import List
+from typing import Dict, List
 
 import bpy
-from bpy.types import Operator
+import numpy as np
+from bpy.props import StringProperty
+from bpy.types import Action, Object, Operator
+from mathutils import Matrix, Quaternion
 
 
 def keyed_bones_names(action) -> List[str]:
@@ -15,7 +18,7 @@ def keyed_bones_names(action) -> List[str]:
         # Extracting bone name from fcurve data path
         if "pose.bones" not in fc.data_path:
             continue
-        bone_name = fc.data_path.split('["')[1].split('"]')[0]
+        bone_name = bpy.utils.unescape_identifier(fc.data_path.split('["')[1].split('"]')[0])
 
         if bone_name not in keyed_bones:
             keyed_bones.append(bone_name)
@@ -23,12 +26,243 @@ def keyed_bones_names(action) -> List[str]:
     return keyed_bones
 
 
+def parse_bone_map(bone_map: str) -> Dict[str, str]:
+    """Parse a string of comma-separated "source:target" bone name pairs."""
+    mapping = {}
+    for pair in bone_map.split(","):
+        if not pair.strip():
+            continue
+        if ":" not in pair:
+            raise ValueError(f'Bone mapping "{pair.strip()}" should look like "source:target".')
+        source, target = pair.split(":", 1)
+        mapping[source.strip()] = target.strip()
+    return mapping
+
+
+def get_pose_matrices(rig: Object, prop="matrix") -> np.ndarray:
+    """Return a matrix property of all pose bones as an array of shape (bones, 4, 4)."""
+    matrices = np.empty(len(rig.pose.bones) * 16, dtype=np.float32)
+    rig.pose.bones.foreach_get(prop, matrices)
+    # Matrices come out column-major.
+    return matrices.reshape(-1, 4, 4).transpose(0, 2, 1)
+
+
+def has_default_inheritance(bone) -> bool:
+    return bone.use_inherit_rotation and bone.inherit_scale == 'FULL' and bone.use_local_location
+
+
+def convert_local_to_pose(bone, matrices: np.ndarray, parent_poses: np.ndarray, invert=False) -> np.ndarray:
+    """Frame by frame conversion for bones with special inheritance settings, which
+    Blender knows how to handle."""
+    kwargs = {}
+    if bone.parent:
+        kwargs['parent_matrix_local'] = bone.parent.matrix_local
+    converted = []
+    for matrix, parent_pose in zip(matrices, parent_poses):
+        if bone.parent:
+            kwargs['parent_matrix'] = Matrix(parent_pose.tolist())
+        converted.append(
+            bone.convert_local_to_pose(
+                Matrix(matrix.tolist()), bone.matrix_local, invert=invert, **kwargs
+            )
+        )
+    return np.array(converted, dtype=np.float32)
+
+
+def matrices_to_quaternions(rot: np.ndarray) -> np.ndarray:
+    """Convert an array of 3x3 rotation matrices to (w, x, y, z) quaternions,
+    keeping consecutive quaternions on the same hemisphere."""
+    m = rot
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    quats = np.empty((len(m), 4), dtype=np.float64)
+
+    # Pick the numerically stable formula for each matrix.
+    diag = np.stack([trace, m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]], axis=1)
+    case = np.argmax(diag, axis=1)
+
+    c = case == 0
+    s = np.sqrt(np.maximum(trace[c] + 1.0, 1e-12)) * 2
+    quats[c] = np.stack([
+        0.25 * s,
+        (m[c, 2, 1] - m[c, 1, 2]) / s,
+        (m[c, 0, 2] - m[c, 2, 0]) / s,
+        (m[c, 1, 0] - m[c, 0, 1]) / s,
+    ], axis=1)
+    c = case == 1
+    s = np.sqrt(np.maximum(1.0 + m[c, 0, 0] - m[c, 1, 1] - m[c, 2, 2], 1e-12)) * 2
+    quats[c] = np.stack([
+        (m[c, 2, 1] - m[c, 1, 2]) / s,
+        0.25 * s,
+        (m[c, 0, 1] + m[c, 1, 0]) / s,
+        (m[c, 0, 2] + m[c, 2, 0]) / s,
+    ], axis=1)
+    c = case == 2
+    s = np.sqrt(np.maximum(1.0 + m[c, 1, 1] - m[c, 0, 0] - m[c, 2, 2], 1e-12)) * 2
+    quats[c] = np.stack([
+        (m[c, 0, 2] - m[c, 2, 0]) / s,
+        (m[c, 0, 1] + m[c, 1, 0]) / s,
+        0.25 * s,
+        (m[c, 1, 2] + m[c, 2, 1]) / s,
+    ], axis=1)
+    c = case == 3
+    s = np.sqrt(np.maximum(1.0 + m[c, 2, 2] - m[c, 0, 0] - m[c, 1, 1], 1e-12)) * 2
+    quats[c] = np.stack([
+        (m[c, 1, 0] - m[c, 0, 1]) / s,
+        (m[c, 0, 2] + m[c, 2, 0]) / s,
+        (m[c, 1, 2] + m[c, 2, 1]) / s,
+        0.25 * s,
+    ], axis=1)
+
+    quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+
+    # Avoid flipping between q and -q from one frame to the next.
+    flips = np.einsum('ij,ij->i', quats[1:], quats[:-1]) < 0
+    signs = np.cumprod(np.where(flips, -1.0, 1.0))
+    quats[1:] *= signs[:, None]
+    return quats
+
+
+def decompose_matrices(matrices: np.ndarray, rotation_mode: str) -> Dict[str, np.ndarray]:
+    """Split an array of local matrices into location, rotation and scale channels,
+    as (frames, channels) arrays keyed by pose bone property name."""
+    loc = matrices[:, :3, 3]
+    basis = matrices[:, :3, :3]
+    scale = np.linalg.norm(basis, axis=1)
+    # A negative determinant means a negative scale, which is put on all axes like in mathutils.
+    negative = np.linalg.det(basis) < 0
+    scale[negative] *= -1
+    rot = basis / scale[:, None, :]
+    quats = matrices_to_quaternions(rot)
+
+    channels = {'location': loc, 'scale': scale}
+    if rotation_mode == 'QUATERNION':
+        channels['rotation_quaternion'] = quats
+    elif rotation_mode == 'AXIS_ANGLE':
+        angle = 2 * np.arccos(np.clip(quats[:, 0], -1, 1))
+        axis = quats[:, 1:] / np.maximum(np.sqrt(1 - quats[:, :1] ** 2), 1e-8)
+        axis[angle < 1e-8] = (0, 1, 0)
+        channels['rotation_axis_angle'] = np.column_stack([angle, axis])
+    else:
+        # Euler conversion depends on the previous frame to avoid flips, so it's sequential.
+        eulers = np.empty((len(quats), 3), dtype=np.float64)
+        prev = None
+        for i, quat in enumerate(quats.tolist()):
+            if prev:
+                euler = Quaternion(quat).to_euler(rotation_mode, prev)
+            else:
+                euler = Quaternion(quat).to_euler(rotation_mode)
+            eulers[i] = euler
+            prev = euler
+        channels['rotation_euler'] = eulers
+    return channels
+
+
+def sample_pose_matrices(
+    context, src_rig: Object, target_rig: Object, frames: range
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Step through the frames once, and return for each frame the pose matrices of the
+    source bones in the target armature's space, and the pose and local matrices of
+    the target bones."""
+    scene = context.scene
+    frame_backup = scene.frame_current, scene.frame_subframe
+
+    src_poses, target_poses, target_locals = [], [], []
+    for frame in frames:
+        scene.frame_set(frame)
+        src_to_target = np.array(
+            target_rig.matrix_world.inverted() @ src_rig.matrix_world, dtype=np.float32
+        )
+        src_poses.append(src_to_target @ get_pose_matrices(src_rig))
+        target_poses.append(get_pose_matrices(target_rig))
+        target_locals.append(get_pose_matrices(target_rig, "matrix_basis"))
+
+    scene.frame_set(*frame_backup)
+    return np.array(src_poses), np.array(target_poses), np.array(target_locals)
+
+
+def bake_local_matrices(
+    target_rig: Object,
+    bone_pairs: Dict[str, str],
+    src_poses: np.ndarray,
+    src_indices: Dict[str, int],
+    target_poses: np.ndarray,
+    target_locals: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """Compute the local matrices that make each target bone match the pose of its
+    source bone, the same way visual keying a Copy Transforms constraint would.
+    Return (frames, 4, 4) arrays keyed by target bone name."""
+    num_frames = len(src_poses)
+    baked_locals = {}
+    # Final pose matrix of each target bone, once its parents are baked.
+    poses = {}
+    # Target bones that are baked, or have a baked parent, so their pose changes.
+    affected = set()
+
+    target_indices = {pb.name: i for i, pb in enumerate(target_rig.pose.bones)}
+    # Parents before children.
+    bones = sorted(target_rig.data.bones, key=lambda b: len(b.parent_recursive))
+    for bone in bones:
+        i = target_indices[bone.name]
+        parent = bone.parent
+        is_baked = bone.name in bone_pairs
+        if not is_baked and not (parent and parent.name in affected):
+            poses[bone.name] = target_poses[:, i]
+            continue
+        affected.add(bone.name)
+
+        rest = np.array(bone.matrix_local, dtype=np.float32)
+        if parent:
+            parent_pose = poses[parent.name]
+            parent_rest = np.array(parent.matrix_local, dtype=np.float32)
+            rest_rel = np.linalg.inv(parent_rest) @ rest
+        else:
+            parent_pose = np.broadcast_to(np.identity(4, dtype=np.float32), (num_frames, 4, 4))
+            rest_rel = rest
+
+        if is_baked:
+            pose = src_poses[:, src_indices[bone_pairs[bone.name]]]
+            if has_default_inheritance(bone):
+                local = np.linalg.inv(rest_rel) @ np.linalg.inv(parent_pose) @ pose
+            else:
+                local = convert_local_to_pose(bone, pose, parent_pose, invert=True)
+            baked_locals[bone.name] = local
+        else:
+            # Not baked, but follows a baked parent.
+            local = target_locals[:, i]
+            if has_default_inheritance(bone):
+                pose = parent_pose @ rest_rel @ local
+            else:
+                pose = convert_local_to_pose(bone, local, parent_pose)
+        poses[bone.name] = pose
+
+    return baked_locals
+
+
+def write_channels(action: Action, bone_name: str, frames: range, channels: Dict[str, np.ndarray]):
+    """Create one F-Curve per channel, and fill all its keyframes at once."""
+    frame_array = np.array(frames, dtype=np.float32)
+    for prop_name, values in channels.items():
+        data_path = f'pose.bones["{bpy.utils.escape_identifier(bone_name)}"].{prop_name}'
+        for index in range(values.shape[1]):
+            fc = action.fcurves.new(data_path, index=index, action_group=bone_name)
+            fc.keyframe_points.add(len(frame_array))
+            co = np.column_stack([frame_array, values[:, index]]).astype(np.float32)
+            fc.keyframe_points.foreach_set('co', co.ravel())
+            fc.update()
+
+
 class POSE_OT_bake_anim_across_armatures(Operator):
-    """Constrain one armature to another, and bake over the animation"""
+    """Bake the animation of the active armature's keyed bones onto the matching bones of the other selected armature"""
     bl_idname = "pose.bake_anim_across_armatures"
     bl_label = "Bake Animation From Active To Selected Armature"
     bl_options = {'REGISTER', 'UNDO'}
 
+    bone_map: StringProperty(
+        name="Bone Mapping",
+        description='Comma-separated "source:target" pairs of bone names, for bones whose names differ between the two armatures. Other bones are baked to the bone with the same name',
+        default="",
+    )
+
     @classmethod
     def poll(cls, context):
         if context.mode != 'OBJECT':
@@ -39,7 +273,7 @@ class POSE_OT_bake_anim_across_armatures(Operator):
             return False
         if not context.object in context.selected_objects:
             return False
-        if not context.object.animation_data and not context.object.animation_data.action:
+        if not context.object.animation_data or not context.object.animation_data.action:
             return False
         return True
 
@@ -50,32 +284,55 @@ class POSE_OT_bake_anim_across_armatures(Operator):
         if src_rig == target_rig:
             target_rig = context.selected_objects[1]
 
-        bone_layer_backup = target_rig.data.layers[:]
-        # Enable all target rig layers
-        target_rig.data.layers = [True]*32
+        try:
+            name_map = parse_bone_map(self.bone_map)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
 
-        # Deselect all target rig bones
-        for b in target_rig.data.bones:
-            b.select = False
-
-        keyed_bones = [src_rig.pose.bones.get(bn) for bn in keyed_bones_names(
-            action) if bn in src_rig.pose.bones]
-        for pb in keyed_bones:
-            # TODO: Bone name mapping based on a passed dictionary.
-            target_bone = target_rig.pose.bones.get(pb.name)
-            if not target_bone:
+        # Target bone name -> source bone name.
+        bone_pairs = {}
+        for src_name in keyed_bones_names(action):
+            if src_name not in src_rig.pose.bones:
+                continue
+            target_name = name_map.get(src_name, src_name)
+            if target_name not in target_rig.pose.bones:
                 continue
+            if target_name in bone_pairs:
+                self.report(
+                    {'ERROR'},
+                    f'Both "{bone_pairs[target_name]}" and "{src_name}" would be baked to "{target_name}". Check the Bone Mapping.',
+                )
+                return {'CANCELLED'}
+            bone_pairs[target_name] = src_name
+        if not bone_pairs:
+            self.report({'ERROR'}, "No keyed bones of the active armature exist in the target armature.")
+            return {'CANCELLED'}
+
+        frame_start, frame_end = (int(f) for f in action.frame_range)
+        frames = range(frame_start, frame_end + 1)
+
+        src_poses, target_poses, target_locals = sample_pose_matrices(
+            context, src_rig, target_rig, frames
+        )
+        src_indices = {pb.name: i for i, pb in enumerate(src_rig.pose.bones)}
+        baked_locals = bake_local_matrices(
+            target_rig, bone_pairs, src_poses, src_indices, target_poses, target_locals
+        )
 
-            ct = target_bone.constraints.new(type='COPY_TRANSFORMS')
-            ct.target = src_rig
-            ct.subtarget = target_bone.name
-            target_bone.bone.select = True
+        baked_action = bpy.data.actions.new(f"{target_rig.name}_{action.name}")
+        for bone_name, local_matrices in baked_locals.items():
+            rotation_mode = target_rig.pose.bones[bone_name].rotation_mode
+            channels = decompose_matrices(local_matrices, rotation_mode)
+            write_channels(baked_action, bone_name, frames, channels)
 
-        src_rig.select_set(False)
-        bpy.ops.nla.bake(visual_keying=True,
-                         clear_constraints=True, bake_types={'POSE'})
-        target_rig.data.layers = bone_layer_backup[:]
+        if not target_rig.animation_data:
+            target_rig.animation_data_create()
+        target_rig.animation_data.action = baked_action
 
+        self.report(
+            {'INFO'}, f"Baked {len(baked_locals)} bones over {len(frames)} frames."
+        )
         return {'FINISHED'}
 
 
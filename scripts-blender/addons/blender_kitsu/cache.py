@@ -42,6 +42,8 @@ _asset_type_active: AssetType = AssetType()
 _task_type_active: TaskType = TaskType()
 _user_active: User = User()
 _user_all_tasks: List[Task] = []
+_user_all_tasks_statuses: Dict[str, Dict[str, Any]] = {}
+_user_all_tasks_entities: Dict[str, Dict[str, Any]] = {}
 
 _cache_initialized: bool = False
 _cache_startup_initialized: bool = False
@@ -606,19 +608,31 @@ def get_all_task_statuses_enum(
     return _task_statuses_enum_list
 
 
-def load_user_all_tasks(context: bpy.types.Context) -> List[Task]:
+def set_user_all_tasks(context: bpy.types.Context, tasks: List[Task]) -> None:
     global _user_all_tasks
-    global _user_active
 
-    tasks = _user_active.all_tasks_to_do()
     _user_all_tasks.clear()
     _user_all_tasks.extend(tasks)
 
     _update_tasks_collection_prop(context)
 
-    logger.debug("Loaded assigned tasks for: %s", _user_active.full_name)
 
-    return _user_all_tasks
+def set_user_all_tasks_details(
+    context: bpy.types.Context,
+    task_statuses: Optional[Dict[str, Dict[str, Any]]] = None,
+    entities: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> None:
+    """Store task statuses and entities referenced by the user tasks, by ID,
+    and show them in the tasks collection property."""
+    global _user_all_tasks_statuses
+    global _user_all_tasks_entities
+
+    if task_statuses is not None:
+        _user_all_tasks_statuses = task_statuses
+    if entities is not None:
+        _user_all_tasks_entities = entities
+
+    _update_tasks_details(context)
 
 
 def _update_tasks_collection_prop(context: bpy.types.Context) -> None:
@@ -641,10 +655,25 @@ def _update_tasks_collection_prop(context: bpy.types.Context) -> None:
         item.task_type_id = task.task_type_id
         item.task_type_name = task.task_type_name
 
+    _update_tasks_details(context)
+
     # Update index.
     idx = len(tasks_coll_prop) - 1
 
 
+def _update_tasks_details(context: bpy.types.Context) -> None:
+    global _user_all_tasks_statuses
+    global _user_all_tasks_entities
+    addon_prefs = addon_prefs_get(context)
+
+    for item, task in zip(addon_prefs.tasks, _user_all_tasks):
+        task_status = _user_all_tasks_statuses.get(task.task_status_id)
+        item.task_status_name = task_status["short_name"] if task_status else ""
+
+        entity = _user_all_tasks_entities.get(task.entity_id, {})
+        item.frame_count = entity.get("nb_frames") or 0
+
+
 def get_user_all_tasks_enum(
     self: bpy.types.Operator, context: bpy.types.Context
 ) -> List[Tuple[str, str, str]]:
@@ -701,9 +730,11 @@ def init_startup_variables(context: bpy.types.Context) -> None:
     _user_active = User()
     logger.debug("Initiated active user cache to: %s", _user_active.full_name)
 
-    # User Tasks.
-    load_user_all_tasks(context)
-    logger.debug("Initiated active user tasks")
+    # User Tasks, loaded in the background so opening a file doesn't block the UI.
+    from .tasks import opsdata as tasks_opsdata
+
+    tasks_opsdata.load_user_tasks_in_background()
+    logger.debug("Started loading active user tasks")
 
     _cache_startup_initialized = True
 
@@ -716,7 +747,12 @@ def clear_startup_variables():
     _user_active = User()
     logger.debug("Cleared active user cache")
 
+    from .tasks import opsdata as tasks_opsdata
+
+    tasks_opsdata.cancel_user_tasks_loading()
     _user_all_tasks.clear()
+    _user_all_tasks_statuses.clear()
+    _user_all_tasks_entities.clear()
     _update_tasks_collection_prop(bpy.context)
     logger.debug("Cleared active user all tasks cache")
 
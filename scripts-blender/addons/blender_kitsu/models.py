@@ -2,9 +2,12 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import os
 import re
+import time
 
 from pathlib import Path
+from stat import S_ISDIR
 from typing import Union, Optional, Dict, List, Tuple
 
 from . import bkglobals
@@ -13,6 +16,70 @@ from .logger import LoggerFactory
 logger = LoggerFactory.getLogger(__name__)
 
 
+class DirectoryListing:
+    """Names of the folders and files of a directory, sorted in reverse order."""
+
+    # Directories modified less than this many seconds before they were scanned are scanned
+    # again on the next access, since a change in the same mtime tick would go unnoticed.
+    RACY_SECONDS = 2.0
+
+    def __init__(self, path: str, mtime_ns: int):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.scan_time = time.time()
+        self.folders: List[str] = []
+        self.files: List[str] = []
+
+        # Fill both lists in a single pass over the directory.
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        self.folders.append(entry.name)
+                    elif entry.is_file():
+                        self.files.append(entry.name)
+                except OSError:
+                    continue
+        self.folders.sort(reverse=True)
+        self.files.sort(reverse=True)
+
+    def is_valid(self, mtime_ns: int) -> bool:
+        if mtime_ns != self.mtime_ns:
+            return False
+        return self.scan_time - mtime_ns / 1e9 > self.RACY_SECONDS
+
+
+# Absolute path -> listing, shared between all models.
+_directory_listings: Dict[str, DirectoryListing] = {}
+
+
+def get_directory_listing(path: Path) -> Optional[DirectoryListing]:
+    """Return the listing of a directory, which is only scanned again if the directory
+    changed since the last time. Return None if the path is not a directory."""
+    key = path.absolute().as_posix()
+    try:
+        stat_result = os.stat(key)
+    except OSError:
+        _directory_listings.pop(key, None)
+        return None
+    if not S_ISDIR(stat_result.st_mode):
+        _directory_listings.pop(key, None)
+        return None
+
+    listing = _directory_listings.get(key)
+    if listing and listing.is_valid(stat_result.st_mtime_ns):
+        return listing
+
+    logger.debug("Scanning directory: %s", key)
+    try:
+        listing = DirectoryListing(key, stat_result.st_mtime_ns)
+    except OSError:
+        _directory_listings.pop(key, None)
+        return None
+    _directory_listings[key] = listing
+    return listing
+
+
 class FolderListModel:
     def __init__(self):
         self.__root_path: Optional[Path] = None
@@ -35,13 +102,14 @@ class FolderListModel:
 
     @root_path.setter
     def root_path(self, path: Path) -> None:
-        if not path or not path.absolute().exists():
+        listing = get_directory_listing(path) if path else None
+        if not listing:
             logger.debug("FolderListModel: Path does not exist: %s", str(path))
             self.reset()
         else:
             self.__root_path = path
             logger.debug("FolderListModel: Root path  was set to %s", path.as_posix())
-            self.__load_dir(self.__root_path)
+            self.__load_dir(listing)
 
     def reset(self) -> None:
         self.__root_path = None
@@ -54,20 +122,11 @@ class FolderListModel:
         self.__appended.clear()
         self.root_path = self.__root_path
 
-    def __load_dir(self, path: Path) -> None:
-        self.__folders = self.__detect_folders(path)
+    def __load_dir(self, listing: DirectoryListing) -> None:
+        self.__folders = listing.folders[:]
         self.__appended.clear()
         self.__update_combined()
 
-    def __detect_folders(self, path: Path) -> List[str]:
-        if path.exists() and path.is_dir():
-            # Iterate through directory and return all pathes that are dirs, only return their name.
-            return sorted(
-                [str(x.name) for x in path.iterdir() if x.is_dir()], reverse=True
-            )
-        else:
-            return []
-
     def append_item(self, item: str) -> None:
         self.__appended.append(item)
         self.__update_combined()
@@ -111,12 +170,13 @@ class FileListModel:
 
     @root_path.setter
     def root_path(self, path: Path) -> None:
-        if not path or not path.absolute().exists():
+        listing = get_directory_listing(path) if path else None
+        if not listing:
             logger.debug("FileListModel: Path does not exist: %s", str(path))
             self.reset()
         else:
             self.__root_path = path
-            self.__load_dir(self.__root_path)
+            self.__load_dir(listing)
 
     def reset(self) -> None:
         self.__root_path = None
@@ -129,21 +189,11 @@ class FileListModel:
         self.__appended.clear()
         self.root_path = self.__root_path
 
-    def __load_dir(self, path: Path) -> None:
-        self.__files = self.__detect_files(path)
+    def __load_dir(self, listing: DirectoryListing) -> None:
+        self.__files = [name for name in listing.files if self.filter_name in name]
         self.__appended.clear()
         self.__update_combined()
 
-    def __detect_files(self, path: Path) -> List[str]:
-        if path.exists() and path.is_dir():
-            # Iterate through directory and return all pathes that are files, only return their name.
-            return sorted(
-                [str(x.name) for x in path.iterdir() if x.is_file() and self.filter_name in x.name],
-                reverse=True,
-            )
-        else:
-            return []
-
     def append_item(self, item: str) -> None:
         self.__appended.append(item)
         self.__update_combined()
@@ -46,6 +46,8 @@ class KITSU_task(bpy.types.PropertyGroup):
     entity_name: bpy.props.StringProperty(name="Entity Name", default="")
     task_type_id: bpy.props.StringProperty(name="Task Type ID", default="")
     task_type_name: bpy.props.StringProperty(name="Task Type Name", default="")
+    task_status_name: bpy.props.StringProperty(name="Task Status Name", default="")
+    frame_count: bpy.props.IntProperty(name="Frame Count", default=0)
 
 
 class KITSU_media_update_search_paths(bpy.types.PropertyGroup):
@@ -6,7 +6,7 @@ import bpy
 from .. import prefs, bkglobals
 from ..types import Shot
 from . import core, config
-from typing import Tuple, List
+from typing import Tuple, List, Union
 
 
 def get_shot_assets(
@@ -14,7 +14,8 @@ def get_shot_assets(
     output_collection: bpy.types.Collection,
     shot: Shot,
 ) -> Tuple[List[str], List[str]]:
-    """Link Assets into file by fetching metadata from Kitsu Server
+    """Link Assets into file by fetching metadata from Kitsu Server.
+    All assets are linked at once, so each library file is only opened once.
 
     Args:
         scene (bpy.types.Scene): Scene to link Asset into
@@ -22,18 +23,46 @@ def get_shot_assets(
         shot (Shot): Shot context entity
 
     Returns:
-        Tuple[List[str], List[str]]: Success Links, Failed Links (rturns list of status messages for each)
+        Tuple[List[str], List[str]]: Success Links, Failed Links (returns list of status messages for each)
     """
     kitsu_assets = shot.get_all_assets()
     success_links = []
     fail_links = []
 
+    # Gather all assets first, so they can be linked per library file.
+    planner = core.LinkPlanner()
+    asset_requests = []
     for kitsu_asset in kitsu_assets:
-        success, msg = get_shot_asset(kitsu_asset, scene, output_collection, shot)
-        if success:
-            success_links.append(msg)
+        request = get_shot_asset_request(kitsu_asset)
+        if isinstance(request, str):
+            fail_links.append(request)
+            continue
+        filepath, collection_name = request
+        planner.request(filepath, collection_name, "collections")
+        asset_requests.append((kitsu_asset.name, filepath, collection_name))
+
+    linked = planner.link()
+
+    to_override = []
+    for asset_name, filepath, collection_name in asset_requests:
+        linked_collection = linked.get((filepath, "collections", collection_name))
+        if not linked_collection:
+            fail_links.append(
+                f"Asset '{asset_name}' collection '{collection_name}' does not exist. Skipping"
+            )
+            continue
+
+        if config.ASSET_TYPE_TO_OVERRIDE.get(collection_name.split('-')[0]):
+            to_override.append((collection_name, linked_collection))
         else:
-            fail_links.append(msg)
+            output_collection.children.link(linked_collection)
+            success_links.append(f"'{collection_name}': Successfully Linked")
+
+    override_cols = core.override_collections([col for _name, col in to_override], scene)
+    for (collection_name, _col), override_col in zip(to_override, override_cols):
+        core.add_action_to_armature(override_col, shot)
+        output_collection.children.link(override_col)
+        success_links.append(f"'{collection_name}': Successfully Linked & Overridden")
 
     for msg in success_links:
         print(msg)
@@ -43,42 +72,19 @@ def get_shot_assets(
     return success_links, fail_links
 
 
-def get_shot_asset(
-    kitsu_asset: dict,
-    scene: bpy.types.Scene,
-    output_collection: bpy.types.Collection,
-    shot: Shot,
-) -> Tuple[bool, str]:
+def get_shot_asset_request(kitsu_asset: dict) -> Union[Tuple[str, str], str]:
+    """Return the file path and collection name to link for an asset,
+    or an error message if the asset can't be linked."""
     asset_path = kitsu_asset.data.get(bkglobals.KITSU_FILEPATH_KEY)
     collection_name = kitsu_asset.data.get(bkglobals.KITSU_COLLECTION_KEY)
     if not asset_path:
-        return False, f"Asset '{kitsu_asset.name}' is missing filepath on Kitsu Server"
+        return f"Asset '{kitsu_asset.name}' is missing filepath on Kitsu Server"
 
     if not collection_name:
-        return False, f"Asset '{kitsu_asset.name}' is missing collection name on Kitsu Sever"
+        return f"Asset '{kitsu_asset.name}' is missing collection name on Kitsu Sever"
 
     filepath = prefs.project_root_dir_get(bpy.context).joinpath(asset_path).absolute()
     if not filepath.exists():
-        return (
-            False,
-            f"Asset '{kitsu_asset.name}' filepath '{str(filepath)}' does not exist. Skipping",
-        )
-
-    if config.ASSET_TYPE_TO_OVERRIDE.get(collection_name.split('-')[0]):
-        linked_collection = core.link_and_override_collection(
-            collection_name=collection_name, file_path=str(filepath), scene=scene
-        )
-        if not linked_collection:
-            return (
-                False,
-                f"Asset '{kitsu_asset.name}' collection '{collection_name}' does not exist. Skipping",
-            )
-
-        core.add_action_to_armature(linked_collection, shot)
-        msg = f"'{collection_name}': Successfully Linked & Overridden"
-    else:
-        linked_collection = core.link_data_block(str(filepath), collection_name, "collections")
-        msg = f"'{collection_name}': Successfully Linked"
+        return f"Asset '{kitsu_asset.name}' filepath '{str(filepath)}' does not exist. Skipping"
 
-    output_collection.children.link(linked_collection)
-    return True, msg
+    return str(filepath), collection_name
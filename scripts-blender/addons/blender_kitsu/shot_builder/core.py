@@ -81,6 +81,44 @@ def set_frame_range(shot: Shot, scene: bpy.types.Scene):
     scene.frame_current = kitsu_start_3d
 
 
+class LinkPlanner:
+    """Gathers data blocks to link from other files, so that each file is only
+    opened once, no matter how many data blocks are linked from it.
+
+    Request all data blocks with request(), then link them all with link().
+    """
+
+    def __init__(self):
+        # File path -> data block collection attribute -> data block names.
+        self.requests: dict[str, dict[str, list[str]]] = {}
+
+    def request(self, file_path: str, data_block_name: str, data_block_attr: str) -> None:
+        names = self.requests.setdefault(file_path, {}).setdefault(data_block_attr, [])
+        if data_block_name not in names:
+            names.append(data_block_name)
+
+    def link(self) -> dict[tuple[str, str, str], bpy.types.ID]:
+        """Link all requested data blocks.
+
+        Returns:
+            dict: Linked data blocks, keyed by (file_path, data_block_attr, data_block_name).
+            Data blocks that were not found are missing.
+        """
+        linked = {}
+        for file_path, attr_names in self.requests.items():
+            with bpy.data.libraries.load(file_path, link=True) as (data_from, data_to):
+                for data_block_attr, names in attr_names.items():
+                    available = set(getattr(data_from, data_block_attr))
+                    setattr(data_to, data_block_attr, [n for n in names if n in available])
+
+            for data_block_attr in attr_names:
+                for data_block in getattr(data_to, data_block_attr):
+                    if data_block:
+                        linked[(file_path, data_block_attr, data_block.name)] = data_block
+        self.requests.clear()
+        return linked
+
+
 def link_data_block(
     file_path: str, data_block_name: str, data_block_attr: str
 ) -> bpy.types.ID | None:
@@ -94,23 +132,38 @@ def link_data_block(
     Returns:
         bpy.types.ID | None: Returns the linked data block or None if not found
     """
-    with bpy.data.libraries.load(file_path, link=True) as (data_from, data_to):
-        data_blocks = [
-            data_block
-            for data_block in getattr(data_from, data_block_attr)
-            if data_block == data_block_name
-        ]
+    planner = LinkPlanner()
+    planner.request(file_path, data_block_name, data_block_attr)
+    return planner.link().get((file_path, data_block_attr, data_block_name))
 
-        setattr(data_to, data_block_attr, data_blocks)
 
-    linked_data = getattr(data_to, data_block_attr)
-    return linked_data[0] if linked_data else None
+def override_collections(
+    collections: list[bpy.types.Collection], scene: bpy.types.Scene
+) -> list[bpy.types.Collection]:
+    """Create library overrides of linked collections.
+
+    Args:
+        collections (list[bpy.types.Collection]): Linked collections to override
+        scene (bpy.types.Scene): Current Scene to create the overrides in
+
+    Returns:
+        list[bpy.types.Collection]: Overriden Collections, in the same order
+    """
+    view_layer = bpy.context.view_layer
+    override_cols = []
+    for collection in collections:
+        scene.collection.children.link(collection)
+        override_cols.append(
+            collection.override_hierarchy_create(scene, view_layer, do_fully_editable=True)
+        )
+        scene.collection.children.unlink(collection)
+    return override_cols
 
 
 def link_and_override_collection(
     file_path: str, collection_name: str, scene: bpy.types.Scene
 ) -> bpy.types.Collection | None:
-    """_summary_
+    """Link a collection from a file and create a library override of it.
 
     Args:
         file_path (str): File Path to .blend file to link from
@@ -123,13 +176,8 @@ def link_and_override_collection(
     collection = link_data_block(file_path, collection_name, "collections")
     if not collection:
         return
-    scene.collection.children.link(collection)
-    override_collection = collection.override_hierarchy_create(
-        scene, bpy.context.view_layer, do_fully_editable=True
-    )
-    scene.collection.children.unlink(collection)
     # Make library override.
-    return override_collection
+    return override_collections([collection], scene)[0]
 
 
 def link_camera_rig(
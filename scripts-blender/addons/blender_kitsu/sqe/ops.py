@@ -2128,6 +2128,13 @@ class KITSU_OT_sqe_scan_for_media_updates(bpy.types.Operator):
 
         logger.info("-START- Scanning for media updates")
 
+        paths = [item.filepath for item in addon_prefs.media_update_search_paths]
+        paths.append(addon_prefs.shot_playblast_root_dir)
+        search_paths = [Path(os.path.abspath(bpy.path.abspath(path))).as_posix() for path in paths]
+
+        # Group strips by folder, so each folder is only indexed once.
+        strips_by_folder: Dict[Path, List[Tuple[bpy.types.Strip, Path, str]]] = {}
+
         for strip in strips:
             if not strip.type == "MOVIE":
                 continue
@@ -2144,16 +2151,7 @@ class KITSU_OT_sqe_scan_for_media_updates(bpy.types.Operator):
             current_version = util.get_version(media_path_old.name)
 
             # Check if filepath is in include path.
-            included = False
-            paths = [item.filepath for item in addon_prefs.media_update_search_paths]
-            paths.append(addon_prefs.shot_playblast_root_dir)
-            for path in paths:
-                filepath = Path(os.path.abspath(bpy.path.abspath(path)))
-                if media_path_old.as_posix().startswith(filepath.as_posix()):
-                    included = True
-                    break
-
-            if not included:
+            if not any(media_path_old.as_posix().startswith(path) for path in search_paths):
                 logger.info("Not included in media update search list: %s", strip.filepath)
                 excluded.append(strip)
                 continue
@@ -2163,51 +2161,45 @@ class KITSU_OT_sqe_scan_for_media_updates(bpy.types.Operator):
                 no_version.append(strip)
                 continue
 
-            # Gather valid files to compare source media to.
-            media_folder = media_path_old.parent
-            media_all: List[Path] = [
-                f for f in media_folder.iterdir() if f.is_file() and util.get_version(f.name)
-            ]
-            # List of files that are named as source except for version str.
-            valid_files: List[Path] = []
-
-            for file in media_all:
-                # Version should exists here, we already check for that in list comprehension.
-                version = util.get_version(file.name)
-
-                # We only want to consider files that have the same name except for version string.
-                if file.name.replace(version, "") != media_path_old.name.replace(
-                    current_version, ""
-                ):
-                    continue
+            strips_by_folder.setdefault(media_path_old.parent, []).append(
+                (strip, media_path_old, current_version)
+            )
 
-                valid_files.append(file)
+        for media_folder, folder_strips in strips_by_folder.items():
+            # Versioned files of the folder, grouped by their name without version.
+            version_index = opsdata.get_media_version_index(media_folder)
 
-            valid_files.sort(reverse=True)
+            for strip, media_path_old, current_version in folder_strips:
+                # Files that are named as source except for version str, latest first.
+                valid_files = []
+                if version_index:
+                    valid_files = version_index.get(
+                        media_path_old.name.replace(current_version, ""), []
+                    )
 
-            # No valid files found, should not happen source file should be at least here.
-            if not valid_files:
-                continue
+                # No valid files found, should not happen source file should be at least here.
+                if not valid_files:
+                    continue
 
-            if valid_files[0] == media_path_old:
-                # Logger.info("%s already up to date: %s", strip.name, strip.filepath).
-                strip.kitsu.media_outdated = False
-                up_to_date.append(strip)
-                continue
+                if valid_files[0] == media_path_old.name:
+                    # Logger.info("%s already up to date: %s", strip.name, strip.filepath).
+                    strip.kitsu.media_outdated = False
+                    up_to_date.append(strip)
+                    continue
 
-            # Load latest media.
-            logger.info(
-                "%s newer version of source media available: %s > %s",
-                strip.name,
-                current_version,
-                util.get_version(valid_files[0].name),
-            )
+                # Load latest media.
+                logger.info(
+                    "%s newer version of source media available: %s > %s",
+                    strip.name,
+                    current_version,
+                    util.get_version(valid_files[0]),
+                )
 
-            # Append to outdated list.
-            outdated.append(strip)
+                # Append to outdated list.
+                outdated.append(strip)
 
-            # Set media outdatet property for gpu overlay.
-            strip.kitsu.media_outdated = True
+                # Set media outdatet property for gpu overlay.
+                strip.kitsu.media_outdated = True
 
         # Report.
         self.report(
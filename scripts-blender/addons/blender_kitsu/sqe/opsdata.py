@@ -7,8 +7,9 @@ from pathlib import Path
 from typing import Any, Dict, List, Tuple, Union, Optional
 from . import pull
 import bpy
-from .. import bkglobals, prefs
+from .. import bkglobals, prefs, util
 from ..logger import LoggerFactory
+from ..models import DirectoryListing, get_directory_listing
 from ..types import Sequence, Task, TaskStatus, Shot, TaskType
 
 logger = LoggerFactory.getLogger()
@@ -263,3 +264,31 @@ def link_metadata_strip(
     # Pull sequence color.
     append_sequence_color(context, seq)
     return strip
+
+
+# Folder path -> (listing the index was built from, version index of the folder).
+_media_version_indices: Dict[str, Tuple[DirectoryListing, Dict[str, List[str]]]] = {}
+
+
+def get_media_version_index(folder: Path) -> Optional[Dict[str, List[str]]]:
+    """Return the names of the versioned files in a folder, grouped by their name without
+    the version string, latest version first. The index is only built again once the
+    folder changed. Return None if the folder does not exist."""
+    listing = get_directory_listing(folder)
+    if not listing:
+        return None
+
+    cached = _media_version_indices.get(listing.path)
+    if cached and cached[0] is listing:
+        return cached[1]
+
+    index: Dict[str, List[str]] = {}
+    # Listing is already sorted in reverse order.
+    for name in listing.files:
+        version = util.get_version(name)
+        if not version:
+            continue
+        index.setdefault(name.replace(version, ""), []).append(name)
+
+    _media_version_indices[listing.path] = (listing, index)
+    return index
@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import importlib
-from ..tasks import ops, ui
+from ..tasks import ops, opsdata, ui
 
 
 # ---------REGISTER ----------
@@ -11,8 +11,10 @@ from ..tasks import ops, ui
 
 def reload():
     global ops
+    global opsdata
     global ui
 
+    opsdata = importlib.reload(opsdata)
     ops = importlib.reload(ops)
     ui = importlib.reload(ui)
 
@@ -23,5 +25,6 @@ def register():
 
 
 def unregister():
+    opsdata.cancel_user_tasks_loading()
     ui.unregister()
     ops.unregister()
@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: 2025 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Loads the task list of the logged in user in a background thread.
+
+The task list and the task statuses are requested in parallel. The entities the
+tasks refer to are then requested per project and entity kind, instead of one
+request per entity. Results are published through a thread-safe queue, which
+is drained on the main thread by TaskListLoader.poll().
+
+This module does not import bpy, so it can be benchmarked outside of Blender
+(see scripts/kitsu-mock-server).
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import gazu
+
+logger = logging.getLogger("blender-kitsu")
+
+# Message kinds put on the queue by the loader.
+MSG_TASKS = "TASKS"
+MSG_TASK_STATUSES = "TASK_STATUSES"
+MSG_ENTITIES = "ENTITIES"
+MSG_ERROR = "ERROR"
+MSG_DONE = "DONE"
+
+# Entity kinds that can be fetched for a whole project with a single request.
+# Asset tasks report their asset type as entity type name, so every entity
+# type that is not listed here is treated as an asset.
+PROJECT_ENTITY_FETCHERS: Dict[str, Callable[[str], List[Dict[str, Any]]]] = {
+    "Shot": gazu.shot.all_shots_for_project,
+    "Sequence": gazu.shot.all_sequences_for_project,
+    "Asset": gazu.asset.all_assets_for_project,
+}
+# Entity kinds that are always requested one by one.
+SINGLE_ENTITY_TYPES = {"Edit", "Episode"}
+
+
+def get_entity_kind(task: Dict[str, Any]) -> str:
+    entity_type_name = task.get("entity_type_name", "")
+    if entity_type_name in PROJECT_ENTITY_FETCHERS or entity_type_name in SINGLE_ENTITY_TYPES:
+        return entity_type_name
+    return "Asset"
+
+
+def group_entity_requests(
+    tasks: List[Dict[str, Any]]
+) -> Tuple[Dict[Tuple[str, str], set], set]:
+    """Returns the entity ids referenced by the tasks, grouped by (project id, entity kind),
+    and the ids of entities that have to be requested one by one."""
+    project_requests: Dict[Tuple[str, str], set] = {}
+    single_requests = set()
+    for task in tasks:
+        entity_id = task.get("entity_id")
+        if not entity_id:
+            continue
+        kind = get_entity_kind(task)
+        if kind in SINGLE_ENTITY_TYPES:
+            single_requests.add(entity_id)
+        else:
+            project_requests.setdefault((task.get("project_id", ""), kind), set()).add(entity_id)
+    return project_requests, single_requests
+
+
+class TaskListLoader:
+    """Fetches the task list of the logged in user, the task statuses and all entities
+    referenced by the tasks, on a background thread.
+
+    Call start() once, then call poll() regularly from the main thread until done is True.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.done = False
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="kitsu-task-loader", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Stop publishing results. Requests that are in flight still finish."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def poll(self) -> List[Tuple[str, Any]]:
+        """Returns all messages published since the last call, without blocking."""
+        messages = []
+        while True:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == MSG_DONE:
+                self.done = True
+            elif not self.cancelled:
+                messages.append(message)
+        return messages
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _publish(self, kind: str, payload: Any) -> None:
+        if not self.cancelled:
+            self._queue.put((kind, payload))
+
+    def _run(self) -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                self._load(executor)
+        except Exception as e:
+            logger.exception("Failed to load user tasks")
+            self._publish(MSG_ERROR, e)
+        finally:
+            self._queue.put((MSG_DONE, None))
+
+    def _load(self, executor: ThreadPoolExecutor) -> None:
+        statuses_future = executor.submit(gazu.task.all_task_statuses)
+        tasks = executor.submit(gazu.user.all_tasks_to_do).result()
+        # Publish the tasks right away, so the list can be drawn while the rest loads.
+        self._publish(MSG_TASKS, tasks)
+        if self.cancelled:
+            return
+
+        project_requests, single_requests = group_entity_requests(tasks)
+        project_futures = {
+            key: executor.submit(PROJECT_ENTITY_FETCHERS[key[1]], key[0])
+            for key in project_requests
+        }
+        single_futures = [
+            executor.submit(gazu.entity.get_entity, entity_id) for entity_id in single_requests
+        ]
+
+        self._publish(MSG_TASK_STATUSES, {s["id"]: s for s in statuses_future.result()})
+
+        entities: Dict[str, Dict[str, Any]] = {}
+        for key, future in project_futures.items():
+            entity_ids = project_requests[key]
+            for entity in future.result():
+                if entity["id"] in entity_ids:
+                    entities[entity["id"]] = entity
+        for future in single_futures:
+            entity = future.result()
+            if entity:
+                entities[entity["id"]] = entity
+        self._publish(MSG_ENTITIES, entities)
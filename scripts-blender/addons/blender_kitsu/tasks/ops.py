@@ -29,19 +29,15 @@ class KITSU_OT_tasks_user_laod(bpy.types.Operator):
         return prefs.session_auth(context)
 
     def execute(self, context: bpy.types.Context) -> Set[str]:
-        addon_prefs = prefs.addon_prefs_get(context)
-        tasks_coll_prop = addon_prefs.tasks
         active_user = cache.user_active_get()
 
-        # load tasks this also updates the collection property
-        cache.load_user_all_tasks(context)
+        # Tasks are loaded in the background, the collection property is updated
+        # once they arrive.
+        opsdata.load_user_tasks_in_background()
 
         util.ui_redraw()
 
-        self.report(
-            {"INFO"},
-            f"Fetched {len(tasks_coll_prop.items())} tasks for {active_user.full_name}",
-        )
+        self.report({"INFO"}, f"Loading tasks for {active_user.full_name}")
         return {"FINISHED"}
 
 
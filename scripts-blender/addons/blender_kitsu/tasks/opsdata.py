@@ -2,11 +2,90 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
 import bpy
 
+from .. import cache, util
+from ..types import Task
 from ..logger import LoggerFactory
+from .loader import (
+    TaskListLoader,
+    MSG_TASKS,
+    MSG_TASK_STATUSES,
+    MSG_ENTITIES,
+    MSG_ERROR,
+)
 
 logger = LoggerFactory.getLogger()
+
+
+# Interval in seconds in which the main thread picks up results of the loader.
+LOADER_POLL_INTERVAL = 0.1
+
+_user_tasks_loader: Optional[TaskListLoader] = None
+
+
+def is_loading_user_tasks() -> bool:
+    return _user_tasks_loader is not None
+
+
+def load_user_tasks_in_background() -> None:
+    """Start loading the tasks of the active user without blocking the UI.
+    A load that is still running is cancelled."""
+    global _user_tasks_loader
+
+    if _user_tasks_loader:
+        _user_tasks_loader.cancel()
+
+    _user_tasks_loader = TaskListLoader()
+    _user_tasks_loader.start()
+
+    if not bpy.app.timers.is_registered(poll_user_tasks_loader):
+        # Persistent, so that loading another file while tasks are fetched doesn't drop
+        # the timer and leave the loader set forever.
+        bpy.app.timers.register(
+            poll_user_tasks_loader, first_interval=LOADER_POLL_INTERVAL, persistent=True
+        )
+
+
+def cancel_user_tasks_loading() -> None:
+    global _user_tasks_loader
+
+    if _user_tasks_loader:
+        _user_tasks_loader.cancel()
+    _user_tasks_loader = None
+
+    if bpy.app.timers.is_registered(poll_user_tasks_loader):
+        bpy.app.timers.unregister(poll_user_tasks_loader)
+
+
+def poll_user_tasks_loader() -> Optional[float]:
+    global _user_tasks_loader
+
+    loader = _user_tasks_loader
+    if not loader:
+        return None
+
+    messages = loader.poll()
+    for kind, payload in messages:
+        if kind == MSG_TASKS:
+            cache.set_user_all_tasks(bpy.context, [Task.from_dict(t) for t in payload])
+            logger.debug("Loaded %i assigned tasks", len(payload))
+        elif kind == MSG_TASK_STATUSES:
+            cache.set_user_all_tasks_details(bpy.context, task_statuses=payload)
+        elif kind == MSG_ENTITIES:
+            cache.set_user_all_tasks_details(bpy.context, entities=payload)
+        elif kind == MSG_ERROR:
+            logger.error("Failed to load assigned tasks: %s", str(payload))
+
+    if loader.done:
+        _user_tasks_loader = None
+
+    if messages or loader.done:
+        util.ui_redraw()
+
+    if loader.done:
+        return None
+    return LOADER_POLL_INTERVAL
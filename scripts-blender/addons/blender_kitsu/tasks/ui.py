@@ -6,6 +6,7 @@ from pathlib import Path
 import bpy
 
 from .. import prefs, cache
+from . import opsdata
 from .ops import KITSU_OT_tasks_user_laod
 
 # from ..tasks.ops import KITSU_OT_session_end, KITSU_OT_session_start
@@ -36,6 +37,8 @@ class KITSU_PT_tasks_user(bpy.types.Panel):
         row.label(text=active_user.full_name, icon="CHECKBOX_HLT")
 
         # Detect Context
+        if opsdata.is_loading_user_tasks():
+            row.label(text="Loading...", icon="SORTTIME")
         row.operator(
             KITSU_OT_tasks_user_laod.bl_idname,
             icon="FILE_REFRESH",
@@ -68,7 +71,12 @@ class KITSU_UL_tasks_user(bpy.types.UIList):
         task_type_name = item.task_type_name
 
         if self.layout_type in {"DEFAULT", "COMPACT"}:
-            layout.label(text=f"{entity_name} {task_type_name}")
+            row = layout.row()
+            row.label(text=f"{entity_name} {task_type_name}")
+            if item.frame_count:
+                row.label(text=f"{item.frame_count} frames")
+            if item.task_status_name:
+                row.label(text=item.task_status_name)
 
         elif self.layout_type in {"GRID"}:
             layout.alignment = "CENTER"
@@ -1,18 +1,106 @@
 import bpy
 from bpy.app.handlers import persistent
+from time import perf_counter
 from ..util import get_addon_prefs
 
+# Blender never purges these, even when they have no users.
+UNPURGEABLE_COLLECTIONS = {'window_managers', 'workspaces', 'screens', 'scenes', 'libraries'}
+
+
+class OrphanTracker:
+    """Keeps track of whether the file changed since the last purge, so saving an
+    unchanged file doesn't purge at all, and only runs a full recursive purge every
+    few saves.
+
+    In between full purges, orphans are removed by checking user counts, which is much
+    cheaper than the user map built by the recursive purge, but can't find groups of
+    orphans that only use each other. Those are left for the next full purge.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.is_dirty = True
+        self.saves_since_full_purge = 0
+
+    def mark_dirty(self):
+        self.is_dirty = True
+
+    def purge(self, full_purge_interval: int):
+        start = perf_counter()
+        if self.saves_since_full_purge + 1 >= full_purge_interval:
+            bpy.ops.outliner.orphans_purge(
+                do_local_ids=True, do_linked_ids=False, do_recursive=True
+            )
+            self.saves_since_full_purge = 0
+            print(f"Blender Log: Full purge before save took {perf_counter()-start:.3f}s.")
+        elif self.is_dirty:
+            num_removed = purge_local_orphans()
+            self.saves_since_full_purge += 1
+            print(
+                f"Blender Log: Purged {num_removed} orphans before save in {perf_counter()-start:.3f}s."
+            )
+        else:
+            self.saves_since_full_purge += 1
+        # Purging itself triggers depsgraph updates, which shouldn't count as changes.
+        self.is_dirty = False
+
+
+def get_local_orphans() -> list[bpy.types.ID]:
+    orphans = []
+    for prop in bpy.data.bl_rna.properties:
+        if prop.type != 'COLLECTION' or prop.identifier in UNPURGEABLE_COLLECTIONS:
+            continue
+        for id in getattr(bpy.data, prop.identifier):
+            if id.users == 0 and not id.library:
+                orphans.append(id)
+    return orphans
+
+
+def purge_local_orphans() -> int:
+    """Remove local IDs with no users, then the IDs that were only used by those, and so on.
+    Return the number of removed IDs."""
+    num_removed = 0
+    orphans = get_local_orphans()
+    while orphans:
+        num_removed += len(orphans)
+        bpy.data.batch_remove(orphans)
+        orphans = get_local_orphans()
+    return num_removed
+
+
+orphan_tracker = OrphanTracker()
+
+
+@persistent
+def mark_dirty(*_args):
+    orphan_tracker.mark_dirty()
+
+
+@persistent
+def reset_orphan_tracker(*_args):
+    orphan_tracker.reset()
+
 
 @persistent
 def purge_before_save(scene):
     prefs = get_addon_prefs()
     if prefs.purge_on_save:
-        bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=False, do_recursive=True)
+        orphan_tracker.purge(prefs.full_purge_interval)
 
 
 def register():
+    bpy.app.handlers.depsgraph_update_post.append(mark_dirty)
+    bpy.app.handlers.undo_post.append(mark_dirty)
+    bpy.app.handlers.redo_post.append(mark_dirty)
+    bpy.app.handlers.load_post.append(reset_orphan_tracker)
     bpy.app.handlers.save_pre.append(purge_before_save)
 
 
 def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(mark_dirty)
+    bpy.app.handlers.undo_post.remove(mark_dirty)
+    bpy.app.handlers.redo_post.remove(mark_dirty)
+    bpy.app.handlers.load_post.remove(reset_orphan_tracker)
     bpy.app.handlers.save_pre.remove(purge_before_save)
@@ -0,0 +1,156 @@
+# SPDX-FileCopyrightText: 2025 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Engine for running many checks over a file in a single traversal.
+
+Checks subclass AuditCheck and implement any of its callbacks. run_audit() takes one
+AuditSnapshot of the file (the user map and the libraries), then walks the IDs and
+libraries once, calling every check for each of them. This way, the user map is only
+computed once, no matter how many checks are run.
+
+Checks that report to the Blender Log are registered with register_check(), so they are
+run by the "Audit File" operator. This operator also works in the background, so a whole
+project can be audited with bbatch and a script that runs:
+    bpy.ops.blenlog.audit_file()
+"""
+
+import bpy
+from bpy.types import ID, Library
+from time import perf_counter
+
+
+class AuditSnapshot:
+    """Data about the file that is collected once and shared by all checks of an audit."""
+
+    def __init__(self):
+        self.libraries: list[Library] = list(bpy.data.libraries)
+        self._user_map = None
+        self._local_ids_by_name = None
+
+    @property
+    def user_map(self) -> dict[ID, set[ID]]:
+        # Only computed if any check needs it, since it's by far the most expensive part.
+        if self._user_map is None:
+            self._user_map = bpy.data.user_map()
+        return self._user_map
+
+    @property
+    def ids(self):
+        return self.user_map.keys()
+
+    @property
+    def local_ids_by_name(self) -> dict[str, ID]:
+        if self._local_ids_by_name is None:
+            self._local_ids_by_name = {id.name: id for id in self.ids if not id.library}
+        return self._local_ids_by_name
+
+
+class AuditCheck:
+    """Base class for checks run by run_audit(). Subclasses implement any of the callbacks,
+    and increment issue_count for each issue they find."""
+
+    name = "Audit Check"
+
+    def __init__(self):
+        self.issue_count = 0
+
+    def begin(self, snapshot: AuditSnapshot):
+        """Called once before the traversal."""
+
+    def check_id(self, id: ID, users: set[ID]):
+        """Called for every ID in the file, with the set of IDs using it."""
+
+    def check_library(self, library: Library):
+        """Called for every library of the file."""
+
+    def end(self):
+        """Called once after the traversal."""
+
+
+class BlenderLogCheck(AuditCheck):
+    """A check that reports its issues as entries of a Blender Log category."""
+
+    category = "Uncategorized"
+
+    def __init__(self, context):
+        super().__init__()
+        self.blenlog = context.scene.blender_log
+
+    def begin(self, snapshot):
+        self.blenlog.clear_category(self.category)
+
+    def add(self, name, **kwargs):
+        # Checks may report to other categories than their own, by passing category.
+        kwargs.setdefault('category', self.category)
+        self.issue_count += 1
+        return self.blenlog.add(name=name, **kwargs)
+
+
+class AuditResult:
+    def __init__(self, checks: list[AuditCheck]):
+        self.checks = checks
+        # Seconds spent in each check, including its share of the traversal.
+        self.timings: dict[str, float] = {check.name: 0.0 for check in checks}
+        self.snapshot_time = 0.0
+
+    @property
+    def issue_count(self) -> int:
+        return sum(check.issue_count for check in self.checks)
+
+    def print_report(self):
+        print(f"Audit snapshot: {self.snapshot_time:.3f}s")
+        for check in self.checks:
+            print(
+                f"{check.name}: {check.issue_count} issues ({self.timings[check.name]:.3f}s)"
+            )
+        print(f"Total: {self.issue_count} issues")
+
+
+# Check name -> BlenderLogCheck subclass, run by the Audit File operator.
+audit_checks: dict[str, type[BlenderLogCheck]] = {}
+
+
+def register_check(check_class: type[BlenderLogCheck]):
+    """Class decorator to include a check in the Audit File operator."""
+    audit_checks[check_class.name] = check_class
+    return check_class
+
+
+def run_audit(checks: list[AuditCheck], snapshot: AuditSnapshot = None) -> AuditResult:
+    """Run all checks with a single traversal of the IDs and libraries of the file."""
+    result = AuditResult(checks)
+    timings = result.timings
+
+    # Only dispatch to checks that actually implement a callback.
+    id_checks = [c for c in checks if type(c).check_id is not AuditCheck.check_id]
+    lib_checks = [c for c in checks if type(c).check_library is not AuditCheck.check_library]
+
+    start = perf_counter()
+    if not snapshot:
+        snapshot = AuditSnapshot()
+    user_map = snapshot.user_map if id_checks else {}
+    result.snapshot_time = perf_counter() - start
+
+    def dispatch(callback_name, *args):
+        for check in checks:
+            start = perf_counter()
+            getattr(check, callback_name)(*args)
+            timings[check.name] += perf_counter() - start
+
+    dispatch('begin', snapshot)
+
+    for id, users in user_map.items():
+        for check in id_checks:
+            start = perf_counter()
+            check.check_id(id, users)
+            timings[check.name] += perf_counter() - start
+    for library in snapshot.libraries:
+        for check in lib_checks:
+            start = perf_counter()
+            check.check_library(library)
+            timings[check.name] += perf_counter() - start
+
+    dispatch('end')
+    return result
@@ -1,4 +1,5 @@
 from . import (
+    audit_file,
     better_delete,
     cleanup_shotfile,
     drivers,
@@ -11,6 +12,7 @@ from . import (
 )
 
 modules = [
+    audit_file,
     better_delete,
     cleanup_shotfile,
     drivers,
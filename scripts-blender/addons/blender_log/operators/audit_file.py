@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2025 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bpy
+from bpy.props import StringProperty
+from ..audit import audit_checks, run_audit
+from .libraries import LibraryOutOfFolderCheck
+
+
+class BLENLOG_OT_audit_file(bpy.types.Operator):
+    """Run all registered checks on this file in a single pass, and report their issues in the Blender Log"""
+
+    bl_idname = "blenlog.audit_file"
+    bl_label = "Audit File"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    checks: StringProperty(
+        name="Checks",
+        description="Comma-separated names of the checks to run. Runs all checks if empty",
+        default="",
+    )
+    project_root_path: StringProperty(
+        name="Project Root Path",
+        subtype='DIR_PATH',
+        description="Your project's root directory. If set, libraries outside of it are reported as well",
+        default="",
+    )
+
+    def execute(self, context):
+        check_names = [name.strip() for name in self.checks.split(",") if name.strip()]
+        for name in check_names:
+            if name not in audit_checks:
+                self.report({'ERROR'}, f'No audit check named "{name}".')
+                return {'CANCELLED'}
+        check_classes = [audit_checks[name] for name in check_names] or audit_checks.values()
+
+        checks = [check_class(context) for check_class in check_classes]
+        if self.project_root_path:
+            checks.append(LibraryOutOfFolderCheck(context, self.project_root_path))
+
+        result = run_audit(checks)
+        print(f"Audit of {bpy.data.filepath or 'unsaved file'}:")
+        result.print_report()
+
+        if result.issue_count > 0:
+            self.report({'WARNING'}, f"Audit found {result.issue_count} issues.")
+        else:
+            self.report({'INFO'}, "Audit found no issues.")
+
+        return {'FINISHED'}
+
+
+registry = [BLENLOG_OT_audit_file]
@@ -9,11 +9,10 @@ resyncing overrides, all without breaking anything.
 """
 
 import bpy
-from typing import Set
-from bpy.types import Library
 from bpy.props import BoolProperty
 import os
 from .relink_overridden_asset import relink_all_override_hierarchies
+from ..audit import AuditCheck, run_audit
 
 
 def clean_file(
@@ -27,21 +26,25 @@ def clean_file(
         context.scene.render.use_simplify = True
         context.scene.render.simplify_subdivision = 0
 
-    nuke_addon_properties()
-
-    issue_counter = 0
-    issue_counter += warn_primitive_names(only_local=only_warn_local_issues)
-    issue_counter += warn_number_names(
-        only_local=only_warn_local_issues,
-        allow_remove_suffix=allow_remove_suffix,
-        allow_replace_suffix=allow_replace_suffix,
+    # All checks share a single traversal of the file's IDs and libraries.
+    result = run_audit(
+        [
+            AddonPropertyCleanup(),
+            PrimitiveNameCheck(only_local=only_warn_local_issues),
+            NumberNameCheck(
+                only_local=only_warn_local_issues,
+                allow_remove_suffix=allow_remove_suffix,
+                allow_replace_suffix=allow_replace_suffix,
+            ),
+            BadLibraryCheck(),
+            BrokenLinkCheck(),
+        ]
     )
-    issue_counter += warn_bad_libs()
-    issue_counter += warn_broken_links()
+    result.print_report()
 
     fix_local_obdata_names()
 
-    return issue_counter
+    return result.issue_count
 
 
 def nuke_override_hidden():
@@ -71,8 +74,22 @@ def get_override_roots():
     return override_roots
 
 
-def warn_primitive_names(only_local=False) -> int:
-    issue_counter = 0
+class AddonPropertyCleanup(AuditCheck):
+    """Remove custom properties left behind by some add-ons from local IDs."""
+
+    name = "Add-on Properties"
+    property_blacklist = {"hops"}
+
+    def check_id(self, id, users):
+        if id.library or id.override_library:
+            return
+        for key in list(id.keys()):
+            if key in self.property_blacklist:
+                del id[key]
+
+
+class PrimitiveNameCheck(AuditCheck):
+    name = "Primitive Names"
     primitive_names = [
         "Plane",
         "Cube",
@@ -89,66 +106,75 @@ def warn_primitive_names(only_local=False) -> int:
         "Key",
         "Material",
     ]
-    for id in bpy.data.user_map().keys():
-        if (id.library or id.override_library) and only_local:
-            continue
+
+    def __init__(self, only_local=False):
+        super().__init__()
+        self.only_local = only_local
+
+    def check_id(self, id, users):
+        if (id.library or id.override_library) and self.only_local:
+            return
         if "WGT" in id.name:
             # Widgets are allowed to be named after primitives.
-            continue
-        for prim_name in primitive_names:
+            return
+        for prim_name in self.primitive_names:
             if prim_name in id.name:
                 msg = f"WARNING: Primitive name: {id.name}, {type(id)}"
                 if id.override_library:
                     msg += " " + id.override_library.reference.library.filepath
                 print(msg)
-                issue_counter += 1
-    return issue_counter
+                self.issue_count += 1
 
 
-def warn_number_names(
-    only_local=False, allow_remove_suffix=False, allow_replace_suffix=False
-) -> int:
-    issue_counter = 0
-    all_ids = {id.name: id for id in bpy.data.user_map().keys()}
-    all_local_ids = {id.name: id for id in all_ids.values() if not id.library}
-    for name, id in all_ids.items():
-        if (id.library or id.override_library) and only_local:
-            continue
+class NumberNameCheck(AuditCheck):
+    name = "Number Suffixes"
+
+    def __init__(self, only_local=False, allow_remove_suffix=False, allow_replace_suffix=False):
+        super().__init__()
+        self.only_local = only_local
+        self.allow_remove_suffix = allow_remove_suffix
+        self.allow_replace_suffix = allow_replace_suffix
+
+    def begin(self, snapshot):
+        self.all_local_ids = snapshot.local_ids_by_name
+
+    def check_id(self, id, users):
+        if (id.library or id.override_library) and self.only_local:
+            return
 
         if len(id.name) < 4:
             if type(id) == bpy.types.Brush:
-                continue
+                return
             print("WARNING: Very short ID name: ", id.name, type(id))
-            issue_counter += 1
-            continue
-
-        if id.name[-4] == ".":
-            try:
-                int(id.name[-3:])
-            except:
-                # Suffix is not a number, so it's fine.
-                continue
-            msg = "WARNING: Number suffix in name: " + id.name
-            if id.override_library:
-                msg += " " + id.override_library.reference.library.filepath
-            if id.library:
-                msg += " " + id.library.filepath
-            if not id.override_library and not id.library:
-                if allow_remove_suffix:
-                    name_without_suffix = id.name[:-4]
-                    existing = all_local_ids.get(name_without_suffix)
-                    if not existing:
-                        id.name = name_without_suffix
-                elif allow_replace_suffix:
-                    id.name = id.name[:-4] + "_" + id.name[-3:]
-                else:
-                    print(msg)
-                    issue_counter += 1
+            self.issue_count += 1
+            return
+
+        if id.name[-4] != ".":
+            return
+        try:
+            int(id.name[-3:])
+        except:
+            # Suffix is not a number, so it's fine.
+            return
+        msg = "WARNING: Number suffix in name: " + id.name
+        if id.override_library:
+            msg += " " + id.override_library.reference.library.filepath
+        if id.library:
+            msg += " " + id.library.filepath
+        if not id.override_library and not id.library:
+            if self.allow_remove_suffix:
+                name_without_suffix = id.name[:-4]
+                existing = self.all_local_ids.get(name_without_suffix)
+                if not existing:
+                    id.name = name_without_suffix
+            elif self.allow_replace_suffix:
+                id.name = id.name[:-4] + "_" + id.name[-3:]
             else:
                 print(msg)
-                issue_counter += 1
-
-    return issue_counter
+                self.issue_count += 1
+        else:
+            print(msg)
+            self.issue_count += 1
 
 
 def fix_local_obdata_names():
@@ -169,60 +195,28 @@ def fix_local_obdata_names():
                 o.data.shape_keys.name = o.name
 
 
-def warn_broken_links():
-    issue_counter = 0
-    for id in bpy.data.user_map().keys():
+class BrokenLinkCheck(AuditCheck):
+    name = "Missing IDs"
+
+    def check_id(self, id, users):
         if id.is_missing:
             msg = "MISSING ID: " + id.name
             if id.library:
                 msg += " " + id.library.filepath
             print(msg)
-            issue_counter += 1
-    return issue_counter
-
-
-def warn_bad_libs() -> int:
-    issue_counter = 0
-
-    invalid_libs = get_invalid_libraries()
-    for invalid_lib in invalid_libs:
-        print("INVALID LIBRARY: ", invalid_lib.filepath)
-        issue_counter += 1
-
-    absolute_libs = get_absolute_libraries()
-    for absolute_lib in absolute_libs:
-        print("ABSOLUTE LIBRARY: ", absolute_lib.filepath)
-        issue_counter += 1
+            self.issue_count += 1
 
-    return issue_counter
 
+class BadLibraryCheck(AuditCheck):
+    name = "Bad Libraries"
 
-def get_invalid_libraries() -> Set[Library]:
-    """Return a set of library datablocks whose filepath does not exist."""
-    invalid_libs: Set[Library] = set()
-    for l in bpy.data.libraries:
-        if not os.path.exists(bpy.path.abspath(l.filepath)):
-            invalid_libs.add(l)
-    return invalid_libs
-
-
-def get_absolute_libraries() -> Set[Library]:
-    """Return a set of library datablocks whose filepaths are not relative."""
-    abs_libs: Set[Library] = set()
-    for lib in bpy.data.libraries:
-        if not lib.filepath.startswith("//"):
-            abs_libs.add(lib)
-    return abs_libs
-
-
-def nuke_addon_properties():
-    property_blacklist = {"hops"}
-    for id in bpy.data.user_map().keys():
-        if id.library or id.override_library:
-            continue
-        for key in list(id.keys()):
-            if key in property_blacklist:
-                del id[key]
+    def check_library(self, library):
+        if not os.path.exists(bpy.path.abspath(library.filepath)):
+            print("INVALID LIBRARY: ", library.filepath)
+            self.issue_count += 1
+        if not library.filepath.startswith("//"):
+            print("ABSOLUTE LIBRARY: ", library.filepath)
+            self.issue_count += 1
 
 
 class OUTLINER_OT_cleanup_shotfile(bpy.types.Operator):
@@ -7,75 +7,79 @@ from bpy.props import StringProperty
 
 from pathlib import Path
 
+from ..audit import BlenderLogCheck, register_check, run_audit
 
-def report_missing_libraries(context, libraries=[]):
-    if not libraries:
-        libraries = bpy.data.libraries
 
-    blenlog = context.scene.blender_log
-    cat_missing = "Missing Library"
-    blenlog.clear_category(cat_missing)
+@register_check
+class MissingLibraryCheck(BlenderLogCheck):
+    name = "Missing Libraries"
+    category = "Missing Library"
 
-    for lib in libraries:
-        if lib.is_missing:
-            blenlog.add(
-                name=lib.filepath,
+    def check_library(self, library):
+        if library.is_missing:
+            self.add(
+                name=library.filepath,
                 description="Library file is not found on file system.",
-                category=cat_missing,
                 category_icon='LIBRARY_DATA_BROKEN',
                 # operator='outliner.lib_operation',    # This operator demands to be run in the outliner for no particular reason.
                 # op_kwargs={'type': 'RELOCATE'},
             )
 
-    return blenlog.categories.get(cat_missing)
 
+@register_check
+class AbsoluteLibraryCheck(BlenderLogCheck):
+    name = "Absolute Libraries"
+    category = "Absolute Library"
 
-def report_absolute_libraries(context, libraries=[]):
-    if not libraries:
-        libraries = bpy.data.libraries
-
-    blenlog = context.scene.blender_log
-    cat_absolute = "Absolute Library"
-    blenlog.clear_category(cat_absolute)
-
-    for lib in libraries:
-        if not lib.filepath.startswith("//"):
-            blenlog.add(
-                name=lib.filepath,
-                description=f"{lib.filepath}\nLibrary path is not relative to this .blend, but absolute.",
-                category=cat_absolute,
+    def check_library(self, library):
+        if not library.filepath.startswith("//"):
+            self.add(
+                name=library.filepath,
+                description=f"{library.filepath}\nLibrary path is not relative to this .blend, but absolute.",
                 category_icon='FILEBROWSER',
                 # operator='outliner.lib_operation',
                 # op_kwargs={'type': 'RELOCATE'},
             )
 
-    return blenlog.categories.get(cat_absolute)
 
+class LibraryOutOfFolderCheck(BlenderLogCheck):
+    """Report libraries outside of a project root folder.
 
-def report_libraries_out_of_folder(context, project_path: Path or str, libraries=[]):
-    if type(project_path) == str:
-        project_path = Path(project_path)
+    Not registered with register_check(), since it needs the project root. The Audit File
+    operator runs it when it's given one."""
 
-    if not libraries:
-        libraries = bpy.data.libraries
+    name = "Libraries Out of Folder"
+    category = "Library Outside Project"
 
-    blenlog = context.scene.blender_log
-    cat_not_prod = "Library Outside Project"
-    blenlog.clear_category(cat_not_prod)
+    def __init__(self, context, project_path: Path or str):
+        super().__init__(context)
+        self.project_path = Path(bpy.path.abspath(str(project_path))).resolve()
 
-    for lib in libraries:
-        abs_path = Path(bpy.path.abspath(lib.filepath)).resolve()
-        if project_path not in abs_path.parents:
-            blenlog.add(
-                name=lib.filepath,
-                description=f"{lib.filepath}\nLibrary is not a part of this project.",
-                category=cat_not_prod,
+    def check_library(self, library):
+        abs_path = Path(bpy.path.abspath(library.filepath)).resolve()
+        if self.project_path not in abs_path.parents:
+            self.add(
+                name=library.filepath,
+                description=f"{library.filepath}\nLibrary is not a part of this project.",
                 category_icon='ERROR',
                 # operator='outliner.lib_operation',
                 # op_kwargs={'type': 'RELOCATE'},
             )
 
-    return blenlog.categories.get(cat_not_prod)
+
+def report_missing_libraries(context):
+    run_audit([MissingLibraryCheck(context)])
+    return context.scene.blender_log.categories.get(MissingLibraryCheck.category)
+
+
+def report_absolute_libraries(context):
+    run_audit([AbsoluteLibraryCheck(context)])
+    return context.scene.blender_log.categories.get(AbsoluteLibraryCheck.category)
+
+
+def report_libraries_out_of_folder(context, project_path: Path or str):
+    run_audit([LibraryOutOfFolderCheck(context, project_path)])
+    return context.scene.blender_log.categories.get(LibraryOutOfFolderCheck.category)
 
 
 class BLENLOG_OT_report_missing_libraries(bpy.types.Operator):
@@ -86,9 +90,9 @@ class BLENLOG_OT_report_missing_libraries(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        category = report_missing_libraries(context, bpy.data.libraries)
+        category = report_missing_libraries(context)
 
-        if len(category.logs) > 0:
+        if category and len(category.logs) > 0:
             self.report({'WARNING'}, f"Found {len(category.logs)} missing libraries.")
         else:
             self.report({'INFO'}, f"No missing libraries found.")
@@ -104,9 +108,9 @@ class BLENLOG_OT_report_absolute_libraries(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        category = report_absolute_libraries(context, bpy.data.libraries)
+        category = report_absolute_libraries(context)
 
-        if len(category.logs) > 0:
+        if category and len(category.logs) > 0:
             self.report({'WARNING'}, f"Found {len(category.logs)} absolute libraries.")
         else:
             self.report({'INFO'}, f"No absolute libraries found.")
@@ -128,11 +132,9 @@ class BLENLOG_OT_report_libraries_out_of_folder(bpy.types.Operator):
     )
 
     def execute(self, context):
-        category = report_libraries_out_of_folder(
-            context, bpy.data.libraries, self.project_root_path
-        )
+        category = report_libraries_out_of_folder(context, self.project_root_path)
 
-        if len(category.logs) > 0:
+        if category and len(category.logs) > 0:
             self.report(
                 {'WARNING'}, f"Found {len(category.logs)} libraries outside of the project root."
             )
@@ -4,6 +4,7 @@
 
 import bpy
 from bpy.props import StringProperty
+from ..audit import BlenderLogCheck, register_check, run_audit
 from ..id_types import get_id
 
 
@@ -45,6 +46,53 @@ class BLENLOG_OT_rename_obdata(bpy.types.Operator):
         return {'FINISHED'}
 
 
+@register_check
+class ObdataNameCheck(BlenderLogCheck):
+    """Report objects with data or shape keys not named the same as the object."""
+
+    name = "Object Data Names"
+    category = "Object Data Name Mismatch"
+
+    def begin(self, snapshot):
+        super().begin(snapshot)
+        # Only objects are relevant, so loop over them instead of implementing check_id(),
+        # which would make the audit compute the user map of the whole file.
+        for obj in bpy.data.objects:
+            self.check_object(obj)
+
+    def check_object(self, obj):
+        if not obj.data:
+            return
+        # Skip if obj or data is linked
+        if obj.library or obj.override_library or obj.data.library or obj.data.override_library:
+            return
+
+        if obj.data.name != obj.name:
+            self.add(
+                name=obj.name + " (Data)",
+                description="Object data is not named the same as the containing object. This is unavoidable for multi-user object datas though.",
+                icon='FILE_TEXT',
+                operator=BLENLOG_OT_rename_obdata.bl_idname,
+                op_kwargs={'obj_name': obj.name},
+                op_icon='GREASEPENCIL',
+            )
+
+        if not hasattr(obj.data, 'shape_keys'):
+            return
+        if not obj.data.shape_keys:
+            return
+
+        if obj.data.shape_keys.name != obj.name:
+            self.add(
+                name=obj.name + " (Shape Key Data)",
+                description="Shape Key datablock is not named the same as the containing object. This is unavoidable for multi-user object datas though.",
+                icon='FILE_TEXT',
+                operator=BLENLOG_OT_rename_obdata.bl_idname,
+                op_kwargs={'obj_name': obj.name},
+                op_icon='GREASEPENCIL',
+            )
+
+
 class BLENLOG_OT_report_obdata_names(bpy.types.Operator):
     """Report objects with data or shape keys not named the same as the object"""
 
@@ -53,47 +101,7 @@ class BLENLOG_OT_report_obdata_names(bpy.types.Operator):
     bl_options = {'INTERNAL', 'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        blenlog = context.scene.blender_log
-
-        category = "Object Data Name Mismatch"
-        blenlog.clear_category(category)
-
-        counter = 0
-        for obj in bpy.data.objects:
-            if not obj.data:
-                continue
-            # Skip if obj or data is linked
-            if obj.library or obj.override_library or obj.data.library or obj.data.override_library:
-                continue
-
-            if obj.data.name != obj.name:
-                blenlog.add(
-                    name=obj.name + " (Data)",
-                    category=category,
-                    description="Object data is not named the same as the containing object. This is unavoidable for multi-user object datas though.",
-                    icon='FILE_TEXT',
-                    operator=BLENLOG_OT_rename_obdata.bl_idname,
-                    op_kwargs={'obj_name': obj.name},
-                    op_icon='GREASEPENCIL',
-                )
-                counter += 1
-
-            if not hasattr(obj.data, 'shape_keys'):
-                continue
-            if not obj.data.shape_keys:
-                continue
-
-            if obj.data.shape_keys.name != obj.name:
-                blenlog.add(
-                    name=obj.name + " (Shape Key Data)",
-                    category=category,
-                    description="Shape Key datablock is not named the same as the containing object. This is unavoidable for multi-user object datas though.",
-                    icon='FILE_TEXT',
-                    operator=BLENLOG_OT_rename_obdata.bl_idname,
-                    op_kwargs={'obj_name': obj.name},
-                    op_icon='GREASEPENCIL',
-                )
-                counter += 1
+        counter = run_audit([ObdataNameCheck(context)]).issue_count
 
         if counter == 0:
             self.report({'INFO'}, "No objects with mismatched data names.")
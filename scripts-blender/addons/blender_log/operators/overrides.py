@@ -5,6 +5,7 @@
 import bpy
 from bpy.props import StringProperty
 from .names import get_blender_number_suffix
+from ..audit import BlenderLogCheck, register_check, run_audit
 from ..id_types import get_id
 
 
@@ -16,6 +17,96 @@ def get_desired_override_name(id):
     return override.reference.name + suffix
 
 
+# ID type -> Collection of those IDs in bpy.data, for the ID types whose override names are checked.
+OVERRIDE_NAME_ID_TYPES = {
+    'OBJECT': 'objects',
+    'COLLECTION': 'collections',
+}
+
+
+@register_check
+class OverrideNameCheck(BlenderLogCheck):
+    """Report overridden objects and collections not named after their reference ID."""
+
+    name = "Override Names"
+    category = "Override Name Mismatch"
+    category_taken = "Override Name Occupied"
+    category_conflict = "Override Name Conflict"
+
+    def begin(self, snapshot):
+        super().begin(snapshot)
+        self.blenlog.clear_category(self.category_taken)
+        self.blenlog.clear_category(self.category_conflict)
+
+    def check_id(self, id, users):
+        if id.id_type not in OVERRIDE_NAME_ID_TYPES or not id.override_library:
+            return
+        desired_name = get_desired_override_name(id)
+        if id.name == desired_name:
+            return
+
+        id_type = id.id_type
+        propcoll = getattr(bpy.data, OVERRIDE_NAME_ID_TYPES[id_type])
+        occupied = propcoll.get((desired_name, None))
+        if occupied:
+            if get_desired_override_name(occupied) == occupied.name:
+                self.add(
+                    description=f"Inherent override name conflict! {id.name} should be named {desired_name}, which is already taken by an object that is named correctly. This issue cannot be fixed locally. The number suffix in the name must be removed in the original library ({id.override_library.reference.library.filepath}), or one of the overridden objects must be deleted.",
+                    icon='LIBRARY_DATA_OVERRIDE',
+                    name=id.name,
+                    category=self.category_conflict,
+                )
+            else:
+                self.add(
+                    description=f"Desired overridden {id_type} name '{desired_name}' is already taken from {id.name}. All names should be fixed recursively such that each ID is named after its reference library ID, plus the number suffix of the override hierarchy root.",
+                    icon='LIBRARY_DATA_OVERRIDE',
+                    name=id.name,
+                    category=self.category_taken,
+                    operator=BLENLOG_OT_recursive_override_name_fix.bl_idname,
+                    op_kwargs={'id_name': id.name, 'id_type': id_type},
+                )
+        else:
+            self.add(
+                description=f"Overridden object name doesn't match referenced library object name.",
+                icon='LIBRARY_DATA_OVERRIDE',
+                name=id.name,
+                operator='blenlog.rename_id',
+                op_kwargs={
+                    'id_name': id.name,
+                    'id_type': id_type,
+                    'new_name': desired_name,
+                },
+            )
+
+
+@register_check
+class LeftoverOverrideCheck(BlenderLogCheck):
+    """Report collections left behind by override resyncs."""
+
+    name = "Leftover Overrides"
+    category = "Leftover Overrides"
+
+    def begin(self, snapshot):
+        super().begin(snapshot)
+        self.leftover_names = []
+
+    def check_id(self, id, users):
+        if id.id_type != 'COLLECTION' or id.library:
+            return
+        if id.name not in {'OVERRIDE_RESYNC_LEFTOVERS', 'OVERRIDE_HIDDEN'}:
+            return
+        self.leftover_names.append(id.name)
+        self.add(
+            description=f"Override Resync Leftovers are left behind when an override data hierarchy became ambiguous. This should be extremely rare. Check your overrides for any issues, then you can delete these leftovers.",
+            icon='LIBRARY_DATA_OVERRIDE',
+            name=id.name,
+            operator=BLENLOG_OT_delete_collection_hierarchy.bl_idname,
+            op_kwargs={
+                'coll_name': id.name,
+            },
+        )
+
+
 class BLENLOG_OT_report_library_overrides(bpy.types.Operator):
     """Report various issues relating to library overrides"""
 
@@ -24,99 +115,24 @@ class BLENLOG_OT_report_library_overrides(bpy.types.Operator):
     bl_options = {'INTERNAL', 'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        blenlog = context.scene.blender_log
+        leftover_check = LeftoverOverrideCheck(context)
+        name_check = OverrideNameCheck(context)
+        run_audit([leftover_check, name_check])
 
-        leftovers = report_leftover_overrides(context)
-        if leftovers:
+        if leftover_check.leftover_names:
             self.report(
-                {'WARNING'}, f"There are override leftover collections in the file: {leftovers}"
+                {'WARNING'},
+                f"There are override leftover collections in the file: {leftover_check.leftover_names}",
             )
 
-        cat_name_taken = "Override Name Occupied"
-        blenlog.clear_category(cat_name_taken)
-
-        cat_name_wrong = "Override Name Mismatch"
-        blenlog.clear_category(cat_name_wrong)
-
-        cat_name_conflict = "Override Name Conflict"
-        blenlog.clear_category(cat_name_conflict)
-
-        objects = [obj for obj in bpy.data.objects if obj.override_library]
-        collections = [coll for coll in bpy.data.collections if coll.override_library]
-        iter_stuff = [
-            ('OBJECT', bpy.data.objects, objects),
-            ('COLLECTION', bpy.data.collections, collections),
-        ]
-        counter = 0
-        for id_type, propcoll, ids in iter_stuff:
-            for id in ids:
-                desired_name = get_desired_override_name(id)
-                if id.name == desired_name:
-                    continue
-                counter += 1
-                occupied = propcoll.get((desired_name, None))
-                if occupied:
-                    if get_desired_override_name(occupied) == occupied.name:
-                        blenlog.add(
-                            description=f"Inherent override name conflict! {id.name} should be named {desired_name}, which is already taken by an object that is named correctly. This issue cannot be fixed locally. The number suffix in the name must be removed in the original library ({id.override_library.reference.library.filepath}), or one of the overridden objects must be deleted.",
-                            icon='LIBRARY_DATA_OVERRIDE',
-                            name=id.name,
-                            category=cat_name_conflict,
-                        )
-                    else:
-                        blenlog.add(
-                            description=f"Desired overridden {id_type} name '{desired_name}' is already taken from {id.name}. All names should be fixed recursively such that each ID is named after its reference library ID, plus the number suffix of the override hierarchy root.",
-                            icon='LIBRARY_DATA_OVERRIDE',
-                            name=id.name,
-                            category=cat_name_taken,
-                            operator=BLENLOG_OT_recursive_override_name_fix.bl_idname,
-                            op_kwargs={'id_name': id.name, 'id_type': id_type},
-                        )
-                else:
-                    blenlog.add(
-                        description=f"Overridden object name doesn't match referenced library object name.",
-                        icon='LIBRARY_DATA_OVERRIDE',
-                        name=id.name,
-                        category=cat_name_wrong,
-                        operator='blenlog.rename_id',
-                        op_kwargs={
-                            'id_name': id.name,
-                            'id_type': id_type,
-                            'new_name': desired_name,
-                        },
-                    )
-
-        if counter > 0:
-            self.report({'WARNING'}, f"Found {counter} wrong override names.")
+        if name_check.issue_count > 0:
+            self.report({'WARNING'}, f"Found {name_check.issue_count} wrong override names.")
         else:
             self.report({'INFO'}, f"All overrides are named correctly.")
 
         return {'FINISHED'}
 
 
-def report_leftover_overrides(context):
-    blenlog = context.scene.blender_log
-    category = 'Leftover Overrides'
-    blenlog.clear_category(category)
-    leftovers = [
-        c
-        for c in bpy.data.collections
-        if c.name in {'OVERRIDE_RESYNC_LEFTOVERS', 'OVERRIDE_HIDDEN'}
-    ]
-    for leftover in leftovers:
-        blenlog.add(
-            description=f"Override Resync Leftovers are left behind when an override data hierarchy became ambiguous. This should be extremely rare. Check your overrides for any issues, then you can delete these leftovers.",
-            icon='LIBRARY_DATA_OVERRIDE',
-            name=leftover.name,
-            category=category,
-            operator=BLENLOG_OT_delete_collection_hierarchy.bl_idname,
-            op_kwargs={
-                'coll_name': leftover.name,
-            },
-        )
-    return leftovers
-
-
 class BLENLOG_OT_delete_collection_hierarchy(bpy.types.Operator):
     """Delete a collection hierarchy"""
 
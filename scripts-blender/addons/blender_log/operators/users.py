@@ -4,9 +4,31 @@
 
 import bpy
 from bpy.props import StringProperty, CollectionProperty
+from ..audit import BlenderLogCheck, register_check, run_audit
 from ..id_types import get_id, get_id_storage_by_type_str, get_datablock_icon, get_library_icon
 
 
+@register_check
+class FakeUserCheck(BlenderLogCheck):
+    """Report local IDs with a fake user. Ignores Text and Brush IDs."""
+
+    name = "Fake Users"
+    category = "Fake User ID"
+
+    def check_id(self, id, users):
+        if id.library or id.override_library:
+            return
+        if id.id_type not in {'BRUSH', 'TEXT'} and id.use_fake_user:
+            self.add(
+                name=f"{id.id_type}: {id.name} (Users: {len(users)})",
+                description="Datablocks with fake users can cause further referenced datablocks to linger in the file. It is recommended not to use fake users, in order to keep files clear of trash data.",
+                icon='FAKE_USER_ON',
+                operator=BLENLOG_OT_clear_fake_user.bl_idname,
+                op_kwargs={'id_name': id.name, 'id_type': id.id_type},
+                op_icon='FAKE_USER_OFF',
+            )
+
+
 class BLENLOG_OT_report_fake_users(bpy.types.Operator):
     """Report Fake User IDs. Ignores Text and Brush IDs"""
 
@@ -15,27 +37,7 @@ class BLENLOG_OT_report_fake_users(bpy.types.Operator):
     bl_options = {'INTERNAL', 'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        user_map = bpy.data.user_map()
-
-        blenlog = context.scene.blender_log
-
-        category = "Fake User ID"
-        blenlog.clear_category(category)
-
-        for id, users in user_map.items():
-            if id.library or id.override_library:
-                continue
-            if id.id_type not in {'BRUSH', 'TEXT'} and id.use_fake_user:
-                blenlog.add(
-                    name=f"{id.id_type}: {id.name} (Users: {len(users)})",
-                    category=category,
-                    description="Datablocks with fake users can cause further referenced datablocks to linger in the file. It is recommended not to use fake users, in order to keep files clear of trash data.",
-                    icon='FAKE_USER_ON',
-                    operator=BLENLOG_OT_clear_fake_user.bl_idname,
-                    op_kwargs={'id_name': id.name, 'id_type': id.id_type},
-                    op_icon='FAKE_USER_OFF',
-                )
-
+        run_audit([FakeUserCheck(context)])
         return {'FINISHED'}
 
 
@@ -1,6 +1,6 @@
 import bpy
 from bpy.types import AddonPreferences
-from bpy.props import BoolProperty, StringProperty
+from bpy.props import BoolProperty, IntProperty, StringProperty
 from .ui import change_ui_category
 from .util import get_addon_prefs
 from .operators import better_delete
@@ -22,6 +22,12 @@ class BlenLog_Prefs(AddonPreferences):
         description="Run a recursive purge on file save, rather than simply not saving unused datablocks, which is Blender's default behaviour. This ensures your file is never saved with any garbage orphan data",
         default=False,
     )
+    full_purge_interval: IntProperty(
+        name="Full Purge Interval",
+        description="Run a full recursive purge on every Nth save. Other saves only remove data-blocks with no users, which is much faster, but misses unused data-blocks that only use each other. Saves of a file that didn't change since the last purge don't purge at all",
+        default=10,
+        min=1,
+    )
 
     def update_deletion_pie(self, context):
         if self.use_deletion_pie:
@@ -57,6 +63,9 @@ class BlenLog_Prefs(AddonPreferences):
         layout.separator()
         layout.label(text="Mistake Avoidance:")
         layout.prop(self, 'purge_on_save')
+        row = layout.row()
+        row.active = self.purge_on_save
+        row.prop(self, 'full_purge_interval')
         layout.prop(self, 'use_deletion_pie')
 
 
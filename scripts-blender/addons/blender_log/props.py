@@ -7,8 +7,9 @@ from bpy.props import (
 )
 
 import bpy, json
+from bpy.app.handlers import persistent
 
-from .util import get_pretty_stack
+from .util import get_addon_prefs, get_pretty_stack
 
 
 class BlenderLog_Entry(PropertyGroup):
@@ -59,6 +60,8 @@ class BlenderLog_Category(PropertyGroup):
     icon: StringProperty()
     active_log_index: IntProperty()
     logs: CollectionProperty(type=BlenderLog_Entry)
+    # Number of logs with a quick-fix operator, so the UI doesn't need to check every log.
+    num_fixable: IntProperty()
 
     @property
     def active_log(self):
@@ -74,6 +77,10 @@ class BlenderLog_Category(PropertyGroup):
     def clear(self):
         self.logs.clear()
         self.active_log_index = 0
+        self.num_fixable = 0
+
+    def update_num_fixable(self):
+        self.num_fixable = sum(1 for log in self.logs if log.operator)
 
 
 class BlenderLog_Manager(PropertyGroup):
@@ -122,48 +129,55 @@ class BlenderLog_Manager(PropertyGroup):
             cat_entry.icon = category_icon or icon
 
         entry = cat_entry.logs.add()
-        entry.pretty_stack = get_pretty_stack()
+        # Walking and formatting the stack is by far the slowest part of adding an entry,
+        # so only do it when it's going to be displayed.
+        if get_addon_prefs().display_stack_trace:
+            entry.pretty_stack = get_pretty_stack()
 
         entry.name = name
         entry.description = description
         entry.category = category
         entry.icon = icon
 
-        entry.operator = operator
-        entry.op_kwargs = json.dumps(op_kwargs)
+        if operator:
+            entry.operator = operator
+            cat_entry.num_fixable += 1
+        entry.op_kwargs = json.dumps(op_kwargs) if op_kwargs else "{}"
         entry.op_text = op_text
         entry.op_icon = op_icon
 
         return entry
 
     def remove(self, log):
-        removed = False
-        for cat in self.categories:
-            for other_log in cat.logs:
-                if log == other_log:
-                    cat.logs.remove(cat.get_index(log))
-                    removed = True
-                    break
-            if removed:
-                break
-        if removed and len(cat.logs) == 0:
+        cat = self.categories.get(log.category)
+        if not cat:
+            return
+        index = cat.get_index(log)
+        if index is None:
+            return
+        self.remove_log_at(cat, index)
+
+    def remove_log_at(self, cat, index: int):
+        if cat.logs[index].operator:
+            cat.num_fixable -= 1
+        cat.logs.remove(index)
+        if len(cat.logs) == 0:
             self.clear_category(cat.name)
 
     def remove_active(self):
-        self.remove(self.active_log)
+        # The active log's indices are already known, no need to search for it.
+        cat = self.active_category
+        if cat and cat.active_log:
+            self.remove_log_at(cat, cat.active_log_index)
 
     def remove_category(self, cat):
         self.categories.remove(self.get_index(cat))
 
     def get_category(self, cat_name: str):
-        for cat in self.categories:
-            if cat.name == cat_name:
-                return cat
+        return self.categories.get(cat_name)
 
     def get_index(self, cat):
-        for i, c in enumerate(self.categories):
-            if c == cat:
-                return i
+        return self.categories.find(cat.name)
 
     def clear_category(self, cat_name: str):
         cat = self.get_category(cat_name)
@@ -179,9 +193,19 @@ registry = [
 ]
 
 
+@persistent
+def update_num_fixable(*_args):
+    # Files saved before num_fixable existed load it as 0, which would disable Quick-Fix.
+    for scene in bpy.data.scenes:
+        for cat in scene.blender_log.categories:
+            cat.update_num_fixable()
+
+
 def register():
     bpy.types.Scene.blender_log = PointerProperty(type=BlenderLog_Manager)
+    bpy.app.handlers.load_post.append(update_num_fixable)
 
 
 def unregister():
+    bpy.app.handlers.load_post.remove(update_num_fixable)
     del bpy.types.Scene.blender_log
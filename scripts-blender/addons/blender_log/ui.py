@@ -129,6 +129,12 @@ class BLENLOG_MT_log_checks(Menu):
 
     def draw(self, context):
         layout = self.layout
+        layout.operator(
+            'blenlog.audit_file',
+            text="Audit File",
+            icon='VIEWZOOM',
+        )
+        layout.separator()
         layout.operator(
             'blenlog.report_fake_users',
             text="Report Fake User Datablocks",
@@ -161,7 +167,7 @@ class BLENLOG_OT_quick_fix_category(Operator):
     @classmethod
     def poll(cls, context):
         active_cat = context.scene.blender_log.active_category
-        return any([log.operator for log in active_cat.logs])
+        return active_cat and active_cat.num_fixable > 0
 
     def execute(self, context):
         active_cat = context.scene.blender_log.active_category
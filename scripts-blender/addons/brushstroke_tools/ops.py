@@ -235,6 +235,7 @@ class BSBST_OT_new_brushstrokes(bpy.types.Operator):
             mod.show_group_selector = False
 
         # update brushstroke context
+        utils.brushstrokes_index.update_object(brushstrokes_object)
         utils.find_context_brushstrokes(context.scene, context.view_layer.depsgraph)
         for i, name in enumerate([bs.name for bs in settings.context_brushstrokes]):
             if name == brushstrokes_object.name:
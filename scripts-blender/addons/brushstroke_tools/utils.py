@@ -2,7 +2,7 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import os, ast, fnmatch, platform, subprocess
+import os, ast, json, fnmatch, platform, subprocess
 from pathlib import Path
 from zipfile import ZipFile
 import bpy
@@ -16,6 +16,8 @@ addon_version = (0,0,0)
 
 preview_name = '.BSBST-preview'
 
+brush_style_catalog_name = '.brush_style_catalog.json'
+
 ng_list = [
     ".brushstroke_tools.draw_processing",
     ".brushstroke_tools.pre_processing",
@@ -38,9 +40,84 @@ linkable_sockets = [
 asset_lib_name = 'Brushstroke Tools Library'
 
 
+class BrushstrokesIndex():
+    # Maps surface and flow objects to the names of the brushstrokes objects using them,
+    # so the brushstroke context doesn't need to look through all objects of the file.
+    # Objects are keyed by pointer, since their names can change at any time.
+    # Rebuilt in full on file load and undo, otherwise kept up to date from depsgraph updates.
+
+    def __init__(self):
+        self.is_valid = False
+        self.context_map = dict()
+        self.brushstrokes = dict()
+
+    def invalidate(self):
+        self.is_valid = False
+
+    def rebuild(self):
+        self.context_map.clear()
+        self.brushstrokes.clear()
+        for ob in bpy.data.objects:
+            self.update_object(ob)
+        self.is_valid = True
+
+    def update_object(self, ob):
+        self.remove_brushstrokes(ob.name)
+        if not is_brushstrokes_object(ob):
+            return
+        context_pointers = set()
+        for context_ob in [get_surface_object(ob), get_flow_object(ob)]:
+            if not context_ob:
+                continue
+            pointer = context_ob.as_pointer()
+            context_pointers.add(pointer)
+            self.context_map.setdefault(pointer, set()).add(ob.name)
+        self.brushstrokes[ob.name] = context_pointers
+
+    def remove_brushstrokes(self, name):
+        for pointer in self.brushstrokes.pop(name, ()):
+            names = self.context_map[pointer]
+            names.discard(name)
+            if not names:
+                del self.context_map[pointer]
+
+    def update(self, depsgraph):
+        if not self.is_valid:
+            self.rebuild()
+            return
+        for update in depsgraph.updates:
+            if type(update.id) is not bpy.types.Object:
+                continue
+            self.update_object(update.id.original)
+
+    def get_brushstrokes(self, context_object, flow_only=False):
+        # Returns brushstrokes objects using the context object as their surface or flow, sorted by name.
+        if not context_object:
+            return []
+        names = self.context_map.get(context_object.as_pointer(), ())
+        brushstrokes = []
+        for name in sorted(names):
+            ob = bpy.data.objects.get(name)
+            if not ob:
+                # Renamed or removed without the depsgraph telling us.
+                self.rebuild()
+                return self.get_brushstrokes(context_object, flow_only)
+            if get_flow_object(ob) == context_object:
+                brushstrokes.append(ob)
+            elif not flow_only and get_surface_object(ob) == context_object:
+                brushstrokes.append(ob)
+        return brushstrokes
+
+brushstrokes_index = BrushstrokesIndex()
+
+@persistent
+def invalidate_brushstrokes_index(*args):
+    brushstrokes_index.invalidate()
+
 @persistent
 def find_context_brushstrokes(scene, depsgraph):
     settings = scene.BSBST_settings
+    brushstrokes_index.update(depsgraph)
 
     edit_toggle = settings.edit_toggle
     settings.edit_toggle = False
@@ -48,11 +125,10 @@ def find_context_brushstrokes(scene, depsgraph):
     name_prev = settings.context_brushstrokes[settings.active_context_brushstrokes_index].name if len_prev else ''
     idx = settings.active_context_brushstrokes_index
     # identify context brushstrokes
-    for el in range(len(settings.context_brushstrokes)):
-        settings.context_brushstrokes.remove(0)
     context_object = depsgraph.view_layer.objects.active
     if not is_brushstrokes_object(context_object):
-        bs_ob = is_flow_object(context_object)
+        flow_users = brushstrokes_index.get_brushstrokes(context_object, flow_only=True)
+        bs_ob = flow_users[0] if flow_users else None
         if bs_ob:
             context_object = bs_ob
     else:
@@ -60,23 +136,19 @@ def find_context_brushstrokes(scene, depsgraph):
     surf_ob = get_surface_object(context_object)
     if surf_ob:
         context_object = surf_ob
-    for ob in bpy.data.objects:
-        if not is_brushstrokes_object(ob):
-            continue
-        surf_ob = get_surface_object(ob)
-        flow_ob = get_flow_object(ob)
-        if not surf_ob:
-            if not flow_ob:
-                continue
-        if not surf_ob == context_object:
-            if not flow_ob == context_object:
-                continue
-        bs = settings.context_brushstrokes.add()
-        bs.name = ob.name
-        bs.method = ob['BSBST_method']
-        bs.hide_viewport_base = ob.hide_get()
-        if name_prev == ob.name:
-            idx = len(settings.context_brushstrokes)-1
+    brushstrokes = brushstrokes_index.get_brushstrokes(context_object)
+    # only rebuild the list when it changed, to not cause more updates
+    entries = [(ob.name, ob['BSBST_method'], ob.hide_get()) for ob in brushstrokes]
+    if entries != [(bs.name, bs.method, bs.hide_viewport_base) for bs in settings.context_brushstrokes]:
+        settings.context_brushstrokes.clear()
+        for name, method, hide in entries:
+            bs = settings.context_brushstrokes.add()
+            bs.name = name
+            bs.method = method
+            bs.hide_viewport_base = hide
+    for i, (name, method, hide) in enumerate(entries):
+        if name_prev == name:
+            idx = i
     if not settings.context_brushstrokes:
         settings.edit_toggle = edit_toggle
         return
@@ -505,6 +577,25 @@ def update_asset_lib_path():
     lib.path = str(get_resource_directory())
     refresh_brushstroke_styles()
 
+def read_brush_style_catalog(dir: Path = None):
+    if not dir:
+        dir = get_resource_directory()
+    try:
+        with open(dir.joinpath(brush_style_catalog_name), "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return dict()
+
+def write_brush_style_catalog(catalog, dir: Path = None):
+    if not dir:
+        dir = get_resource_directory()
+    try:
+        with open(dir.joinpath(brush_style_catalog_name), "w") as file:
+            json.dump(catalog, file, indent=1)
+    except OSError:
+        # the resource directory might not be writable, the catalog is only a cache
+        pass
+
 def refresh_brushstroke_styles():
     addon_prefs = bpy.context.preferences.addons[__package__].preferences
     bs_list = addon_prefs.brush_styles
@@ -513,7 +604,11 @@ def refresh_brushstroke_styles():
         bs_list.remove(0)
 
     lib_path = get_resource_directory()
-    add_brush_styles_from_directory(bs_list, lib_path)
+    catalog = read_brush_style_catalog(lib_path)
+    new_catalog = dict()
+    add_brush_styles_from_directory(bs_list, lib_path, catalog, new_catalog)
+    if new_catalog != catalog:
+        write_brush_style_catalog(new_catalog, lib_path)
 
     # find additional local brush styles
     if not 'node_groups' in dir(bpy.data):
@@ -539,22 +634,44 @@ def add_brush_styles_from_names(bs_list, ng_names, filepath, name_filter = []):
             b_style.category = name_elements[1]
         b_style.type = name_elements[-2]
 
-def add_brush_styles_from_directory(bs_list, path):
-    if not 'libraries' in dir(bpy.data):
-        return
-    subdirs = [f.path for f in os.scandir(path) if f.is_dir()]
-    files = [f.path for f in os.scandir(path) if not f.is_dir()]
-
-    for filepath in files:
+def add_brush_styles_from_directory(bs_list, path, catalog = None, new_catalog = None):
+    """
+    Adds the brush styles of all .blend files in the directory and its sub-directories.
+    The node group names of each file are stored in the new catalog, so files that
+    are listed in the catalog with the same modification time and size are not opened again.
+    """
+    if catalog is None:
+        catalog = dict()
+    if new_catalog is None:
+        new_catalog = dict()
+    can_load = 'libraries' in dir(bpy.data)
+    entries = list(os.scandir(path))
+    subdirs = [f.path for f in entries if f.is_dir()]
+    files = [f for f in entries if not f.is_dir()]
+
+    for f in files:
+        filepath = f.path
         if not filepath.endswith('.blend'):
             continue
 
-        names = []
-        with bpy.data.libraries.load(filepath) as (data_from, data_to):
-            add_brush_styles_from_names(bs_list, data_from.node_groups, filepath)
+        stat = f.stat()
+        cached = catalog.get(filepath)
+        if cached and cached['mtime'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+            ng_names = cached['node_groups']
+        elif can_load:
+            with bpy.data.libraries.load(filepath) as (data_from, data_to):
+                ng_names = [name for name in data_from.node_groups if name.startswith('BSBST-BS')]
+        else:
+            continue
+        new_catalog[filepath] = {
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'node_groups': ng_names,
+        }
+        add_brush_styles_from_names(bs_list, ng_names, filepath)
 
     for d in subdirs:
-        add_brush_styles_from_directory(bs_list, d)
+        add_brush_styles_from_directory(bs_list, d, catalog, new_catalog)
 
 def find_brush_style_by_name(name: str):
     addon_prefs = bpy.context.preferences.addons[__package__].preferences
@@ -752,6 +869,9 @@ def set_surface_object(bs, surf_ob):
         bs.data.surface_uv_map = surf_ob.data.uv_layers.active.name
 
     bs['BSBST_surface_object'] = surf_ob
+    # Neither the ID property nor the modifier input tag the brushstrokes object,
+    # so the depsgraph won't report it to the index.
+    brushstrokes_index.update_object(bs)
 
 def get_flow_object(bs):
     if not bs:
@@ -777,6 +897,7 @@ def set_flow_object(bs, ob):
     ob.update_tag()
 
     bs['BSBST_flow_object'] = ob
+    brushstrokes_index.update_object(bs)
 
 def context_brushstrokes(context):
     settings = context.scene.BSBST_settings
@@ -1324,8 +1445,14 @@ def register():
     for c in classes:
         bpy.utils.register_class(c)
     bpy.app.handlers.depsgraph_update_post.append(refresh_preset)
+    bpy.app.handlers.load_post.append(invalidate_brushstrokes_index)
+    bpy.app.handlers.undo_post.append(invalidate_brushstrokes_index)
+    bpy.app.handlers.redo_post.append(invalidate_brushstrokes_index)
 
 def unregister():
     for c in classes:
         bpy.utils.unregister_class(c)
-    bpy.app.handlers.depsgraph_update_post.remove(refresh_preset)
\ No newline at end of file
+    bpy.app.handlers.depsgraph_update_post.remove(refresh_preset)
+    bpy.app.handlers.load_post.remove(invalidate_brushstrokes_index)
+    bpy.app.handlers.undo_post.remove(invalidate_brushstrokes_index)
+    bpy.app.handlers.redo_post.remove(invalidate_brushstrokes_index)
\ No newline at end of file
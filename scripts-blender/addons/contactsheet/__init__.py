@@ -10,6 +10,7 @@ from . import (
     ui,
     geo,
     geo_seq,
+    image_sheet,
 )
 from .log import LoggerFactory
 
@@ -32,6 +33,7 @@ if _need_reload:
 
     geo_seq = importlib.reload(geo_seq)
     geo = importlib.reload(geo)
+    image_sheet = importlib.reload(image_sheet)
     props = importlib.reload(props)
     prefs = importlib.reload(prefs)
     opsdata = importlib.reload(opsdata)
@@ -0,0 +1,228 @@
+# SPDX-FileCopyrightText: 2021 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Builds a contactsheet directly as an image buffer, without copying the scene.
+
+The cell layout is calculated with the same Grid class that is used to place the
+transform strips of the contactsheet scene. Instead of rendering the sequencer,
+one representative frame of each strip is decoded, scaled to its cell and
+copied into a numpy buffer that gets written as a single image.
+
+Frames of movie strips are extracted with ffmpeg, since Blender has no API to
+read the pixels of a specific movie frame. Without ffmpeg the first frame is used.
+"""
+
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import bpy
+import numpy as np
+
+from .geo import Grid, NestedRectangle, Rectangle
+from .log import LoggerFactory
+
+logger = LoggerFactory.getLogger(name=__name__)
+
+
+def get_strip_preview_frame(strip: "bpy.types.Strip") -> int:
+    """
+    Returns the scene frame in the middle of the visible range of the strip.
+    """
+    return (strip.frame_final_start + strip.frame_final_end - 1) // 2
+
+
+def get_strip_media_path(strip: "bpy.types.Strip", frame: int) -> Optional[Path]:
+    if strip.type == "IMAGE":
+        elem = strip.strip_elem_from_frame(frame) or strip.elements[0]
+        return Path(bpy.path.abspath(strip.directory)).joinpath(elem.filename)
+
+    if strip.type == "MOVIE":
+        return Path(bpy.path.abspath(strip.filepath))
+
+    return None
+
+
+def extract_movie_frame(
+    strip: "bpy.types.MovieStrip", frame: int, directory: Path
+) -> Optional[Path]:
+    """
+    Writes the movie frame shown by the strip at the scene frame to a PNG in
+    directory with ffmpeg. Returns None if ffmpeg is not available or fails.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return None
+
+    movie_frame = frame - int(strip.frame_start)
+    output_path = directory.joinpath("frame.png")
+    cmd = [
+        ffmpeg,
+        "-loglevel",
+        "error",
+        "-y",
+        # Seeking before the input is fast, and frame accurate when decoding.
+        "-ss",
+        f"{movie_frame / strip.fps:.6f}",
+        "-i",
+        bpy.path.abspath(strip.filepath),
+        "-frames:v",
+        "1",
+        output_path.as_posix(),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0 or not output_path.exists():
+        logger.warning("ffmpeg failed to extract frame of %s: %s", strip.name, result.stderr)
+        return None
+    return output_path
+
+
+def srgb_from_linear(rgb: np.ndarray) -> np.ndarray:
+    rgb = np.clip(rgb, 0.0, 1.0)
+    return np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * np.power(rgb, 1 / 2.4) - 0.055)
+
+
+def get_display_pixels(image: bpy.types.Image, pixels: np.ndarray) -> np.ndarray:
+    """
+    Float buffers hold scene linear values, and byte buffers hold the values
+    of their colour space. Returns pixels encoded as sRGB, to match the byte
+    image the contactsheet is written to.
+    """
+    colorspace = image.colorspace_settings
+    if colorspace.is_data:
+        return pixels
+    if image.is_float or colorspace.name.startswith("Linear"):
+        pixels[..., :3] = srgb_from_linear(pixels[..., :3])
+    return pixels
+
+
+def load_strip_pixels(
+    strip: "bpy.types.Strip", width: int, height: int
+) -> Optional[np.ndarray]:
+    """
+    Decodes the preview frame of the strip, scales it to width x height and
+    returns the sRGB pixels as (height, width, 4) float array, bottom row first.
+    """
+    frame = get_strip_preview_frame(strip)
+    filepath = get_strip_media_path(strip, frame)
+    if not filepath or not filepath.exists():
+        logger.warning("Media of strip %s not found: %s", strip.name, filepath)
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if strip.type == "MOVIE":
+            filepath = extract_movie_frame(strip, frame, Path(tmp_dir)) or filepath
+
+        image = bpy.data.images.load(filepath.as_posix(), check_existing=False)
+        try:
+            image.colorspace_settings.name = strip.colorspace_settings.name
+            image.scale(width, height)
+            pixels = np.empty(width * height * 4, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            pixels = get_display_pixels(image, pixels.reshape((height, width, 4)))
+        except RuntimeError as e:
+            logger.warning("Failed to decode strip %s: %s", strip.name, str(e))
+            return None
+        finally:
+            bpy.data.images.remove(image)
+
+    return pixels
+
+
+def get_strip_rect(strip: "bpy.types.Strip") -> Rectangle:
+    elem = strip.elements[0]
+    return Rectangle(0, 0, elem.orig_width, elem.orig_height)
+
+
+def layout_grid(
+    strips: List["bpy.types.Strip"],
+    width: int,
+    height: int,
+    row_count: Optional[int],
+) -> Grid:
+    """
+    Same grid as CS_OT_make_contactsheet, but with plain Rectangles as content,
+    so no strip transforms are touched.
+    """
+    content: List[NestedRectangle] = []
+    for strip in strips:
+        rect = get_strip_rect(strip)
+        content.append(NestedRectangle(0, 0, rect.width, rect.height, child=rect))
+
+    return Grid.from_content(0, 0, width, height, content, row_count=row_count)
+
+
+def fit_in_cell(rect: Rectangle, cell: Rectangle, scale_factor: float) -> Rectangle:
+    """
+    Returns rect scaled to fit in cell, keeping its aspect ratio, scaled by
+    scale_factor and centered in the cell.
+    """
+    scale = min(cell.width / rect.width, cell.height / rect.height) * scale_factor
+    width = max(int(rect.width * scale), 1)
+    height = max(int(rect.height * scale), 1)
+    return Rectangle(
+        cell.x + (cell.width - width) // 2,
+        cell.y + (cell.height - height) // 2,
+        width,
+        height,
+    )
+
+
+def build_contactsheet_pixels(
+    strips: List["bpy.types.Strip"],
+    width: int,
+    height: int,
+    row_count: Optional[int],
+    scale_factor: float,
+) -> np.ndarray:
+    """
+    Returns a (height, width, 4) float buffer with one cell per strip on black background.
+    """
+    sheet = np.zeros((height, width, 4), dtype=np.float32)
+    sheet[..., 3] = 1.0
+
+    grid = layout_grid(strips, width, height, row_count)
+
+    for strip, cell in zip(strips, grid.get_cells_all()):
+        rect = fit_in_cell(get_strip_rect(strip), cell, scale_factor)
+        x, y = max(rect.x, 0), max(rect.y, 0)
+        w = min(rect.width, width - x)
+        h = min(rect.height, height - y)
+        if w <= 0 or h <= 0:
+            continue
+
+        pixels = load_strip_pixels(strip, w, h)
+        if pixels is None:
+            continue
+
+        # Grid has top left origin, image buffers start at the bottom row.
+        row_start = height - y - h
+        sheet[row_start : row_start + h, x : x + w] = pixels
+
+    return sheet
+
+
+def save_pixels(pixels: np.ndarray, filepath: Path) -> None:
+    """
+    Writes a (height, width, 4) float buffer of sRGB values as 8 bit PNG.
+    """
+    height, width = pixels.shape[:2]
+    image = bpy.data.images.new(filepath.stem, width=width, height=height, alpha=False)
+    try:
+        image.pixels.foreach_set(pixels.ravel())
+        image.filepath_raw = filepath.as_posix()
+        image.file_format = "PNG"
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+
+def get_page_filepath(filepath: Path, page_index: int, page_count: int) -> Path:
+    if page_count <= 1:
+        return filepath
+    return filepath.with_name(f"{filepath.stem}_{page_index + 1:03}{filepath.suffix}")
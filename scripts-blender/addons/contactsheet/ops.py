@@ -8,7 +8,7 @@ from typing import Set, List
 
 import bpy
 
-from . import prefs, opsdata
+from . import prefs, opsdata, image_sheet
 from .log import LoggerFactory
 from .geo_seq import SequenceRect
 from .geo import Grid, NestedRectangle
@@ -38,12 +38,7 @@ class CS_OT_make_contactsheet(bpy.types.Operator):
         addon_prefs = prefs.addon_prefs_get(context)
 
         # Gather strips to process.
-        strips = context.selected_strips
-        if not strips:
-            # If nothing selected take a continuous row of the top most strips.
-            strips = opsdata.get_top_level_valid_strips_continuous(context)
-        else:
-            strips = opsdata.get_valid_cs_strips(strips)
+        strips = opsdata.get_contactsheet_strips(context)
 
         # Select strips, will remove strips later that are not selected.
         bpy.ops.sequencer.select_all(action="DESELECT")
@@ -177,38 +172,75 @@ class CS_OT_make_contactsheet(bpy.types.Operator):
         context.scene.render.image_settings.compression = 15
 
     def set_output_path(self, context: bpy.types.Context) -> None:
-        addon_prefs = prefs.addon_prefs_get(context)
-        cs_dir: Path = addon_prefs.contactsheet_dir_path
-        output_path: str = ""
+        output_path = opsdata.get_output_path(context)
 
         # File not saved and cs_dir not available.
-        if not bpy.data.filepath and not cs_dir:
+        if not output_path:
             logger.warning(
                 "Failed to set output settings. Contactsheet Output Directory "
                 "not defined in addon preferences and file not saved."
             )
             return
 
-        # File saved and cs_dir available.
-        if cs_dir and bpy.data.filepath:
-            output_path = cs_dir.joinpath(
-                f"{Path(bpy.data.filepath).stem}_contactsheet.png"
-            ).as_posix()
-
-        # File not saved but cs_dir available.
-        elif cs_dir:
-            output_path = cs_dir.joinpath(f"contactsheet.png").as_posix()
-
-        # File saved but cs_dir not available.
-        else:
-            output_path = (
-                Path(bpy.data.filepath)
-                .parent.joinpath(f"{Path(bpy.data.filepath).stem}_contactsheet.png")
-                .as_posix()
+        # Set output path.
+        context.scene.render.filepath = output_path.as_posix()
+
+
+class CS_OT_render_contactsheet_image(bpy.types.Operator):
+    """
+    This operator writes a contactsheet of the selected sequence strips directly
+    to an image file. Unlike CS_OT_make_contactsheet it does not create a scene copy,
+    it decodes one frame per strip and tiles them in an image buffer.
+    """
+
+    bl_idname = "contactsheet.render_contactsheet_image"
+    bl_label = "Render Contact Sheet Image"
+    bl_description = (
+        "Writes a contactsheet image with one frame of each of the previously selected strips, "
+        "without creating a temporary scene. "
+        "If no strips were selected it takes a continuous row of the top most strips"
+    )
+
+    @classmethod
+    def poll(cls, context: bpy.types.Context) -> bool:
+        return opsdata.poll_make_contactsheet(context)
+
+    def execute(self, context: bpy.types.Context) -> Set[str]:
+        addon_prefs = prefs.addon_prefs_get(context)
+        cs_props = context.scene.contactsheet
+
+        output_path = opsdata.get_output_path(context)
+        if not output_path:
+            self.report(
+                {"ERROR"},
+                "Contactsheet Output Directory not defined in addon preferences and file not saved",
             )
+            return {"CANCELLED"}
 
-        # Set output path.
-        context.scene.render.filepath = output_path
+        strips = opsdata.get_contactsheet_strips(context)
+        strips.sort(key=lambda strip: (strip.frame_final_start, strip.channel))
+
+        row_count = cs_props.rows if cs_props.use_custom_rows else None
+        page_size = cs_props.cells_per_page or len(strips)
+        pages = [strips[i : i + page_size] for i in range(0, len(strips), page_size)]
+
+        for page_index, page_strips in enumerate(pages):
+            pixels = image_sheet.build_contactsheet_pixels(
+                page_strips,
+                cs_props.contactsheet_x,
+                cs_props.contactsheet_y,
+                row_count,
+                addon_prefs.contactsheet_scale_factor,
+            )
+            page_path = image_sheet.get_page_filepath(output_path, page_index, len(pages))
+            image_sheet.save_pixels(pixels, page_path)
+            logger.info("Saved contactsheet: %s", page_path.as_posix())
+
+        self.report(
+            {"INFO"},
+            f"Saved contactsheet with {len(strips)} strips on {len(pages)} page(s): {output_path.parent.as_posix()}",
+        )
+        return {"FINISHED"}
 
 
 class CS_OT_exit_contactsheet(bpy.types.Operator):
@@ -252,6 +284,7 @@ class CS_OT_exit_contactsheet(bpy.types.Operator):
 
 classes = [
     CS_OT_make_contactsheet,
+    CS_OT_render_contactsheet_image,
     CS_OT_exit_contactsheet,
 ]
 
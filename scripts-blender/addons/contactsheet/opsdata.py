@@ -2,11 +2,12 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from pathlib import Path
 from typing import Optional, List, Tuple
 
 import bpy
 
-from . import checksqe
+from . import checksqe, prefs
 from .log import LoggerFactory
 
 logger = LoggerFactory.getLogger(name=__name__)
@@ -77,19 +78,49 @@ def get_top_level_valid_strips_continuous(
     return strips
 
 
+def get_contactsheet_strips(context: bpy.types.Context) -> List["bpy.types.Strip"]:
+    """
+    Returns the valid selected strips. If nothing is selected returns
+    a continuous row of the top most strips.
+    """
+    strips = context.selected_strips
+
+    if not strips:
+        return get_top_level_valid_strips_continuous(context)
+
+    return get_valid_cs_strips(strips)
+
+
 def poll_make_contactsheet(context: bpy.types.Context) -> bool:
 
     if not context.scene.sequence_editor.strips_all:
         return False
 
-    strips = context.selected_strips
+    return bool(get_contactsheet_strips(context))
 
-    if not strips:
-        valid_strips = get_top_level_valid_strips_continuous(context)
-    else:
-        valid_strips = get_valid_cs_strips(strips)
 
-    return bool(valid_strips)
+def get_output_path(context: bpy.types.Context) -> Optional[Path]:
+    """
+    Returns contactsheet output filepath. Uses the Contactsheet Output Directory
+    of the addon preferences and falls back to the directory of the blend file.
+    Returns None if neither is available.
+    """
+    addon_prefs = prefs.addon_prefs_get(context)
+    cs_dir: Optional[Path] = addon_prefs.contactsheet_dir_path
 
+    # File not saved and cs_dir not available.
+    if not bpy.data.filepath and not cs_dir:
+        return None
 
-# TODO: add function to actually get strips, same structure in 3 places.
+    # File saved and cs_dir available.
+    if cs_dir and bpy.data.filepath:
+        return cs_dir.joinpath(f"{Path(bpy.data.filepath).stem}_contactsheet.png")
+
+    # File not saved but cs_dir available.
+    elif cs_dir:
+        return cs_dir.joinpath("contactsheet.png")
+
+    # File saved but cs_dir not available.
+    return Path(bpy.data.filepath).parent.joinpath(
+        f"{Path(bpy.data.filepath).stem}_contactsheet.png"
+    )
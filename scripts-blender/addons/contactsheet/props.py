@@ -32,6 +32,14 @@ class CS_property_group_scene(bpy.types.PropertyGroup):
         description="Enables to overwrite the amount of rows for the contactsheet. Is otherwise calculated automatically",
     )
 
+    cells_per_page: bpy.props.IntProperty(
+        name="Cells per Page",
+        description="Maximum amount of strips per image when rendering the contactsheet image directly. "
+        "More strips are written to additional numbered pages. 0 puts all strips on one page",
+        min=0,
+        default=0,
+    )
+
     contactsheet_x: bpy.props.IntProperty(
         name="Resolution X",
         default=1920,
@@ -6,6 +6,7 @@ import bpy
 
 from .ops import (
     CS_OT_make_contactsheet,
+    CS_OT_render_contactsheet_image,
     CS_OT_exit_contactsheet,
 )
 from . import opsdata
@@ -38,11 +39,7 @@ class CS_PT_contactsheet(bpy.types.Panel):
         # Make contact sheet.
         row = layout.row(align=True)
 
-        strips = context.selected_strips
-        if not strips:
-            valid_strips = opsdata.get_top_level_valid_strips_continuous(context)
-        else:
-            valid_strips = opsdata.get_valid_cs_strips(strips)
+        valid_strips = opsdata.get_contactsheet_strips(context)
 
         text = f"Make Contactsheet with {len(valid_strips)} strips"
 
@@ -58,6 +55,11 @@ class CS_PT_contactsheet(bpy.types.Panel):
         row.prop(context.scene.contactsheet, "contactsheet_x", text="X")
         row.prop(context.scene.contactsheet, "contactsheet_y", text="Y")
 
+        # Render contact sheet image without scene copy.
+        row = layout.row(align=True)
+        row.operator(CS_OT_render_contactsheet_image.bl_idname, icon="RENDER_STILL")
+        row.prop(context.scene.contactsheet, "cells_per_page", text="Per Page")
+
 
 # ----------------REGISTER--------------.
 
@@ -4,14 +4,19 @@
 
 import re
 
+import numpy as np
 from bpy.props import EnumProperty
-from bpy.types import Object, Operator, VertexGroup
+from bpy.types import Mesh, Object, Operator, VertexGroup
 from bpy.utils import flip_name
 from mathutils import Vector
 from mathutils.bvhtree import BVHTree
 
 from ..utils import poll_deformed_mesh_with_vgroups
 
+# Mirrored weights are rounded to this before being written, so that vertices can be
+# written in batches of equal weight.
+WEIGHT_PRECISION = 1e-4
+
 
 class EASYWEIGHT_OT_symmetrize_groups(Operator):
     """Symmetrize weights of vertex groups on a near-symmetrical mesh. May have poor results on assymetrical meshes"""
@@ -89,8 +94,6 @@ class EASYWEIGHT_OT_symmetrize_groups(Operator):
                 return {"CANCELLED"}
             vgroups = [active_vgroup]
 
-        mirror_bvh, mirror_tris = build_mirror_bvh(obj=obj)
-
         if self.direction == "AUTOMATIC":
             self.direction = "LEFT_TO_RIGHT"
             righties = sum(1 for vg in vgroups if is_side_right(vg.name) is True)
@@ -98,14 +101,11 @@ class EASYWEIGHT_OT_symmetrize_groups(Operator):
             if righties > lefties:
                 self.direction = "RIGHT_TO_LEFT"
 
-        for vgroup in vgroups:
-            symmetrize_vertex_group(
-                obj=obj,
-                vg_name=vgroup.name,
-                mirror_bvh=mirror_bvh,
-                mirror_tris=mirror_tris,
-                right_to_left=self.direction == "RIGHT_TO_LEFT",
-            )
+        symmetrize_vertex_groups(
+            obj=obj,
+            vg_names=[vg.name for vg in vgroups],
+            right_to_left=self.direction == "RIGHT_TO_LEFT",
+        )
 
         msg_direction = self.direction.replace("_", " ").lower()
         self.report({"INFO"}, f"Symmetrized {len(vgroups)} groups {msg_direction}.")
@@ -127,157 +127,231 @@ def is_side_right(name: str) -> bool | None:
     return None
 
 
-def build_mirror_bvh(*, obj: Object) -> tuple[BVHTree, list[tuple[int, int, int]]]:
+class MirrorBinding:
     """
-    Build a BVHTree of the mesh's triangles, so that for any 3D position, the
-    closest point on the mesh surface (and the triangle it lies on) can be found.
-    This is used to sample vertex group weights, interpolated at arbitrary mirrored
-    positions, which gives much better results than matching to the single nearest
-    vertex on meshes that aren't perfectly symmetrical.
+    For each vertex, the triangle that contains the point mirrored (on the X axis)
+    from it, and the barycentric weights of that point within the triangle.
+    Interpolating any per-vertex value at the mirrored positions is then just a
+    gather and a weighted sum, no matter how many vertex groups are sampled.
     """
-    mesh = obj.data
+
+    def __init__(self, tri_verts: np.ndarray, bary: np.ndarray, valid: np.ndarray, co_x: np.ndarray):
+        # (N, 3) vertex indices of the triangle each vertex is mirrored onto.
+        self.tri_verts = tri_verts
+        # (N, 3) barycentric weights within that triangle.
+        self.bary = bary
+        # (N,) False where no mirrored triangle was found.
+        self.valid = valid
+        # (N,) X coordinate of each vertex, used to pick the destination side.
+        self.co_x = co_x
+
+    def sample(self, values: np.ndarray) -> np.ndarray:
+        """Interpolate per-vertex `values` at the mirrored position of every vertex."""
+        sampled = (values[self.tri_verts] * self.bary).sum(axis=1)
+        sampled[~self.valid] = 0.0
+        return sampled
+
+
+# Mesh pointer -> (mesh state key, MirrorBinding).
+_binding_cache: dict[int, tuple[tuple, MirrorBinding]] = {}
+
+
+def get_mesh_arrays(mesh: Mesh) -> tuple[np.ndarray, np.ndarray]:
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
     mesh.calc_loop_triangles()
-    vertices = [v.co for v in mesh.vertices]
-    triangles = [tuple(tri.vertices) for tri in mesh.loop_triangles]
-    bvh = BVHTree.FromPolygons(vertices, triangles)
-    return bvh, triangles
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    return coords.reshape(-1, 3), tris.reshape(-1, 3)
 
 
-def barycentric_weights(
-    p: Vector, a: Vector, b: Vector, c: Vector
-) -> tuple[float, float, float] | None:
+def get_mirror_binding(*, obj: Object) -> MirrorBinding:
     """
-    Return the barycentric weights of point p with respect to triangle a, b, c,
-    assuming p lies in the triangle's plane. Returns None for a degenerate triangle.
+    Return the MirrorBinding of the mesh, only rebuilding it when the vertex
+    positions or topology changed since it was last built.
+    """
+    mesh = obj.data
+    coords, tris = get_mesh_arrays(mesh)
+    state_key = (len(coords), len(tris), hash(coords.tobytes()), hash(tris.tobytes()))
+
+    cached = _binding_cache.get(mesh.as_pointer())
+    if cached and cached[0] == state_key:
+        return cached[1]
+
+    binding = build_mirror_binding(coords, tris)
+    _binding_cache[mesh.as_pointer()] = (state_key, binding)
+    return binding
+
+
+def build_mirror_binding(coords: np.ndarray, tris: np.ndarray) -> MirrorBinding:
+    """
+    Find the closest point on the mesh surface to each mirrored vertex position
+    using a BVHTree of the mesh's triangles. Sampling weights interpolated at these
+    points gives much better results than matching to the single nearest vertex
+    on meshes that aren't perfectly symmetrical.
+    """
+    vert_count = len(coords)
+    bvh = BVHTree.FromPolygons(coords.tolist(), tris.tolist())
+
+    locations = np.zeros((vert_count, 3), dtype=np.float64)
+    tri_indices = np.zeros(vert_count, dtype=np.int64)
+    valid = np.zeros(vert_count, dtype=bool)
+
+    for idx, co in enumerate(coords.tolist()):
+        location, _normal, tri_idx, _dist = bvh.find_nearest(Vector((-co[0], co[1], co[2])))
+        if tri_idx is None:
+            continue
+        locations[idx] = location
+        tri_indices[idx] = tri_idx
+        valid[idx] = True
+
+    tri_verts = tris[tri_indices] if len(tris) else np.zeros((vert_count, 3), dtype=np.int32)
+    bary = barycentric_weights(locations, *(coords[tri_verts[:, i]] for i in range(3)))
+    return MirrorBinding(tri_verts, bary, valid, coords[:, 0].copy())
+
+
+def barycentric_weights(p: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Return the (N, 3) barycentric weights of points p with respect to triangles
+    a, b, c, assuming each point lies in its triangle's plane. For degenerate
+    triangles, all weight goes to whichever of the 3 vertices is closest.
     """
     v0 = b - a
     v1 = c - a
     v2 = p - a
-    d00 = v0.dot(v0)
-    d01 = v0.dot(v1)
-    d11 = v1.dot(v1)
-    d20 = v2.dot(v0)
-    d21 = v2.dot(v1)
+    d00 = (v0 * v0).sum(axis=1)
+    d01 = (v0 * v1).sum(axis=1)
+    d11 = (v1 * v1).sum(axis=1)
+    d20 = (v2 * v0).sum(axis=1)
+    d21 = (v2 * v1).sum(axis=1)
     denom = d00 * d11 - d01 * d01
-    if abs(denom) < 1e-10:
-        return None
-    v = (d11 * d20 - d01 * d21) / denom
-    w = (d00 * d21 - d01 * d20) / denom
-    u = 1.0 - v - w
-    return u, v, w
-
-
-def sample_mirrored_weight(
-    *,
-    obj: Object,
-    vgroup: VertexGroup,
-    mirror_bvh: BVHTree,
-    mirror_tris: list[tuple[int, int, int]],
-    co: Vector,
-) -> float:
-    """
-    Find the point on the mesh surface mirrored (on the X axis) from `co`, and
-    return `vgroup`'s weight interpolated at that point.
-    """
 
-    def weight_of(vert_idx: int) -> float:
-        try:
-            return vgroup.weight(vert_idx)
-        except RuntimeError:
-            return 0.0
+    degenerate = np.abs(denom) < 1e-10
+    safe_denom = np.where(degenerate, 1.0, denom)
+    v = (d11 * d20 - d01 * d21) / safe_denom
+    w = (d00 * d21 - d01 * d20) / safe_denom
+    bary = np.stack((1.0 - v - w, v, w), axis=1)
 
-    mirrored_co = co.copy()
-    mirrored_co.x *= -1
-    location, _normal, tri_idx, _dist = mirror_bvh.find_nearest(mirrored_co)
-    if tri_idx is None:
-        return 0.0
+    if degenerate.any():
+        dists = np.stack([((p - corner) ** 2).sum(axis=1) for corner in (a, b, c)], axis=1)
+        nearest = np.eye(3)[dists.argmin(axis=1)]
+        bary[degenerate] = nearest[degenerate]
 
-    verts = obj.data.vertices
-    a_idx, b_idx, c_idx = mirror_tris[tri_idx]
-    weights = barycentric_weights(
-        location, verts[a_idx].co, verts[b_idx].co, verts[c_idx].co
-    )
-    if not weights:
-        # Degenerate triangle; fall back to whichever of its 3 vertices is closest.
-        nearest_idx = min(
-            (a_idx, b_idx, c_idx), key=lambda i: (verts[i].co - location).length
-        )
-        return weight_of(nearest_idx)
-
-    u, v, w = weights
-    return u * weight_of(a_idx) + v * weight_of(b_idx) + w * weight_of(c_idx)
+    return bary
 
 
-def symmetrize_vertex_group(
-    *,
-    obj: Object,
-    vg_name: str,
-    mirror_bvh: BVHTree,
-    mirror_tris: list[tuple[int, int, int]],
-    right_to_left=False,
-):
+def get_weight_matrix(*, obj: Object, vg_names: list[str]) -> np.ndarray:
     """
-    Symmetrize weights of a single group. mirror_bvh/mirror_tris should first be
-    calculated with build_mirror_bvh().
+    Return a dense (vertex count, len(vg_names)) matrix of the weights of the given
+    vertex groups, read in a single pass over the vertices.
     """
+    verts = obj.data.vertices
+    weights = np.zeros((len(verts), len(vg_names)), dtype=np.float32)
+    columns = {obj.vertex_groups[name].index: col for col, name in enumerate(vg_names)}
+    for vert in verts:
+        for elem in vert.groups:
+            col = columns.get(elem.group)
+            if col is not None:
+                weights[vert.index, col] = elem.weight
+    return weights
 
-    vgroup = obj.vertex_groups.get(vg_name)
-    if not vgroup:
+
+def write_vertex_group(vgroup: VertexGroup, indices: np.ndarray, weights: np.ndarray):
+    """
+    Write weights to vertex group. Blender has no bulk write for vertex group weights,
+    only add() of a single weight to a list of vertices. Interpolated weights are nearly
+    all distinct, so they are rounded to WEIGHT_PRECISION first, which bounds the number
+    of add() calls regardless of the vertex count. Zero weights are skipped.
+    """
+    weights = np.round(weights / WEIGHT_PRECISION) * WEIGHT_PRECISION
+    nonzero = weights > 0.0
+    indices = indices[nonzero]
+    weights = weights[nonzero]
+    if not len(indices):
         return
-    opp_name = flip_name(vg_name)
-    opp_vgroup = obj.vertex_groups.get(opp_name)
-    if not opp_vgroup:
-        opp_vgroup = obj.vertex_groups.new(name=opp_name)
+    unique_weights, inverse = np.unique(weights, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    splits = np.cumsum(np.bincount(inverse, minlength=len(unique_weights)))[:-1]
+    for weight, idx_chunk in zip(unique_weights.tolist(), np.split(indices[order], splits)):
+        vgroup.add(idx_chunk.tolist(), weight, "REPLACE")
 
-    verts = obj.data.vertices
 
-    if vgroup != opp_vgroup:
+def get_symmetrize_pair(*, obj: Object, vg_name: str, right_to_left=False) -> tuple[str, str] | None:
+    """
+    Return (source, destination) group names for symmetrizing `vg_name`,
+    creating the opposite group if needed.
+    """
+    if not obj.vertex_groups.get(vg_name):
+        return None
+    opp_name = flip_name(vg_name)
+    if not obj.vertex_groups.get(opp_name):
+        obj.vertex_groups.new(name=opp_name)
+
+    if vg_name != opp_name:
         # `vg_name` isn't necessarily the side that should act as the source: it's
         # just whichever one of the pair happened to be active/selected/passed in.
         # Use `right_to_left` to decide which one is actually the source, swapping
         # roles if needed, so the requested direction is honored either way.
         vg_is_right = is_side_right(vg_name)
         if vg_is_right is not None and vg_is_right != right_to_left:
-            vgroup, opp_vgroup = opp_vgroup, vgroup
-
-        # Rewrite all vertices, mirrored from this group.
-        dst_indices = range(len(verts))
-    else:
-        # If the name isn't flippable, only rewrite vertices on the destination
-        # side (X coord >= 0, or <= 0 for the opposite direction).
-        def zero_or_more(x):
-            return x >= 0
-
-        def zero_or_less(x):
-            return x <= 0
-
-        is_dst_side = zero_or_more if right_to_left else zero_or_less
-        dst_indices = [i for i, v in enumerate(verts) if is_dst_side(v.co.x)]
-
-    # Sample all the new, mirrored weights before touching the vertex group, so that
-    # clearing old weights below can't affect a nearby triangle's interpolation
-    # (relevant when vgroup and opp_vgroup are the same, e.g. a center bone).
-    new_weights = {
-        dst_idx: sample_mirrored_weight(
-            obj=obj,
-            vgroup=vgroup,
-            mirror_bvh=mirror_bvh,
-            mirror_tris=mirror_tris,
-            co=verts[dst_idx].co,
-        )
-        for dst_idx in dst_indices
-    }
+            return opp_name, vg_name
 
-    if vgroup != opp_vgroup:
-        # Clear weights of the opposite group from all vertices before rewriting.
-        opp_vgroup.remove(range(len(verts)))
-    else:
-        vgroup.remove(dst_indices)
+    return vg_name, opp_name
 
-    for dst_idx, weight in new_weights.items():
-        if weight <= 0.0:
-            continue
-        opp_vgroup.add([dst_idx], weight, "REPLACE")
+
+def symmetrize_vertex_groups(*, obj: Object, vg_names: list[str], right_to_left=False):
+    """
+    Symmetrize weights of several groups at once. The mirror binding is computed
+    (or taken from cache) once, the source weights of all groups are read in one
+    pass, and each group is interpolated with array operations.
+    """
+    pairs = [
+        pair
+        for vg_name in vg_names
+        if (pair := get_symmetrize_pair(obj=obj, vg_name=vg_name, right_to_left=right_to_left))
+    ]
+    if not pairs:
+        return
+
+    binding = get_mirror_binding(obj=obj)
+    vert_count = len(binding.co_x)
+    all_indices = np.arange(vert_count)
+
+    src_names = list(dict.fromkeys(src for src, _dst in pairs))
+    src_weights = get_weight_matrix(obj=obj, vg_names=src_names)
+    src_columns = {name: col for col, name in enumerate(src_names)}
+
+    # If the name isn't flippable, only rewrite vertices on the destination
+    # side (X coord >= 0, or <= 0 for the opposite direction).
+    dst_side = binding.co_x >= 0 if right_to_left else binding.co_x <= 0
+
+    # Groups are processed in order like before, so a group written earlier in
+    # this batch is sampled with its new weights if it's the source of a later one.
+    written: dict[str, np.ndarray] = {}
+
+    for src_name, dst_name in pairs:
+        src_values = written.get(src_name)
+        if src_values is None:
+            src_values = src_weights[:, src_columns[src_name]]
+
+        # Sample all the new, mirrored weights before touching the vertex group, so that
+        # clearing old weights below can't affect a nearby triangle's interpolation
+        # (relevant when source and destination are the same, e.g. a center bone).
+        mirrored = binding.sample(src_values)
+        dst_vgroup = obj.vertex_groups[dst_name]
+
+        if src_name != dst_name:
+            # Clear weights of the opposite group from all vertices before rewriting.
+            dst_vgroup.remove(range(vert_count))
+            write_vertex_group(dst_vgroup, all_indices, mirrored)
+            written[dst_name] = mirrored
+        else:
+            dst_indices = all_indices[dst_side]
+            dst_vgroup.remove(dst_indices.tolist())
+            write_vertex_group(dst_vgroup, dst_indices, mirrored[dst_side])
+            new_values = src_values.copy()
+            new_values[dst_side] = mirrored[dst_side]
+            written[dst_name] = new_values
 
 
 registry = [EASYWEIGHT_OT_symmetrize_groups]
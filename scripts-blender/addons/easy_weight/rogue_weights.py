@@ -3,9 +3,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
-from collections import defaultdict
-
 import bpy
+import numpy as np
 from bpy.props import BoolProperty, CollectionProperty, IntProperty, StringProperty
 from bpy.types import (
     Context,
@@ -187,8 +186,6 @@ class EASYWEIGHT_OT_calculate_weight_islands(Operator):
     def store_all_weight_islands(
         context: Context,
         obj: Object,
-        vert_index_map: dict,
-        vgroup_membership_map: dict[int, set[int]],
         preserve_counts=False,
     ):
         """Store the weight island information of every deforming vertex group."""
@@ -203,14 +200,16 @@ class EASYWEIGHT_OT_calculate_weight_islands(Operator):
             }
         island_groups.clear()
         obj.active_islands_index = 0
-        vgroups = get_deforming_vgroups(obj)
+        vgroups = [
+            vgroup
+            for vgroup in get_deforming_vgroups(obj)
+            if not ("skip_groups" in obj and vgroup.name in obj["skip_groups"])
+        ]
+        islands_per_group = get_weight_islands(obj, vgroups)
         wm.progress_begin(0, len(vgroups))
         for i, vgroup in enumerate(vgroups):
-            if "skip_groups" in obj and vgroup.name in obj["skip_groups"]:
-                continue
-
             island_group, _ = update_vgroup_islands(
-                vgroup, vert_index_map, vgroup_membership_map, island_groups
+                vgroup, islands_per_group[vgroup.name], island_groups
             )
             if preserve_counts:
                 island_group.num_expected_islands = prev_expected_islands.get(vgroup.name, 1)
@@ -228,12 +227,7 @@ class EASYWEIGHT_OT_calculate_weight_islands(Operator):
 
     def execute(self, context: Context):
         obj = context.active_object
-        mesh = obj.data
-        vert_index_map = build_vert_connection_map(mesh)
-        vgroup_membership_map = build_vgroup_membership_map(mesh)
-        self.store_all_weight_islands(
-            context, obj, vert_index_map, vgroup_membership_map, self.preserve_counts
-        )
+        self.store_all_weight_islands(context, obj, self.preserve_counts)
         return {"FINISHED"}
 
 
@@ -269,7 +263,6 @@ class EASYWEIGHT_OT_mark_island_as_okay(Operator):
 
     def execute(self, context: Context):
         obj = context.active_object
-        mesh = obj.data
 
         ret = ops_check_group(self, obj, self.vgroup)
         if ret:
@@ -278,11 +271,10 @@ class EASYWEIGHT_OT_mark_island_as_okay(Operator):
         # Update existing island data first
         island_group = obj.island_groups[self.vgroup]
         vgroup = obj.vertex_groups[self.vgroup]
-        vert_index_map = build_vert_connection_map(mesh)
-        vgroup_membership_map = build_vgroup_membership_map(mesh)
+        islands = get_weight_islands(obj, [vgroup])[vgroup.name]
         org_num_islands = len(island_group.islands)
         island_group, _ = update_vgroup_islands(
-            vgroup, vert_index_map, vgroup_membership_map, obj.island_groups, island_group
+            vgroup, islands, obj.island_groups, island_group
         )
         new_num_islands = len(island_group.islands)
         if new_num_islands != org_num_islands:
@@ -341,18 +333,22 @@ class EASYWEIGHT_OT_focus_smallest_island(Operator):
         if flipped != self.vgroup:
             vgroup_names.append(flipped)
 
-        vert_index_map = build_vert_connection_map(mesh)
-        vgroup_membership_map = build_vgroup_membership_map(mesh)
+        vgroup_names = [
+            vg_name
+            for vg_name in vgroup_names
+            if vg_name in obj.island_groups and vg_name in obj.vertex_groups
+        ]
+        islands_per_group = get_weight_islands(
+            obj, [obj.vertex_groups[vg_name] for vg_name in vgroup_names]
+        )
         self_islands: list[list[int]] = []
         for vg_name in vgroup_names:
-            if vg_name not in obj.island_groups:
-                continue
             # Update existing island data first.
             island_group = obj.island_groups[vg_name]
             vgroup = obj.vertex_groups[vg_name]
             org_num_islands = len(island_group.islands)
             island_group, islands = update_vgroup_islands(
-                vgroup, vert_index_map, vgroup_membership_map, obj.island_groups, island_group
+                vgroup, islands_per_group[vg_name], obj.island_groups, island_group
             )
             new_num_islands = len(island_group.islands)
             if vg_name == self.vgroup:
@@ -459,16 +455,13 @@ class IslandGroup(PropertyGroup):
 
 def update_vgroup_islands(
     vgroup: VertexGroup,
-    vert_index_map: dict,
-    vgroup_membership_map: dict[int, set[int]],
+    islands: list[list[int]],
     island_groups: list[IslandGroup],
     island_group: IslandGroup | None = None,
 ) -> tuple[IslandGroup, list[list[int]]]:
-    """Recompute the weight islands of a vertex group, storing only their
-    sizes in RNA. The full vertex index lists are returned instead of stored,
-    since they're only needed transiently by callers (e.g. to select them)."""
-    islands = get_islands_of_vgroup(vgroup, vert_index_map, vgroup_membership_map)
-
+    """Store the weight islands of a vertex group, as computed by get_weight_islands().
+    Only their sizes are stored in RNA. The full vertex index lists are returned
+    instead of stored, since they're only needed transiently by callers (e.g. to select them)."""
     if not island_group:
         island_group = island_groups.add()
         island_group.name = vgroup.name
@@ -486,68 +479,151 @@ def update_vgroup_islands(
     return island_group, islands
 
 
-def build_vert_connection_map(mesh: Mesh) -> dict:
-    """Build a dictionary of vertex indicies pointing to a list of other vertex indicies
-    that the vertex is connected to by an edge.
-    """
+class WeightIslandCache:
+    """Island results of one mesh, so that recalculating only has to redo the
+    vertex groups whose membership changed since the last calculation."""
 
-    vert_dict = defaultdict(list)
+    def __init__(self):
+        self.topology_key: tuple | None = None
+        self.edges: np.ndarray | None = None
+        # Vertex group name -> hash of its membership mask.
+        self.group_keys: dict[str, int] = {}
+        # Vertex group name -> islands.
+        self.group_islands: dict[str, list[list[int]]] = {}
 
-    for edge in mesh.edges:
-        vert_dict[edge.vertices[0]] += [edge.vertices[1]]
-        vert_dict[edge.vertices[1]] += [edge.vertices[0]]
 
-    return vert_dict
+# Mesh pointer -> WeightIslandCache.
+_island_caches: dict[int, WeightIslandCache] = {}
 
+# Number of vertex groups whose edge masks are processed at once, to limit memory use.
+GROUP_CHUNK_SIZE = 64
+
+
+def get_edge_array(mesh: Mesh) -> np.ndarray:
+    """Return the (edge count, 2) array of vertex indicies of all edges."""
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    return edges.reshape(-1, 2)
 
-def build_vgroup_membership_map(mesh: Mesh) -> dict[int, set[int]]:
-    """Build a dictionary mapping each vertex group index to the set of vertex
-    indicies that are members of that group with a non-zero weight, so that
-    group membership can be looked up in O(1) instead of scanning all of the
-    mesh's vertices for every group/island.
-    """
 
-    vgroup_verts: dict[int, set[int]] = defaultdict(set)
+def build_membership_mask(mesh: Mesh, vgroups: list[VertexGroup]) -> np.ndarray:
+    """Build a dense (vertex count, len(vgroups)) boolean mask of which vertices are
+    members of each vertex group with a non-zero weight, in a single pass over the vertices.
+    """
+    mask = np.zeros((len(mesh.vertices), len(vgroups)), dtype=bool)
+    columns = {vgroup.index: col for col, vgroup in enumerate(vgroups)}
     for vert in mesh.vertices:
         for group in vert.groups:
-            if group.weight:
-                vgroup_verts[group.group].add(vert.index)
-
-    return vgroup_verts
-
-
-def find_weight_island_vertices(
-    start_vert_idx: int, member_verts: set[int], vert_idx_map: dict
-) -> list[int]:
-    """Iteratively find all vertices connected to start_vert_idx by edges that are also members of the same vertex group."""
-    island = []
-    visited = {start_vert_idx}
-    queue = [start_vert_idx]
-    while queue:
-        vert_idx = queue.pop()
-        island.append(vert_idx)
-        for connected_vert_idx in vert_idx_map[vert_idx]:
-            if connected_vert_idx in visited or connected_vert_idx not in member_verts:
-                continue
-            visited.add(connected_vert_idx)
-            queue.append(connected_vert_idx)
-    return island
-
-
-def get_islands_of_vgroup(
-    vgroup: VertexGroup, vert_index_map: dict, vgroup_membership_map: dict[int, set[int]]
-) -> list[list[int]]:
-    """Return a list of lists of vertex indicies: Weight islands within this vertex group."""
-    member_verts = vgroup_membership_map.get(vgroup.index, set())
-    visited: set[int] = set()
-    islands = []
-    for start_vert_idx in member_verts:
-        if start_vert_idx in visited:
-            continue
-        island = find_weight_island_vertices(start_vert_idx, member_verts, vert_index_map)
-        visited.update(island)
-        islands.append(island)
-    return islands
+            col = columns.get(group.group)
+            if col is not None and group.weight:
+                mask[vert.index, col] = True
+    return mask
+
+
+def connected_components(node_count: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Vectorized union-find. Nodes connected by edges (a[i], b[i]) end up with the
+    same root, the smallest node index of their component, which is returned per node.
+    """
+    parent = np.arange(node_count)
+    while len(a):
+        root_a = parent[a]
+        root_b = parent[b]
+        crossing = root_a != root_b
+        if not crossing.any():
+            break
+        a, b = a[crossing], b[crossing]
+        low = np.minimum(root_a[crossing], root_b[crossing])
+        high = np.maximum(root_a[crossing], root_b[crossing])
+        # Hook the higher root onto the lower one. Roots only ever point to smaller
+        # indicies, so no cycles can form.
+        np.minimum.at(parent, high, low)
+        # Pointer jumping, until every node points directly to its root.
+        while True:
+            grand_parent = parent[parent]
+            if np.array_equal(grand_parent, parent):
+                break
+            parent = grand_parent
+    return parent
+
+
+def label_islands(edges: np.ndarray, mask: np.ndarray) -> list[list[list[int]]]:
+    """Return the weight islands of every column of the membership mask at once.
+
+    Every (vertex, group) membership is a node, and an edge connects two nodes
+    of the same group if both of its vertices are members. Components never cross
+    groups, so a single union-find over all of them labels all groups together.
+    """
+    vert_count, group_count = mask.shape
+    verts, groups = np.nonzero(mask)
+    node_ids = np.full(mask.shape, -1, dtype=np.int64)
+    node_ids[verts, groups] = np.arange(len(verts))
+
+    node_a = []
+    node_b = []
+    for chunk_start in range(0, group_count, GROUP_CHUNK_SIZE):
+        chunk = slice(chunk_start, chunk_start + GROUP_CHUNK_SIZE)
+        both_members = mask[edges[:, 0], chunk] & mask[edges[:, 1], chunk]
+        edge_idx, group_idx = np.nonzero(both_members)
+        group_idx += chunk_start
+        node_a.append(node_ids[edges[edge_idx, 0], group_idx])
+        node_b.append(node_ids[edges[edge_idx, 1], group_idx])
+
+    roots = connected_components(
+        len(verts),
+        np.concatenate(node_a) if node_a else np.empty(0, dtype=np.int64),
+        np.concatenate(node_b) if node_b else np.empty(0, dtype=np.int64),
+    )
+
+    # Split the vertices of each group by root.
+    order = np.lexsort((roots, groups))
+    verts, groups, roots = verts[order], groups[order], roots[order]
+    group_bounds = np.searchsorted(groups, np.arange(group_count + 1))
+
+    islands_per_group = []
+    for group_idx in range(group_count):
+        start, end = group_bounds[group_idx], group_bounds[group_idx + 1]
+        group_roots = roots[start:end]
+        island_starts = np.flatnonzero(np.diff(group_roots)) + 1
+        islands_per_group.append(
+            [island.tolist() for island in np.split(verts[start:end], island_starts) if len(island)]
+        )
+    return islands_per_group
+
+
+def get_weight_islands(obj: Object, vgroups: list[VertexGroup]) -> dict[str, list[list[int]]]:
+    """Return a dictionary of vertex group names pointing to lists of lists of
+    vertex indicies: Weight islands within that vertex group.
+
+    Results are cached per mesh. Islands are only recomputed for vertex groups whose
+    membership changed since the last calculation, or for all of them if the
+    mesh topology changed.
+    """
+    mesh = obj.data
+    cache = _island_caches.setdefault(mesh.as_pointer(), WeightIslandCache())
+
+    edges = get_edge_array(mesh)
+    topology_key = (len(mesh.vertices), len(edges), hash(edges.tobytes()))
+    if cache.topology_key != topology_key:
+        cache.topology_key = topology_key
+        cache.edges = edges
+        cache.group_keys.clear()
+        cache.group_islands.clear()
+
+    mask = build_membership_mask(mesh, vgroups)
+    keys = [hash(np.packbits(mask[:, col]).tobytes()) for col in range(len(vgroups))]
+    dirty = [
+        col
+        for col, vgroup in enumerate(vgroups)
+        if cache.group_keys.get(vgroup.name) != keys[col]
+    ]
+
+    if dirty:
+        for col, islands in zip(dirty, label_islands(cache.edges, mask[:, dirty])):
+            vg_name = vgroups[col].name
+            cache.group_keys[vg_name] = keys[col]
+            cache.group_islands[vg_name] = islands
+
+    return {vgroup.name: cache.group_islands[vgroup.name] for vgroup in vgroups}
 
 
 def select_vertices(mesh: Mesh, vert_indicies: list[int]):
@@ -9,28 +9,54 @@ from bpy.types import Depsgraph, Object, Scene
 from .utils import get_addon_prefs
 
 
+# Seconds to wait after the last weight change before cleaning, so that
+# rapid strokes are cleaned in a single pass.
+CLEAN_DELAY = 0.25
+# Weights at or below this are removed from their vertex group.
+CLEAN_LIMIT = 0.001
+
+
 class WeightCleaner:
-    """Run bpy.ops.object.vertex_group_clean on every depsgraph update while in weight paint mode (ie. every brush stroke)."""
+    """Remove near-zero weights from the vertex groups that were modified while in weight paint mode (ie. by brush strokes).
 
-    # Flag set in post_depsgraph_update, to indicate to pre_depsgraph_update that the depsgraph update has indeed completed.
-    can_clean = True
-    # Flag set by pre_depsgraph_update to indicate to post_depsgraph_update that the cleanup operator is still running (in a different thread).
-    cleaning_in_progress = False
+    Modified groups are collected on every depsgraph update, and cleaned by a timer
+    that is pushed back on every update, so a burst of strokes only results in one clean."""
+
+    # Set when the cleaner modified the mesh, so that the depsgraph update caused by
+    # that is not treated as a modification. Cleared by the next depsgraph update.
+    ignore_next_update = False
+    # Name of the object whose vertex groups are waiting to be cleaned.
+    dirty_object: str = ""
+    # Names of vertex groups waiting to be cleaned.
+    dirty_groups: set[str] = set()
+    # Whether all vertex groups need to be cleaned, eg. because of Auto Normalize.
+    dirty_all = False
 
     @classmethod
-    def clean_weights(cls, _scene: Scene, _depsgraph: Depsgraph):
-        context = bpy.context
-        prefs = get_addon_prefs(context)
-        if context.mode != "PAINT_WEIGHT":
+    def mark_dirty(cls, _scene: Scene, depsgraph: Depsgraph):
+        if cls.ignore_next_update:
+            cls.ignore_next_update = False
             return
+        context = bpy.context
         if (
             not context
             or not hasattr(context, "active_object")
             or not context.active_object
         ):
             return
+        if context.mode != "PAINT_WEIGHT":
+            return
+        prefs = get_addon_prefs(context)
         if not prefs.auto_clean_weights:
             return
+
+        obj = context.active_object
+        if not any(
+            update.id.original in (obj, obj.data) and update.is_updated_geometry
+            for update in depsgraph.updates
+        ):
+            return
+
         tool = context.workspace.tools.from_space_view3d_mode(
             "PAINT_WEIGHT", create=False
         ).idname
@@ -38,63 +64,135 @@ class WeightCleaner:
             # Trying to clean while using gradient causes a crash:
             # https://projects.blender.org/studio/blender-studio-tools/issues/332
             return
-        if cls.can_clean:
-            cls.can_clean = False
-            cls.cleaning_in_progress = True
-            # This will trigger a depsgraph update, and therefore clean_weights, again.
-            try:
-                ensure_mirror_groups(context.active_object)
-                bpy.ops.object.vertex_group_clean(group_select_mode="ALL", limit=0.001)
-            except Exception:
-                # This happens for example if the object has no vertex groups.
-                pass
-            cls.cleaning_in_progress = False
+
+        active_group = obj.vertex_groups.active
+        if not active_group:
+            return
+
+        if cls.dirty_object != obj.name:
+            cls.dirty_object = obj.name
+            cls.dirty_groups = set()
+            cls.dirty_all = False
+
+        tool_settings = context.scene.tool_settings
+        if tool_settings.use_auto_normalize or tool_settings.use_multipaint:
+            # Strokes may have modified any deforming group.
+            cls.dirty_all = True
+        cls.dirty_groups.add(active_group.name)
+        if obj.data.use_mirror_vertex_groups:
+            cls.dirty_groups.add(bpy.utils.flip_name(active_group.name))
+
+        # Push back the pending clean, if any.
+        if bpy.app.timers.is_registered(clean_weights_timer):
+            bpy.app.timers.unregister(clean_weights_timer)
+        bpy.app.timers.register(clean_weights_timer, first_interval=CLEAN_DELAY)
 
     @classmethod
-    def reset_flag(cls, _scene: Scene, _depsgraph: Depsgraph):
+    def clean_weights(cls):
         context = bpy.context
-        if context.mode != "PAINT_WEIGHT":
-            return
-        if (
-            not context
-            or not hasattr(context, "active_object")
-            or not context.active_object
-        ):
-            return
-        if cls.cleaning_in_progress:
-            return
-        cls.can_clean = True
+        obj = bpy.data.objects.get(cls.dirty_object)
+        dirty_groups, dirty_all = cls.dirty_groups, cls.dirty_all
+        cls.dirty_object = ""
+        cls.dirty_groups = set()
+        cls.dirty_all = False
 
+        if not obj or obj != context.active_object or context.mode != "PAINT_WEIGHT":
+            return
 
-def ensure_mirror_groups(mesh_obj: Object):
+        created_groups = ensure_mirror_groups(obj)
+        removed_weights = clean_vertex_groups(obj, None if dirty_all else dirty_groups)
+        cls.ignore_next_update = created_groups or removed_weights
+
+
+def clean_weights_timer():
+    # Timers are identified by the function object, so this can't be a bound method.
+    WeightCleaner.clean_weights()
+
+
+def clean_vertex_groups(obj: Object, vgroup_names: set[str] | None = None) -> bool:
+    """Remove weights at or below CLEAN_LIMIT from the given vertex groups, or from all of
+    them if vgroup_names is None, skipping locked groups. Return whether any weights were removed.
+
+    Weights are read in a single pass over the vertices, and removed with one call per group,
+    instead of running the Clean operator per group, which would also push an undo step each.
+    """
+    vgroups = [
+        vgroup
+        for vgroup in obj.vertex_groups
+        if not vgroup.lock_weight and (vgroup_names is None or vgroup.name in vgroup_names)
+    ]
+    if not vgroups:
+        return False
+
+    columns = {vgroup.index: col for col, vgroup in enumerate(vgroups)}
+    to_remove: list[list[int]] = [[] for _ in vgroups]
+    for vert in obj.data.vertices:
+        for elem in vert.groups:
+            col = columns.get(elem.group)
+            if col is not None and elem.weight <= CLEAN_LIMIT:
+                to_remove[col].append(vert.index)
+
+    removed = False
+    for vgroup, indices in zip(vgroups, to_remove):
+        if indices:
+            vgroup.remove(indices)
+            removed = True
+    return removed
+
+
+# Armature pointer -> (bone names, list of (bone name, flipped name) pairs).
+_mirror_names_cache: dict[int, tuple[tuple[str, ...], list[tuple[str, str]]]] = {}
+
+
+def get_mirror_names(rig: Object) -> list[tuple[str, str]]:
+    """Return (bone name, flipped name) pairs of the bones of the rig that have a
+    flipped name. Cached until the bone names of the armature change."""
+    armature = rig.data
+    key = armature.as_pointer()
+    # Comparing the names catches bones being added, removed or renamed in any mode,
+    # and a pointer that got reused by another armature.
+    bone_names = tuple(armature.bones.keys())
+    cached = _mirror_names_cache.get(key)
+    if cached and cached[0] == bone_names:
+        return cached[1]
+
+    mirror_names = []
+    for bone_name in bone_names:
+        flipped_name = bpy.utils.flip_name(bone_name)
+        if flipped_name != bone_name:
+            mirror_names.append((bone_name, flipped_name))
+    _mirror_names_cache[key] = (bone_names, mirror_names)
+    return mirror_names
+
+
+def ensure_mirror_groups(mesh_obj: Object) -> bool:
+    """Create missing opposite side vertex groups. Return whether any were created."""
     mod_types = [mod.type for mod in mesh_obj.modifiers]
     rigs = [m.object for m in mesh_obj.modifiers if m.type == "ARMATURE" and m.object]
+    created = False
     if rigs and "MIRROR" in mod_types:
+        vgroups = mesh_obj.vertex_groups
         for rig in rigs:
-            for pb in rig.pose.bones:
-                if pb.name in mesh_obj.vertex_groups:
-                    flipped_name = bpy.utils.flip_name(pb.name)
-                    if (
-                        flipped_name != pb.name
-                        and flipped_name not in mesh_obj.vertex_groups
-                    ):
-                        mesh_obj.vertex_groups.new(name=flipped_name)
+            for bone_name, flipped_name in get_mirror_names(rig):
+                if bone_name in vgroups and flipped_name not in vgroups:
+                    vgroups.new(name=flipped_name)
+                    created = True
+    return created
 
 
 @persistent
 def start_cleaner(_scene=None, _depsgraph=None):
-    if WeightCleaner.clean_weights not in bpy.app.handlers.depsgraph_update_pre:
-        bpy.app.handlers.depsgraph_update_pre.append(WeightCleaner.clean_weights)
-    if WeightCleaner.reset_flag not in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.append(WeightCleaner.reset_flag)
+    _mirror_names_cache.clear()
+    if WeightCleaner.mark_dirty not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(WeightCleaner.mark_dirty)
 
 
 @persistent
 def stop_cleaner(_scene=None, _depsgraph=None):
-    if WeightCleaner.clean_weights in bpy.app.handlers.depsgraph_update_pre:
-        bpy.app.handlers.depsgraph_update_pre.remove(WeightCleaner.clean_weights)
-    if WeightCleaner.reset_flag in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.remove(WeightCleaner.reset_flag)
+    if WeightCleaner.mark_dirty in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(WeightCleaner.mark_dirty)
+    if bpy.app.timers.is_registered(clean_weights_timer):
+        bpy.app.timers.unregister(clean_weights_timer)
 
 
 def register():
@@ -104,4 +202,5 @@ def register():
 
 def unregister():
     stop_cleaner()
+    _mirror_names_cache.clear()
     bpy.app.handlers.load_post.remove(start_cleaner)
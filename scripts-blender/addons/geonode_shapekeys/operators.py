@@ -5,6 +5,7 @@
 from pathlib import Path
 
 import bpy
+import numpy as np
 from bpy.props import (
     BoolProperty,
     EnumProperty,
@@ -105,21 +106,23 @@ class OBJECT_OT_gnsk_add_shape(Operator):
         # Tuple of (original_obj, mod_index)
         objs_to_add_modifier: list[tuple[Object, int]] = []
 
-        eval_objs: list[Object] = []
-        # Save evaluated objects into a new, combined object.
-        for obj in mesh_objs:
-            mod_index = GNSK_get_desired_modifier_index(context, obj)
-            eval_obj = GNSK_make_evaluated_obj(context, obj, mod_index, self.shape_name)
+        # Evaluate all objects at once, then save them into a new, combined object.
+        mod_indices = [GNSK_get_desired_modifier_index(context, obj) for obj in mesh_objs]
+        captures = GNSK_capture_evaluated_meshes(context, mesh_objs, mod_indices)
+        parts: list[CapturedMesh] = []
+        for obj, mod_index, capture in zip(mesh_objs, mod_indices, captures):
             obj.select_set(False)
-            if eval_obj:
+            if capture:
                 # Only add GNSK modifier to objects which were successfully evaluated (non-empty).
                 objs_to_add_modifier.append((obj, mod_index))
                 obj.hide_set(True)
-                eval_objs.append(eval_obj)
+                parts.append(capture)
+
+        if not parts:
+            self.report({'ERROR'}, "All selected meshes evaluated to empty geometry.")
+            return {'CANCELLED'}
 
-        sk_ob = GNSK_join_objects(context, eval_objs, self.shape_name)
-        # NOTE: eval_objs is not to be accessed anymore!! Blender objects were deleted!!
-        eval_objs = None
+        sk_ob = GNSK_build_sculpt_object(context, parts, self.shape_name)
 
         for i, (obj, mod_index) in enumerate(objs_to_add_modifier):
             # Add GeoNode modifiers.
@@ -163,39 +166,91 @@ class OBJECT_OT_gnsk_add_shape(Operator):
         return {'FINISHED'}
 
 
-def GNSK_make_evaluated_obj(
-    context: Context, obj: Object, mod_idx: int, shape_name: str
-) -> Object | None:
-    """Evaluate the object's modifier stack only up until the point where the
-    geonode modifier will be inserted."""
+# Attribute data type -> (foreach property name, values per element, numpy type).
+ATTRIBUTE_TYPES = {
+    'FLOAT': ('value', 1, np.float32),
+    'INT': ('value', 1, np.int32),
+    'INT8': ('value', 1, np.int8),
+    'BOOLEAN': ('value', 1, bool),
+    'FLOAT2': ('vector', 2, np.float32),
+    'INT16_2D': ('value', 2, np.int16),
+    'INT32_2D': ('value', 2, np.int32),
+    'FLOAT_VECTOR': ('vector', 3, np.float32),
+    'FLOAT_COLOR': ('color', 4, np.float32),
+    'BYTE_COLOR': ('color', 4, np.float32),
+    'QUATERNION': ('value', 4, np.float32),
+    'FLOAT4X4': ('value', 16, np.float32),
+}
+# Attributes that are written as part of the mesh topology.
+TOPOLOGY_ATTRIBUTES = {"position", "material_index"}
+
+
+def foreach_get_array(collection, prop: str, count: int, dtype) -> np.ndarray:
+    arr = np.empty(count, dtype=dtype)
+    collection.foreach_get(prop, arr)
+    return arr
+
+
+class CapturedMesh:
+    """Geometry of an evaluated mesh, read into arrays so the evaluated mesh can be freed."""
+
+    def __init__(self, obj: Object, eval_obj: Object, mesh: bpy.types.Mesh):
+        self.obj = obj
+        num_verts, num_edges = len(mesh.vertices), len(mesh.edges)
+        num_loops, num_faces = len(mesh.loops), len(mesh.polygons)
+        self.domain_sizes = {
+            'POINT': num_verts,
+            'EDGE': num_edges,
+            'CORNER': num_loops,
+            'FACE': num_faces,
+        }
+
+        self.positions = foreach_get_array(mesh.vertices, "co", num_verts * 3, np.float32)
+        self.edge_verts = foreach_get_array(mesh.edges, "vertices", num_edges * 2, np.int32)
+        self.corner_verts = foreach_get_array(mesh.loops, "vertex_index", num_loops, np.int32)
+        self.corner_edges = foreach_get_array(mesh.loops, "edge_index", num_loops, np.int32)
+        self.face_starts = foreach_get_array(mesh.polygons, "loop_start", num_faces, np.int32)
+        self.material_indices = foreach_get_array(
+            mesh.polygons, "material_index", num_faces, np.int32
+        )
+        self.materials = [slot.material for slot in eval_obj.material_slots]
+
+        self.active_uv = mesh.uv_layers.active.name if mesh.uv_layers.active else ""
+        # Attribute name -> (domain, data type, values)
+        self.attributes: dict[str, tuple[str, str, np.ndarray]] = {}
+        for attr in mesh.attributes:
+            if attr.name.startswith(".") or attr.name in TOPOLOGY_ATTRIBUTES:
+                continue
+            if attr.domain not in self.domain_sizes or attr.data_type not in ATTRIBUTE_TYPES:
+                continue
+            prop, size, dtype = ATTRIBUTE_TYPES[attr.data_type]
+            values = foreach_get_array(attr.data, prop, len(attr.data) * size, dtype)
+            self.attributes[attr.name] = (attr.domain, attr.data_type, values)
+
+
+def GNSK_capture_evaluated_meshes(
+    context: Context, objs: list[Object], mod_indices: list[int]
+) -> list[CapturedMesh | None]:
+    """Evaluate the objects' modifier stacks only up until the point where the
+    geonode modifier will be inserted, all in a single depsgraph evaluation.
+    Objects which evaluate to an empty mesh get None."""
     # Disable any modifiers after where the GNSK nodes will be inserted.
-    modifier_states = disable_modifiers_after_idx(obj, mod_idx)
+    modifier_states = [
+        disable_modifiers_after_idx(obj, mod_idx) for obj, mod_idx in zip(objs, mod_indices)
+    ]
 
-    # Get evaluated mesh, wrap it in an object, and link it to the scene.
     eval_dg = context.evaluated_depsgraph_get()
-    sk_mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(eval_dg))
-    if len(sk_mesh.vertices) == 0:
-        return
-    sk_ob = bpy.data.objects.new(obj.name + "." + shape_name, sk_mesh)
-    sk_ob.data.name = sk_ob.name
-    sk_ob.matrix_world = obj.matrix_world
-    sk_coll = ensure_shapekey_collection(context)
-    sk_coll.objects.link(sk_ob)
-    sk_ob.hide_set(False)
-    sk_ob.select_set(True)
-
-    # Add shape keys.
-    sk_ob.use_shape_key_edit_mode = True
-    sk_ob.shape_key_add(name="Basis")
-    sk_ob.hide_render = True
-    adjust = sk_ob.shape_key_add(name="New Shape", from_mix=True)
-    adjust.value = 1
-    sk_ob.active_shape_key_index = 1
-    sk_ob.add_rest_position_attribute = True
+    captures = []
+    for obj in objs:
+        eval_obj = obj.evaluated_get(eval_dg)
+        mesh = eval_obj.to_mesh()
+        captures.append(CapturedMesh(obj, eval_obj, mesh) if len(mesh.vertices) > 0 else None)
+        eval_obj.to_mesh_clear()
 
-    restore_modifiers(obj, modifier_states)
+    for obj, states in zip(objs, modifier_states):
+        restore_modifiers(obj, states)
 
-    return sk_ob
+    return captures
 
 
 def GNSK_get_desired_modifier_index(context, obj: Object) -> int:
@@ -219,26 +274,87 @@ def GNSK_get_desired_modifier_index(context, obj: Object) -> int:
     return len(obj.modifiers)
 
 
-def GNSK_join_objects(
-    context, eval_mesh_obs: list[Object], shape_name: str,
+def GNSK_build_sculpt_object(
+    context, parts: list[CapturedMesh], shape_name: str,
 ) -> Object:
-    """Join passed objects while storing an attribute needed for the geonode shapekey set-up."""
-    for i, ob in enumerate(eval_mesh_obs[1:]):
-        merge_objs = [eval_mesh_obs[0], ob]
-        attr = ob.data.attributes.new("GNSK-part_index", "INT", "POINT")
-        attr.data.foreach_set("value", [i+1]*len(attr.data))
-        with context.temp_override(
-            object=eval_mesh_obs[0],
-            active_object=eval_mesh_obs[0],
-            selected_objects=merge_objs,
-            selected_editable_objects=merge_objs,
-        ):
-            bpy.ops.object.join()
-
-    context.view_layer.objects.active = eval_mesh_obs[0]
-
-    sk_ob = context.active_object
-    sk_ob.name = shape_name
+    """Build a single object from the captured meshes, with the same result as
+    joining them, while storing an attribute needed for the geonode shapekey set-up."""
+    mesh = bpy.data.meshes.new(shape_name)
+
+    # Like joining, bring everything into the space of the first object.
+    first_matrix_inv = parts[0].obj.matrix_world.inverted()
+    positions, edge_verts, corner_verts, corner_edges, face_starts = [], [], [], [], []
+    material_indices, part_indices = [], []
+    materials = []
+    vert_offset = edge_offset = loop_offset = 0
+    for i, part in enumerate(parts):
+        matrix = np.array(first_matrix_inv @ part.obj.matrix_world, dtype=np.float32)
+        coords = part.positions.reshape(-1, 3)
+        positions.append(coords @ matrix[:3, :3].T + matrix[:3, 3])
+
+        edge_verts.append(part.edge_verts + vert_offset)
+        corner_verts.append(part.corner_verts + vert_offset)
+        corner_edges.append(part.corner_edges + edge_offset)
+        face_starts.append(part.face_starts + loop_offset)
+
+        # Merge material slots by material, like joining does.
+        slot_map = []
+        for mat in part.materials:
+            if mat not in materials:
+                materials.append(mat)
+            slot_map.append(materials.index(mat))
+        if slot_map:
+            slot_map = np.array(slot_map, dtype=np.int32)
+            material_indices.append(slot_map[part.material_indices.clip(0, len(slot_map) - 1)])
+        else:
+            material_indices.append(np.zeros_like(part.material_indices))
+
+        num_verts = part.domain_sizes['POINT']
+        part_indices.append(np.full(num_verts, i, dtype=np.int32))
+        vert_offset += num_verts
+        edge_offset += part.domain_sizes['EDGE']
+        loop_offset += part.domain_sizes['CORNER']
+
+    mesh.vertices.add(vert_offset)
+    mesh.vertices.foreach_set("co", np.concatenate(positions).ravel())
+    mesh.edges.add(edge_offset)
+    mesh.edges.foreach_set("vertices", np.concatenate(edge_verts))
+    mesh.loops.add(loop_offset)
+    mesh.loops.foreach_set("vertex_index", np.concatenate(corner_verts))
+    mesh.loops.foreach_set("edge_index", np.concatenate(corner_edges))
+    mesh.polygons.add(sum(part.domain_sizes['FACE'] for part in parts))
+    mesh.polygons.foreach_set("loop_start", np.concatenate(face_starts))
+
+    for mat in materials:
+        mesh.materials.append(mat)
+    mesh.polygons.foreach_set("material_index", np.concatenate(material_indices))
+
+    join_attributes(mesh, parts)
+    uv_map = mesh.uv_layers.get(parts[0].active_uv)
+    if uv_map:
+        mesh.uv_layers.active = uv_map
+
+    attr = mesh.attributes.new("GNSK-part_index", "INT", "POINT")
+    attr.data.foreach_set("value", np.concatenate(part_indices))
+
+    mesh.update()
+
+    sk_ob = bpy.data.objects.new(shape_name, mesh)
+    sk_ob.matrix_world = parts[0].obj.matrix_world
+    sk_coll = ensure_shapekey_collection(context)
+    sk_coll.objects.link(sk_ob)
+    sk_ob.hide_set(False)
+    sk_ob.select_set(True)
+    context.view_layer.objects.active = sk_ob
+
+    # Add shape keys.
+    sk_ob.use_shape_key_edit_mode = True
+    sk_ob.shape_key_add(name="Basis")
+    sk_ob.hide_render = True
+    adjust = sk_ob.shape_key_add(name="New Shape", from_mix=True)
+    adjust.value = 1
+    sk_ob.active_shape_key_index = 1
+    sk_ob.add_rest_position_attribute = True
 
     # Add pre-processing modifier to sculpt mesh object
     mod = sk_ob.modifiers.new("Pre-Processing", type='NODES')
@@ -247,6 +363,30 @@ def GNSK_join_objects(
     return sk_ob
 
 
+def join_attributes(mesh: bpy.types.Mesh, parts: list[CapturedMesh]):
+    """Write the attributes of all parts into the joined mesh. Parts that don't have an
+    attribute (or have it with a different type) get zeroes, like when joining."""
+    attr_types: dict[str, tuple[str, str]] = {}
+    for part in parts:
+        for name, (domain, data_type, _values) in part.attributes.items():
+            attr_types.setdefault(name, (domain, data_type))
+
+    for name, (domain, data_type) in attr_types.items():
+        prop, size, dtype = ATTRIBUTE_TYPES[data_type]
+        values = []
+        for part in parts:
+            part_domain, part_type, part_values = part.attributes.get(name, (None, None, None))
+            if (part_domain, part_type) == (domain, data_type):
+                values.append(part_values)
+            else:
+                values.append(np.zeros(part.domain_sizes[domain] * size, dtype=dtype))
+
+        attr = mesh.attributes.get(name)
+        if not attr or (attr.domain, attr.data_type) != (domain, data_type):
+            attr = mesh.attributes.new(name, data_type, domain)
+        attr.data.foreach_set(prop, np.concatenate(values))
+
+
 def disable_modifiers_after_idx(obj: Object, idx: int) -> dict[str, bool]:
     """Disable modifiers that might cause the propagation of the sculpted shape to fail.
     This includes the Subsurf modifier and any subsequent modifiers.
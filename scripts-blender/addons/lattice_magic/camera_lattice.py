@@ -9,6 +9,7 @@
 # to deform the mesh objects in that collection.
 
 import math
+from bisect import bisect_right
 
 import bpy
 from bpy.app.handlers import persistent
@@ -573,6 +574,66 @@ class VIEW3D_PT_camlattice_panel(bpy.types.Panel):
         move_down_op.type = 'DOWN'
 
 
+class ShapeKeyFrameTable:
+    """Frame numbers of the "Frame N" shape keys of a lattice, sorted, so the shape key
+    of the most recent frame can be found with a binary search on every frame change."""
+
+    def __init__(self, key_blocks):
+        self.num_key_blocks = len(key_blocks)
+        # Frame number -> [index of first, index of last shape key with that number].
+        indices = {}
+        for i, kb in enumerate(key_blocks):
+            if not kb.name.startswith('Frame '):
+                continue
+            try:
+                number = int(kb.name[5:].split(".")[0])
+            except ValueError:
+                continue
+            if number < 0:
+                continue
+            indices.setdefault(number, [i, i])[1] = i
+
+        self.frames = sorted(indices.keys())
+        self.first_indices = [indices[frame][0] for frame in self.frames]
+        self.last_indices = [indices[frame][1] for frame in self.frames]
+        self.names = [kb.name for kb in key_blocks]
+
+    def find_index(self, frame: int) -> int:
+        """Index of the shape key of the most recent frame. If the current frame has
+        multiple shape keys, the first one wins, otherwise the last one."""
+        pos = bisect_right(self.frames, frame) - 1
+        if pos < 0:
+            return 1
+        if self.frames[pos] == frame:
+            return self.first_indices[pos]
+        return self.last_indices[pos]
+
+
+# Key pointer -> ShapeKeyFrameTable.
+frame_tables: dict[int, ShapeKeyFrameTable] = {}
+
+
+def get_frame_table(shape_keys) -> ShapeKeyFrameTable:
+    key_blocks = shape_keys.key_blocks
+    table = frame_tables.get(shape_keys.as_pointer())
+    if not table or table.num_key_blocks != len(key_blocks):
+        table = frame_tables[shape_keys.as_pointer()] = ShapeKeyFrameTable(key_blocks)
+    return table
+
+
+@persistent
+def invalidate_frame_tables(scene, depsgraph):
+    # Renaming or re-ordering shape keys sends an update of the Key.
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Key):
+            frame_tables.pop(update.id.original.as_pointer(), None)
+
+
+@persistent
+def clear_frame_tables(_dummy):
+    frame_tables.clear()
+
+
 @persistent
 def camera_lattice_frame_change(scene):
     """On frame change, set the active shape key of the active lattice object to the most recent frame
@@ -591,23 +652,16 @@ def camera_lattice_frame_change(scene):
     if not shape_key_poll(context):
         return
 
-    key_blocks = ob.data.shape_keys.key_blocks
-
-    current_frame = scene.frame_current
-    most_recent_number = 0
-    most_recent_index = 1
-    for i, kb in enumerate(key_blocks):
-        if not kb.name.startswith('Frame '):
-            continue
-        number_str = kb.name[5:].split(".")[0]
-        if number_str == "":
-            continue
-        number = int(number_str)
-        if number <= current_frame and number >= most_recent_number:
-            most_recent_number = number
-            most_recent_index = i
-            if most_recent_number == current_frame:
-                break
+    shape_keys = ob.data.shape_keys
+    table = get_frame_table(shape_keys)
+    most_recent_index = table.find_index(scene.frame_current)
+    if most_recent_index < len(table.names) and (
+        shape_keys.key_blocks[most_recent_index].name != table.names[most_recent_index]
+    ):
+        # Shape keys changed without us noticing, so rebuild.
+        frame_tables.pop(shape_keys.as_pointer())
+        table = get_frame_table(shape_keys)
+        most_recent_index = table.find_index(scene.frame_current)
 
     if ob.active_shape_key_index != most_recent_index:
         ob.active_shape_key_index = most_recent_index
@@ -632,6 +686,10 @@ def register():
     bpy.types.Scene.lattice_slots = CollectionProperty(type=LatticeSlot)
     bpy.types.Scene.active_lattice_index = IntProperty()
     bpy.app.handlers.frame_change_post.append(camera_lattice_frame_change)
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_frame_tables)
+    bpy.app.handlers.undo_post.append(clear_frame_tables)
+    bpy.app.handlers.redo_post.append(clear_frame_tables)
+    bpy.app.handlers.load_post.append(clear_frame_tables)
 
 
 def unregister():
@@ -639,3 +697,8 @@ def unregister():
     del bpy.types.Scene.active_lattice_index
 
     bpy.app.handlers.frame_change_post.remove(camera_lattice_frame_change)
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_frame_tables)
+    bpy.app.handlers.undo_post.remove(clear_frame_tables)
+    bpy.app.handlers.redo_post.remove(clear_frame_tables)
+    bpy.app.handlers.load_post.remove(clear_frame_tables)
+    frame_tables.clear()
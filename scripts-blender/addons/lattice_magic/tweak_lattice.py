@@ -12,6 +12,8 @@ from math import *
 from typing import List, Tuple
 
 import bpy
+import numpy as np
+from bpy.app.handlers import persistent
 from bpy.props import (
     EnumProperty,
     FloatProperty,
@@ -655,19 +657,88 @@ def set_lattice_resolution(lat_ob: Object, res_u, res_v=None, res_w=None):
     lat_ob.data.points_w = res_w
 
 
-def build_kdtree(obj):
-    # Get the vertices of the mesh in world coordinates
-    vertices = [obj.matrix_world @ v.co for v in obj.data.vertices]
+class VertexSpatialIndex:
+    """World-space vertex positions and KD-trees of evaluated meshes, cached between queries.
 
-    # Build KD-Tree from the vertices
-    size = len(vertices)
-    kd = kdtree.KDTree(size)
+    Each object's cache is keyed by a counter that is increased whenever the depsgraph
+    reports a geometry or transform update of that object. Frame changes, undo and
+    file loads invalidate everything, since they can move any vertex.
+    """
+
+    def __init__(self):
+        self.versions: dict[int, int] = {}
+        self.coords: dict[int, tuple[int, np.ndarray]] = {}
+        self.trees: dict[tuple, tuple[kdtree.KDTree, np.ndarray]] = {}
+
+    def clear(self):
+        self.versions.clear()
+        self.coords.clear()
+        self.trees.clear()
+
+    def tag_update(self, obj: Object):
+        key = obj.as_pointer()
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get_world_coords(self, eval_ob: Object) -> np.ndarray:
+        key = eval_ob.original.as_pointer()
+        version = self.versions.get(key, 0)
+        cached = self.coords.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        mesh = eval_ob.data
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        mat = np.array(eval_ob.matrix_world, dtype=np.float32)
+        coords = coords.reshape(-1, 3) @ mat[:3, :3].T + mat[:3, 3]
+
+        self.coords[key] = (version, coords)
+        return coords
+
+    def get_kdtree(self, eval_obs: list[Object]) -> tuple[kdtree.KDTree, np.ndarray]:
+        """Return a single KD-tree of the vertices of all passed objects, and the index
+        of the first vertex of each object within that tree."""
+        key = tuple(
+            (ob.original.as_pointer(), self.versions.get(ob.original.as_pointer(), 0))
+            for ob in eval_obs
+        )
+        cached = self.trees.get(key)
+        if cached:
+            return cached
+
+        all_coords = [self.get_world_coords(ob) for ob in eval_obs]
+        offsets = np.cumsum([0] + [len(coords) for coords in all_coords[:-1]])
+        kd = kdtree.KDTree(sum(len(coords) for coords in all_coords))
+        i = 0
+        for coords in all_coords:
+            for co in coords.tolist():
+                kd.insert(co, i)
+                i += 1
+        kd.balance()
+
+        # Forget trees that contain outdated objects, since they will never be used again.
+        for tree_key in list(self.trees.keys()):
+            if any(self.versions.get(ptr, 0) != version for ptr, version in tree_key):
+                del self.trees[tree_key]
+        self.trees[key] = (kd, offsets)
+        return kd, offsets
+
+
+vertex_spatial_index = VertexSpatialIndex()
+
+
+@persistent
+def tag_spatial_index_updates(scene, depsgraph):
+    for update in depsgraph.updates:
+        if not isinstance(update.id, Object):
+            continue
+        if update.is_updated_geometry or update.is_updated_transform:
+            vertex_spatial_index.tag_update(update.id.original)
 
-    for i, vertex in enumerate(vertices):
-        kd.insert(vertex, i)
 
-    kd.balance()
-    return kd
+@persistent
+def clear_spatial_index(*args):
+    vertex_spatial_index.clear()
 
 
 def get_nearest_evaluated_vertex(
@@ -676,27 +747,18 @@ def get_nearest_evaluated_vertex(
     """Get nearest EVALUATED vertex to a coordinate out of a list of passed mesh objects.
     Return the original object, and the evaluated object, vertex index, and coordinate.
     """
-    nearest_vertex = None
-    nearest_distance = float('inf')
-
-    for obj in objs:
-        if obj.type != 'MESH':
-            continue
+    meshes = [obj for obj in objs if obj.type == 'MESH']
+    eval_obs = [obj.evaluated_get(dg) for obj in meshes]
+    eval_obs = [ob for ob in eval_obs if len(ob.data.vertices) > 0]
+    if not eval_obs:
+        return None
 
-        eval_ob = obj.evaluated_get(dg)
+    kd, offsets = vertex_spatial_index.get_kdtree(eval_obs)
+    eval_co, index, _dist = kd.find(coord)
 
-        kd = build_kdtree(eval_ob)
-
-        # Find the nearest vertex to the 3D cursor
-
-        eval_co, eval_idx, dist = kd.find(coord)
-
-        # If this vertex is closer than any previously found, store it
-        if dist < nearest_distance:
-            nearest_distance = dist
-            nearest_vertex = (obj, eval_ob, eval_idx, eval_co)
-
-    return nearest_vertex
+    ob_idx = int(np.searchsorted(offsets, index, side='right')) - 1
+    eval_ob = eval_obs[ob_idx]
+    return (eval_ob.original, eval_ob, index - int(offsets[ob_idx]), eval_co)
 
 
 def get_deforming_weights(obj: Object, eval_obj, vert_idx: int) -> dict[str, float] | None:
@@ -884,7 +946,26 @@ def register():
     Scene.tweak_lattice_parent_ob = PointerProperty(type=Object, name="Parent")
     Lattice.lattice_magic = PointerProperty(type=TweakLatticeProperties)
 
+    bpy.app.handlers.depsgraph_update_post.append(tag_spatial_index_updates)
+    for handlers in (
+        bpy.app.handlers.frame_change_post,
+        bpy.app.handlers.undo_post,
+        bpy.app.handlers.redo_post,
+        bpy.app.handlers.load_post,
+    ):
+        handlers.append(clear_spatial_index)
+
 
 def unregister():
     del Scene.tweak_lattice_parent_ob
     del Lattice.lattice_magic
+
+    bpy.app.handlers.depsgraph_update_post.remove(tag_spatial_index_updates)
+    for handlers in (
+        bpy.app.handlers.frame_change_post,
+        bpy.app.handlers.undo_post,
+        bpy.app.handlers.redo_post,
+        bpy.app.handlers.load_post,
+    ):
+        handlers.remove(clear_spatial_index)
+    vertex_spatial_index.clear()
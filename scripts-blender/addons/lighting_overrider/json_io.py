@@ -87,9 +87,9 @@ class LOR_OT_write_settings(bpy.types.Operator):
     
         data = pack_settings_data(settings)
         
-        write_data_to_json( text, data)
+        changed = write_data_to_json( text, data)
         
-        if not text.is_in_memory:
+        if not text.is_in_memory and (changed or text.is_dirty):
             override = context.copy()
             area_type = override['area'].type
             override['area'].type = 'TEXT_EDITOR'
@@ -120,38 +120,76 @@ def unpack_settings_data(settings, data):
     
     return
 
-def cleanup_json(string):
-    
-    counter = 0
-    open_brackets = 0
-    remove = []
-    for i, char in enumerate(string):
-        #if char == '{':
-        #    counter += 1
-        #    continue
-        #if counter < 3:
-        #    continue
-        if char == '[':
-            open_brackets += 1
-        elif char == ']':
-            open_brackets -= 1
-        if open_brackets:
-            if char == '\n':
-                remove += [i]
-            elif char == ' ' and string[i+1] == ' ':
-                remove += [i]
-    counter = 0
-    for i in remove:
-        i -= counter
-        string = string[:i] + string[i+1:]
-        counter += 1
-    
-    return string
+INDENT = '    '
+
+# Encodes scalars exactly like json.dumps does.
+_scalar_encoder = json.JSONEncoder()
+
+def _encode_inline(value, parts):
+    ''' Appends the parts of a value that is written on a single line, like everything within arrays.
+    '''
+    if isinstance(value, dict):
+        if not value:
+            parts.append('{}')
+            return
+        parts.append('{ ')
+        for i, (key, item) in enumerate(value.items()):
+            if i:
+                parts.append(', ')
+            parts.append(_scalar_encoder.encode(key))
+            parts.append(':')
+            _encode_inline(item, parts)
+        parts.append(' }')
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            parts.append('[]')
+            return
+        parts.append('[ ')
+        for i, item in enumerate(value):
+            if i:
+                parts.append(', ')
+            _encode_inline(item, parts)
+        parts.append(' ]')
+    else:
+        parts.append(_scalar_encoder.encode(value))
+
+def _encode_indented(value, parts, level):
+    ''' Appends the parts of a value with every object item on its own indented line.
+    '''
+    if not isinstance(value, dict) or not value:
+        _encode_inline(value, parts)
+        return
+    parts.append('{')
+    for i, (key, item) in enumerate(value.items()):
+        if i:
+            parts.append(',')
+        parts.append('\n' + INDENT*(level+1))
+        parts.append(_scalar_encoder.encode(key))
+        parts.append(':')
+        _encode_indented(item, parts, level+1)
+    parts.append('\n' + INDENT*level + '}')
+
+def dumps_settings(data: dict) -> str:
+    ''' Serializes settings data in a single pass. Objects are indented, arrays are kept on a single line, e.g:
+    {
+        "rna_overrides":{
+            "bpy.data.scenes['Scene'].render.fps":[ 24, "INT", "FPS" ]
+        }
+    }
+    '''
+    parts = []
+    _encode_indented(data, parts, 0)
+    return ''.join(parts)
 
 def write_data_to_json(text: bpy.types.Text, data: dict, partial=None):
+    ''' Writes the settings data to the text datablock. Returns whether the content changed, otherwise the text is left untouched.
+    '''
+    string = dumps_settings(data)
+    if text.as_string() == string:
+        return False
     text.clear()
-    text.write(cleanup_json(json.dumps(data, separators=(',', ':'), indent=4)))
-    return
+    text.write(string)
+    return True
 
 def read_data_from_json(text: bpy.types.Text):
     return json.loads(text.as_string()) if text.as_string() else json.loads('{}')
@@ -4,54 +4,76 @@
 
 import bpy
 import os
+import re
+import ast
 import json
+import time
+import hashlib
 import idprop
 from pathlib import Path
 from bpy_extras import anim_utils
 
 
 
-def parse_rna_path_to_elements(rna_path, delimiter='.'):
-    ''' Returns the element strings of an RNA path split by '.' delimiter, disregarding any delimiter in a string within the path.
-    '''
-    if not delimiter in rna_path:
-        return [rna_path]
-    
-    parse = rna_path
-    
-    # replace escape chars with whitespaces
-    parse_elements = parse.split(r'\\')
-    parse = '  '.join(parse_elements)
-        
-    parse_elements = parse.split('\\')
-    parse = parse_elements[0]
-    for el in parse_elements[1:]:
-        parse += '  '
-        parse += el[1:]
-    
-    # replace strings within path with whitespaces
-    parse_elements = parse.split('"')
-    parse = parse_elements[0]
-    for el1, el2 in zip(parse_elements[1::2], parse_elements[2::2]):
-        parse += '"'+' '*len(el1)+'"'
-        parse += el2
-    
-    parse_elements = parse.split(delimiter)
-    
-    elements = []
-    for el in parse_elements:
-        elements += [rna_path[:len(el)]]
-        rna_path = rna_path[len(el)+len(delimiter):]
-    
-    return elements
+# Matches an identifier at the start of an RNA path element.
+PATTERN_IDENTIFIER = re.compile(r'[A-Za-z_]\w*')
+
+# ID types whose animation isn't muted when overriding one of their properties.
+UNANIMATED_ID_TYPES = {'ACTION', 'BRUSH', 'COLLECTION', 'IMAGE', 'LIBRARY', 'PALETTE', 'PAINTCURVE', 'SCREEN', 'TEXT', 'WINDOWMANAGER', 'WORKSPACE'}
 
-def parse_rna_path_for_custom_property(rna_path):
-    ''' Returns the rna path of the datablock and the name of the custom property for an rna path that describes a custom property. 
+# Key of the compiled plans in the driver namespace, which survives re-running this script on file load.
+PLAN_CACHE_KEY = 'lighting_overrider_plans'
+# Number of most recently used plans to keep, so iterating on the settings doesn't keep every version.
+PLAN_CACHE_SIZE = 8
+
+
+def parse_rna_path_to_steps(rna_path):
+    ''' Returns the steps of a python style RNA path like bpy.data.objects["Cube"].location as a list of (kind, key, offset) tuples.
+    Kind is either 'ATTR' for attribute access or 'ITEM' for subscripts, offset is the position of the step in the path.
+    Subscripts are parsed as literals, so nothing in the path gets evaluated.
     '''
-    if not '][' in rna_path:
-        return False
-    parse_elements = parse_rna_path_to_elements(rna_path, delimiter='][')
-    return parse_elements[0]+']', '"'.join(parse_elements[1].split('"')[1:-1])
+    steps = []
+    i = 0
+    while i < len(rna_path):
+        char = rna_path[i]
+        if char == '.':
+            i += 1
+            continue
+        if char == '[':
+            end = i+1
+            quote = None
+            while end < len(rna_path):
+                char = rna_path[end]
+                if quote:
+                    if char == '\\':
+                        end += 1
+                    elif char == quote:
+                        quote = None
+                elif char in '"\'':
+                    quote = char
+                elif char == ']':
+                    break
+                end += 1
+            else:
+                raise ValueError(f'Unclosed subscript in RNA path {rna_path}')
+            steps += [('ITEM', ast.literal_eval(rna_path[i+1:end]), i)]
+            i = end+1
+            continue
+        match = PATTERN_IDENTIFIER.match(rna_path, i)
+        if not match:
+            raise ValueError(f'Invalid RNA path {rna_path}')
+        steps += [('ATTR', match.group(0), i)]
+        i = match.end()
+
+    if not steps or steps[0][:2] != ('ATTR', 'bpy'):
+        raise ValueError(f'RNA path {rna_path} does not start with bpy')
+    return steps
+
+def resolve_step(owner, step):
+    kind, key, _offset = step
+    if kind == 'ATTR':
+        return getattr(owner, key)
+    return owner[key]
 
 def mute_fcurve(db, path):
     if not db.animation_data:
@@ -84,24 +106,6 @@ def mute_driver(db, path):
         driver = db.animation_data.drivers.find(path, index=c)
     return
 
-def mute_animation_on_rna_path(rna_path):
-    path_elements = parse_rna_path_to_elements(rna_path)
-    db_path = '.'.join(path_elements[:3])
-    if 'session_uid' in dir(eval(db_path)):
-        data_block = eval(db_path)
-        path = '.'.join(path_elements[3:])
-    else: # handle custom props
-        db_path, c_prop = parse_rna_path_for_custom_property(rna_path)
-        data_block = eval(db_path)
-        path = f'["{c_prop}"]'
-
-    if data_block.id_type in ['ACTION', 'BRUSH', 'COLLECTION', 'IMAGE', 'LIBRARY', 'PALETTE', 'PAINTCURVE', 'SCREEN', 'TEXT', 'WINDOWMANAGER', 'WORKSPACE']:
-        return
-
-    mute_fcurve(data_block, path)
-    mute_driver(data_block, path)
-    return
-
 def split_by_suffix(list, sfx):
     with_suffix = [name[:-len(sfx)] for name in list if name.endswith(sfx)]
     without_suffix = [name for name in list if not name.endswith(sfx)]
@@ -117,6 +121,99 @@ def get_properties_bone(ob, prefix='Properties_'):
         return bone
     return None
 
+class PrefixIndex:
+    ''' Index of the ':all' group names of a category. Finds all group names that a name starts with,
+    using one set lookup per distinct group name length instead of comparing against every group name.
+    '''
+    def __init__(self, prefixes):
+        self.order = {prefix: i for i, prefix in enumerate(prefixes)}
+        self.by_length = {}
+        for prefix in prefixes:
+            self.by_length.setdefault(len(prefix), set()).add(prefix)
+        self.lengths = sorted(self.by_length)
+
+    def match(self, name):
+        ''' Returns the prefixes of the name, in the order they were specified in.
+        '''
+        matches = [name[:length] for length in self.lengths if length <= len(name) and name[:length] in self.by_length[length]]
+        return sorted(matches, key=self.order.get)
+
+    def __bool__(self):
+        return bool(self.order)
+
+class PropertySettings:
+    ''' Compiled shader or rig settings. Values of unique names and of ':all' groups as lists of (property name, value) tuples.
+    '''
+    def __init__(self, data):
+        list_unique, list_all = split_by_suffix(data.keys(), ':all')
+        self.unique = {name: [(name_set, data[name][name_set][0]) for name_set in data[name]] for name in list_unique}
+        self.groups = {name: [(name_set, data[name+':all'][name_set][0]) for name_set in data[name+':all']] for name in list_all}
+        self.index = PrefixIndex(list_all)
+
+    def get_values(self, name):
+        ''' Returns the (property name, value) tuples to be applied to a datablock with this name, in order.
+        '''
+        values = []
+        for prefix in self.index.match(name):
+            values += self.groups[prefix]
+        values += self.unique.get(name, [])
+        return values
+
+class MotionBlurSettings:
+    def __init__(self, data):
+        list_unique, list_all = split_by_suffix(data.keys(), ':all')
+        self.all_objects = 'Master Collection' in data.keys() or 'Scene Collection' in data.keys()
+        self.unique = set(list_unique)
+        self.index = PrefixIndex(list_all)
+
+    def matches(self, name):
+        return name in self.unique or bool(self.index.match(name))
+
+class RNAOverride:
+    ''' Compiled RNA override. The path is parsed once, then resolved step by step when applying it.
+    '''
+    def __init__(self, path, value, value_type, name):
+        self.path = path
+        self.steps = parse_rna_path_to_steps(path)
+        self.value = value
+        self.value_type = value_type
+        self.name = name
+
+    def apply(self):
+        owner = bpy
+        data_block = None
+        anim_path = None
+        for i, step in enumerate(self.steps[1:-1], start=1):
+            owner = resolve_step(owner, step)
+            if data_block is None and isinstance(owner, bpy.types.ID):
+                data_block = owner
+                anim_path = self.path[self.steps[i+1][2]:]
+
+        if data_block and data_block.id_type not in UNANIMATED_ID_TYPES:
+            mute_fcurve(data_block, anim_path)
+            mute_driver(data_block, anim_path)
+
+        kind, key, _offset = self.steps[-1]
+        value = self.value
+        if self.value_type == 'STRING':
+            value = str(value)
+        elif isinstance(resolve_step(owner, self.steps[-1]), idprop.types.IDPropertyArray):
+            resolve_step(owner, self.steps[-1])[:] = value # workaround for Blender not retaining UI data of property (see https://projects.blender.org/blender/blender/pulls/109203)
+            return
+        if kind == 'ATTR':
+            setattr(owner, key, value)
+        else:
+            owner[key] = value
+
+def compile_rna_overrides(data):
+    overrides = []
+    for path in data:
+        try:
+            overrides += [RNAOverride(path, data[path][0], data[path][1], data[path][2])]
+        except (ValueError, SyntaxError):
+            print(f'Warning: Failed to parse path of property {data[path][2]} at {path}')
+    return overrides
+
 def apply_variable_settings(data):
     ''' Applies settings to according nodes in the variables nodegroup.
     '''
@@ -131,18 +228,13 @@ def apply_variable_settings(data):
             if node:
                 node.outputs[0].default_value = data[name][0]
             else:
-                print(f'Warning: Node {set} in variable settings nodegroup not found.')
+                print(f'Warning: Node {name} in variable settings nodegroup not found.')
     return
 
-def apply_motion_blur_settings(data):
+def apply_motion_blur_settings(settings):
     ''' Deactivates deformation motion blur for objects in selected collections.
     '''
-    if not data:
-        return
-    
-    list_unique, list_all = split_by_suffix(data.keys(), ':all')
-    
-    if 'Master Collection' in data.keys() or 'Scene Collection' in data.keys():
+    if settings.all_objects:
         for ob in bpy.data.objects:
             if ob.type == 'CAMERA':
                 continue
@@ -150,15 +242,7 @@ def apply_motion_blur_settings(data):
         return
         
     for col in bpy.data.collections:
-        for name_col in list_all:
-            if not col.name.startswith(name_col):
-                continue
-            for ob in col.all_objects:
-                if ob.type == 'CAMERA':
-                    continue
-                ob.cycles.use_motion_blur = False
-        # unique names
-        if not col.name in list_unique:
+        if not settings.matches(col.name):
             continue
         for ob in col.all_objects:
             if ob.type == 'CAMERA':
@@ -166,106 +250,99 @@ def apply_motion_blur_settings(data):
             ob.cycles.use_motion_blur = False
     return
 
-def apply_shader_settings(data):
+def apply_shader_settings(settings):
     ''' Assign shader setting properties to helper objects according to specified names.
     '''
-    if not data:
-        return
-    
-    list_unique, list_all = split_by_suffix(data.keys(), ':all')
-
     for ob in bpy.data.objects:
-        # group names
-        for name_ob in list_all:
-            if not ob.name.startswith(name_ob):
+        for name_set, value in settings.get_values(ob.name):
+            if not name_set in ob:
+                print(f'Warning: Property {name_set} on object {ob.name} not found.')
                 continue
-            for name_set in data[name_ob+':all']:
-                if not name_set in ob:
-                    print(f'Warning: Property {name_set} on object {ob.name} not found.')
-                    continue
-                ob[name_set] = data[name_ob+':all'][name_set][0]
-        # unique names
-        if ob.name in list_unique:
-            for name_set in data[ob.name]:
-                if name_set in ob:
-                    ob[name_set] = data[ob.name][name_set][0]
-                else:
-                    print(f'Warning: Property {name_set} on object {ob.name} not found.')
+            ob[name_set] = value
     return
 
-def apply_rig_settings(data):
+def apply_rig_settings(settings):
     ''' Assign rig setting properties to property bones according to specified names. Mutes fcurves from evaluation on those overriden properties.
     '''
-    if not data:
-        return
-    
-    list_unique, list_all = split_by_suffix(data.keys(), ':all')
-    
     for ob in bpy.data.objects:
         # find properties bone (first posebone that starts with 'Properties_')
         if not ob.type == 'ARMATURE':
             continue
+        values = settings.get_values(ob.name)
+        if not values:
+            continue
         bone_prop = get_properties_bone(ob)
         if not bone_prop:
             continue
         
-        # group names
-        for name_ob in list_all:
-            if not ob.name.startswith(name_ob):
+        for name_set, value in values:
+            if not name_set in bone_prop:
+                print(f'Warning: Property {name_set} on object {ob.name} not found.')
                 continue
-            for name_set in data[name_ob+':all']:
-                if not name_set in bone_prop:
-                    print(f'Warning: Property {name_set} on object {ob.name} not found.')
-                    continue
-                data_path = f'pose.bones["{bone_prop.name}"]["{name_set}"]'
-                mute_fcurve(ob, data_path)
-                bone_prop[name_set] = data[name_ob+':all'][name_set][0]
-                
-        # unique names
-        if ob.name in list_unique:
-            for name_set in data[ob.name]:
-                if name_set in bone_prop:
-                    data_path = f'pose.bones["{bone_prop.name}"]["{name_set}"]'
-                    mute_fcurve(ob, data_path)
-                    bone_prop[name_set] = data[ob.name][name_set][0]
-                else:
-                    print(f'Warning: Property {name_set} on object {ob.name} not found.')
+            data_path = f'pose.bones["{bone_prop.name}"]["{name_set}"]'
+            mute_fcurve(ob, data_path)
+            bone_prop[name_set] = value
     return
 
-def apply_rna_overrides(data):
+def apply_rna_overrides(overrides):
     ''' Applies custom overrides on specified rna data paths.
     '''
+    for override in overrides:
+        try:
+            override.apply()
+        except Exception:
+            print(f'Warning: Failed to assign property {override.name} at {override.path}')
+    return
+
+# Category name -> (compile function, apply function), in order of application.
+CATEGORIES = {
+    'variable_settings': (lambda data: data, apply_variable_settings),
+    'motion_blur_settings': (MotionBlurSettings, apply_motion_blur_settings),
+    'shader_settings': (PropertySettings, apply_shader_settings),
+    'rig_settings': (PropertySettings, apply_rig_settings),
+    'rna_overrides': (compile_rna_overrides, apply_rna_overrides),
+    }
+
+def compile_settings(data):
+    ''' Returns the settings compiled into a plan of category names and their compiled settings.
+    Plans are cached by a hash of the settings, so unchanged settings are only compiled once.
+    Only the most recently used plans are kept.
+    '''
     if not data:
-        return
+        return {}
+    plan_cache = bpy.app.driver_namespace.setdefault(PLAN_CACHE_KEY, {})
+    key = hashlib.sha1(json.dumps(data).encode()).hexdigest()
+    plan = plan_cache.pop(key, None)
+    if plan is not None:
+        # Re-insert to mark the plan as most recently used.
+        plan_cache[key] = plan
+        return plan
 
-    for path in data:
-        try:
-            mute_animation_on_rna_path(path)
-            if data[path][1] == 'STRING':
-                exec(path+f" = '{data[path][0]}'")
-            elif type(eval(path)) == idprop.types.IDPropertyArray:
-                exec(path+f'[:] = {data[path][0]}') # workaround for Blender not retaining UI data of property (see https://projects.blender.org/blender/blender/pulls/109203)
-            else:
-                exec(path+f' = {data[path][0]}')
-        except:
-            print(f'Warning: Failed to assign property {data[path][2]} at {path}')
+    plan = {}
+    for cat, (compile_func, _apply_func) in CATEGORIES.items():
+        cat_data = data.get(cat)
+        if cat_data:
+            plan[cat] = compile_func(cat_data)
+    plan_cache[key] = plan
+    while len(plan_cache) > PLAN_CACHE_SIZE:
+        del plan_cache[next(iter(plan_cache))]
+    return plan
+
+def apply_plan(plan):
+    ''' Applies a compiled plan and prints the time spent per category.
+    '''
+    for cat, (_compile_func, apply_func) in CATEGORIES.items():
+        if cat not in plan:
+            continue
+        start = time.perf_counter()
+        apply_func(plan[cat])
+        print(f'Lighting Overrider: Applied {cat} in {(time.perf_counter()-start)*1000:.1f} ms')
     return
 
 def apply_settings(data):
     ''' Applies settings by categories using the specified category name and apply function.
     '''
-    categories = {
-        'variable_settings': apply_variable_settings,
-        'motion_blur_settings': apply_motion_blur_settings,
-        'shader_settings': apply_shader_settings,
-        'rig_settings': apply_rig_settings,
-        'rna_overrides': apply_rna_overrides,
-        }
-    
-    for cat in categories:
-        cat_data = data.get(cat)
-        if cat_data:
-            categories[cat](cat_data)
+    apply_plan(compile_settings(data))
     return
 
 def settings_from_datablock(datablock):
@@ -3,17 +3,19 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import re
+import time
 from collections import OrderedDict
 from math import sqrt
 
 import bpy
+import numpy as np
 from bpy.props import BoolProperty, EnumProperty, StringProperty
 from bpy.types import Object, Operator
 from mathutils import Quaternion, Vector
 
 from .naming import side_is_left
 from .prefs import get_addon_prefs
-from .symmetrize_shape_key import mirror_mesh
+from .symmetrize_shape_key import get_coords, mirror_mesh, set_coords
 from .ui_list import UILIST_OT_Entry_Add, UILIST_OT_Entry_Remove
 
 # When saving or pushing shapes, disable any modifier NOT in this list.
@@ -36,6 +38,8 @@ DEFORM_MODIFIERS = [
     'WAVE',
 ]
 GOOD_MODIFIERS = ['ARMATURE']
+# Pushed deltas shorter than this on every axis are treated as unmoved vertices.
+DELTA_EPSILON = 1e-6
 
 
 class OBJECT_OT_pose_key_add(UILIST_OT_Entry_Add, Operator):
@@ -309,8 +313,11 @@ class OBJECT_OT_pose_key_save(Operator, OperatorWithWarning, SaveAndRestoreState
                 storage_ob.material_slots[i].material = ms.material
 
         # Set the target shape to be the evaluated mesh.
-        for target_v, eval_v in zip(target.data, rigged_ob_eval_mesh.vertices):
-            target_v.co = eval_v.co
+        eval_coords = get_coords(rigged_ob_eval_mesh.vertices)
+        target_coords = get_coords(target.data)
+        num_verts = min(len(target_coords), len(eval_coords))
+        target_coords[:num_verts] = eval_coords[:num_verts]
+        set_coords(target.data, target_coords)
 
         # Copy some symmetry settings from the original
         storage_ob.data.use_mirror_x = rigged_ob.data.use_mirror_x
@@ -373,86 +380,12 @@ class OBJECT_OT_pose_key_push(Operator, OperatorWithWarning, SaveAndRestoreState
         """
 
         self.save_state(context)
-
         try:
-            self.push_active_pose_key(context, set_pose=False)
-        except:
-            return {'CANCELLED'}
-
-        self.restore_state(context)
-
-        return {'FINISHED'}
+            pushed = push_active_pose_key(self, context)
+        finally:
+            self.restore_state(context)
 
-    def push_active_pose_key(self, context, set_pose=False):
-        depsgraph = context.evaluated_depsgraph_get()
-        scene = context.scene
-
-        rigged_ob = context.object
-
-        pose_key = get_active_pose_key(rigged_ob)
-
-        storage_object = pose_key.storage_object
-        if storage_object.name not in context.view_layer.objects:
-            self.report({'ERROR'}, f'Storage object "{storage_object.name}" must be in view layer!')
-            raise Exception
-
-        if set_pose:
-            set_pose_of_active_pose_key(context)
-
-        # The Pose Key stores the vertex positions of a previous evaluated mesh.
-        # This, and the current vertex positions of the mesh are subtracted
-        # from each other to get the difference in their shape.
-        storage_eval_verts = pose_key.storage_object.evaluated_get(depsgraph).data.vertices
-        rigged_eval_verts = rigged_ob.evaluated_get(depsgraph).data.vertices
-
-        # Shape keys are relative to the base shape of the mesh, so that delta
-        # will be added to the base mesh to get the final shape key vertex positions.
-        rigged_base_verts = rigged_ob.data.vertices
-
-        # The CrazySpace provides us the matrix by which each vertex has been
-        # deformed by modifiers and shape keys. This matrix is necessary to
-        # calculate the correct delta.
-        rigged_ob.crazyspace_eval(depsgraph, scene)
-
-        for i, v in enumerate(storage_eval_verts):
-            if i > len(rigged_base_verts) - 1:
-                break
-            storage_eval_co = Vector(v.co)
-            rigged_eval_co = rigged_eval_verts[i].co
-
-            delta = storage_eval_co - rigged_eval_co
-
-            delta = rigged_ob.crazyspace_displacement_to_original(
-                vertex_index=i, displacement=delta
-            )
-
-            base_v = rigged_base_verts[i].co
-            for target_shape in pose_key.target_shapes:
-                key_block = target_shape.key_block
-                if not key_block:
-                    continue
-                key_block.data[i].co = base_v + delta
-
-        # Mirror shapes if needed
-        for target_shape in pose_key.target_shapes:
-            if target_shape.mirror_x:
-                key_block = target_shape.key_block
-                if not key_block:
-                    continue
-                mirror_mesh(
-                    reference_verts=rigged_ob.data.vertices,
-                    vertices=key_block.data,
-                    axis='X',
-                    symmetrize=False,
-                )
-
-        rigged_ob.crazyspace_eval_clear()
-
-        if len(storage_eval_verts) != len(rigged_eval_verts):
-            self.report(
-                {'WARNING'},
-                f'Mismatching topology: Stored shape "{pose_key.storage_object.name}" had {len(storage_eval_verts)} vertices instead of {len(rigged_eval_verts)}',
-            )
+        return {'FINISHED'} if pushed else {'CANCELLED'}
 
 
 class OBJECT_OT_pose_key_push_all(Operator, OperatorWithWarning, SaveAndRestoreState):
@@ -486,11 +419,48 @@ class OBJECT_OT_pose_key_push_all(Operator, OperatorWithWarning, SaveAndRestoreS
 
     def execute(self, context):
         rigged_ob = context.object
+        if not get_deforming_armature(rigged_ob):
+            self.report({'ERROR'}, "This mesh object is not deformed by any Armature modifier.")
+            return {'CANCELLED'}
+
+        pushed_counter = 0
+        failed_names = []
+        start_time = time.perf_counter()
         for i, pk in enumerate(rigged_ob.data.pose_keys):
+            if not pk.storage_object or not any(t.key_block for t in pk.target_shapes):
+                print(f'Pose Key "{pk.name}" skipped: No storage object or target shapes.')
+                continue
+            if not pk.action:
+                print(f'Pose Key "{pk.name}" skipped: No action to take the pose from.')
+                continue
             rigged_ob.data.active_pose_key_index = i
-            bpy.ops.object.posekey_set_pose()
-            bpy.ops.object.posekey_push()
+            pose_key_start_time = time.perf_counter()
+
+            # Call the push logic directly instead of through operators, so each pose
+            # only gets evaluated once, when the push requests the evaluated depsgraph.
+            self.save_state(context)
+            try:
+                set_pose_of_active_pose_key(context)
+                pushed = push_active_pose_key(self, context)
+            finally:
+                self.restore_state(context)
+            if not pushed:
+                # Earlier pose keys were already pushed, so keep going and finish the
+                # operator, so that all of the changes are part of its undo step.
+                failed_names.append(pk.name)
+                continue
 
+            pushed_counter += 1
+            print(f'Pushed Pose Key "{pk.name}" in {time.perf_counter() - pose_key_start_time:.2f}s')
+
+        message = f"Pushed {pushed_counter} Pose Keys in {time.perf_counter() - start_time:.2f}s."
+        if failed_names:
+            self.report(
+                {'WARNING'},
+                message + " Failed to push: " + ", ".join(f'"{name}"' for name in failed_names),
+            )
+        else:
+            self.report({'INFO'}, message)
         return {'FINISHED'}
 
 
@@ -1125,6 +1095,101 @@ class OBJECT_OT_pose_key_magic_driver(Operator):
         driver.expression = final_exp
         return final_exp
 
+
+def push_active_pose_key(operator, context) -> bool:
+    """
+    Load the active PoseShapeKey's mesh data into its target shape keys, in the
+    current pose. Used by both the Push and the Push All operators.
+    Problems are reported through the operator. Return whether the push happened.
+    """
+    rigged_ob = context.object
+    pose_key = get_active_pose_key(rigged_ob)
+    if not pose_key:
+        operator.report({'ERROR'}, "A Pose Shape Key must be selected.")
+        return False
+    if not get_deforming_armature(rigged_ob):
+        operator.report({'ERROR'}, "This mesh object is not deformed by any Armature modifier.")
+        return False
+
+    storage_object = pose_key.storage_object
+    if not storage_object:
+        operator.report({'ERROR'}, f'Pose Key "{pose_key.name}" has no storage object.')
+        return False
+    if storage_object.name not in context.view_layer.objects:
+        operator.report({'ERROR'}, f'Storage object "{storage_object.name}" must be in view layer!')
+        return False
+    if not any(target_shape.key_block for target_shape in pose_key.target_shapes):
+        operator.report(
+            {'ERROR'}, f'Pose Key "{pose_key.name}" has no target shape keys to push into.'
+        )
+        return False
+
+    depsgraph = context.evaluated_depsgraph_get()
+    scene = context.scene
+
+    # The Pose Key stores the vertex positions of a previous evaluated mesh.
+    # This, and the current vertex positions of the mesh are subtracted
+    # from each other to get the difference in their shape.
+    storage_eval_verts = pose_key.storage_object.evaluated_get(depsgraph).data.vertices
+    rigged_eval_verts = rigged_ob.evaluated_get(depsgraph).data.vertices
+    storage_eval_coords = get_coords(storage_eval_verts)
+    rigged_eval_coords = get_coords(rigged_eval_verts)
+
+    # Shape keys are relative to the base shape of the mesh, so that delta
+    # will be added to the base mesh to get the final shape key vertex positions.
+    rigged_base_coords = get_coords(rigged_ob.data.vertices)
+
+    num_verts = min(
+        len(storage_eval_coords), len(rigged_eval_coords), len(rigged_base_coords)
+    )
+    deltas = storage_eval_coords[:num_verts] - rigged_eval_coords[:num_verts]
+
+    # The CrazySpace provides us the matrix by which each vertex has been
+    # deformed by modifiers and shape keys. This matrix is necessary to
+    # calculate the correct delta.
+    # The conversion is linear, so vertices that didn't move don't need it.
+    # Corrective shapes usually only move a small part of the mesh.
+    # Deltas of unmoved vertices are float noise rather than exact zeros.
+    rigged_ob.crazyspace_eval(depsgraph, scene)
+    moved = np.any(np.abs(deltas) > DELTA_EPSILON, axis=1)
+    deltas[~moved] = 0
+    moved_indices = np.flatnonzero(moved)
+    for i, delta in zip(moved_indices.tolist(), deltas[moved_indices].tolist()):
+        deltas[i] = rigged_ob.crazyspace_displacement_to_original(
+            vertex_index=i, displacement=delta
+        )
+
+    for target_shape in pose_key.target_shapes:
+        key_block = target_shape.key_block
+        if not key_block:
+            continue
+        key_coords = get_coords(key_block.data)
+        key_coords[:num_verts] = rigged_base_coords[:num_verts] + deltas
+        set_coords(key_block.data, key_coords)
+
+    # Mirror shapes if needed
+    for target_shape in pose_key.target_shapes:
+        if target_shape.mirror_x:
+            key_block = target_shape.key_block
+            if not key_block:
+                continue
+            mirror_mesh(
+                reference_verts=rigged_ob.data.vertices,
+                vertices=key_block.data,
+                axis='X',
+                symmetrize=False,
+            )
+
+    rigged_ob.crazyspace_eval_clear()
+
+    if len(storage_eval_verts) != len(rigged_eval_verts):
+        operator.report(
+            {'WARNING'},
+            f'Mismatching topology: Stored shape "{pose_key.storage_object.name}" had {len(storage_eval_verts)} vertices instead of {len(rigged_eval_verts)}',
+        )
+    return True
+
+
 def get_deforming_armature(mesh_ob: Object) -> Object | None:
     for mod in mesh_ob.modifiers:
         if mod.type == 'ARMATURE':
@@ -3,10 +3,66 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import bpy
+import numpy as np
 from bpy.props import BoolProperty, EnumProperty, FloatProperty
 from bpy.types import Operator
 from mathutils.kdtree import KDTree
 
+# Max distance between a flipped vertex and its closest match, to be considered its opposite.
+MIRROR_DISTANCE = 0.1  # pretty big threshold, for testing.
+
+
+class SymmetryMap:
+    """For each vertex of a reference mesh, the index of its closest vertex
+    when flipped along an axis, and the distance to it."""
+
+    def __init__(self, coords_hash: int, opposite_idxs: np.ndarray, distances: np.ndarray):
+        self.coords_hash = coords_hash
+        self.opposite_idxs = opposite_idxs
+        self.distances = distances
+
+
+# (Mesh pointer, axis) -> SymmetryMap.
+_symmetry_maps: dict[tuple[int, str], SymmetryMap] = {}
+
+
+def get_coords(collection) -> np.ndarray:
+    """Return the "co" values of a collection of vertices or shape key points as an (N, 3) array."""
+    coords = np.empty(len(collection) * 3, dtype=np.float32)
+    collection.foreach_get('co', coords)
+    return coords.reshape(-1, 3)
+
+
+def set_coords(collection, coords: np.ndarray):
+    collection.foreach_set('co', coords.ravel())
+
+
+def get_symmetry_map(reference_verts, axis: str) -> SymmetryMap:
+    """Return the SymmetryMap of a mesh's vertices. The KDTree is only built
+    again when the mesh's vertex positions changed."""
+    ref_coords = get_coords(reference_verts)
+    coords_hash = hash(ref_coords.tobytes())
+    key = (reference_verts.id_data.as_pointer(), axis)
+    symmetry_map = _symmetry_maps.get(key)
+    if symmetry_map and symmetry_map.coords_hash == coords_hash:
+        return symmetry_map
+
+    kd = KDTree(len(ref_coords))
+    for i, co in enumerate(ref_coords.tolist()):
+        kd.insert(co, i)
+    kd.balance()
+
+    flipped_coords = ref_coords.copy()
+    flipped_coords[:, 'XYZ'.find(axis)] *= -1
+    opposite_idxs = np.empty(len(ref_coords), dtype=np.int64)
+    distances = np.empty(len(ref_coords), dtype=np.float64)
+    for i, flipped_co in enumerate(flipped_coords.tolist()):
+        _opposite_co, opposite_idxs[i], distances[i] = kd.find(flipped_co)
+
+    symmetry_map = SymmetryMap(coords_hash, opposite_idxs, distances)
+    _symmetry_maps[key] = symmetry_map
+    return symmetry_map
+
 
 def mirror_mesh(
     *,
@@ -36,63 +92,60 @@ def mirror_mesh(
         vertices
     ), "Reference vertices and vertices to be modified should have equal length!"
 
-    size = len(reference_verts)
-    kd = KDTree(size)
-    for i, v in enumerate(reference_verts):
-        kd.insert(v.co, i)
-    kd.balance()
-
+    symmetry_map = get_symmetry_map(reference_verts, axis)
     coord_i = 'XYZ'.find(axis)
+    ref_axis_coords = get_coords(reference_verts)[:, coord_i]
 
-    if symmetrize:
-        # Figure out the function that will be used to determine whether a vertex
-        # should be skipped or not, when symmetrize==True
-        zero_or_more = lambda x: x >= 0
-        zero_or_less = lambda x: x <= 0
-
-        skip_func = zero_or_more if symmetrize_pos_to_neg else zero_or_less
+    # Store a copy of the un-modified vertices (only important when mirror=True)
+    orig_coords = get_coords(vertices)
+    coords = orig_coords.copy()
 
-    # Count number of vertices successfully symmetrized.
-    good_counter = 0
+    # Vertices whose coordinates get copied to their opposite vertex.
+    sources = np.ones(len(coords), dtype=bool)
+    on_axis = np.zeros(len(coords), dtype=bool)
+    if symmetrize:
+        # If we are symmetrizing and a vertex falls on the symmetry axis,
+        # its offset on the symmetry axis should be exactly 0.
+        on_axis = np.abs(ref_axis_coords) < 0.0001
+        if symmetrize_pos_to_neg:
+            sources = ref_axis_coords < 0
+        else:
+            sources = ref_axis_coords > 0
+        sources &= ~on_axis
 
     # Count number of vertices where the number of opposite vertices found in
     # the reference vertices is not exactly 1.
     # If this goes above 0, the reference verts were assymetrical, so the result
     # will be wrong.
-    bad_counter = 0
-    affected_vert_idxs = []
+    too_far = symmetry_map.distances > MIRROR_DISTANCE
+    bad_counter = int(np.count_nonzero(sources & too_far))
+    source_idxs = np.flatnonzero(sources & ~too_far)
+
+    # If multiple vertices match with the same opposite vertex, there's no way to
+    # tell which is correct, so only the first one is used.
+    # Input mesh should just be more symmetrical.
+    opposite_idxs, first = np.unique(
+        symmetry_map.opposite_idxs[source_idxs], return_index=True
+    )
+    bad_counter += len(source_idxs) - len(first)
+    source_idxs = source_idxs[first]
 
-    # Store a copy of the un-modified vertices (only important when mirror=True)
-    orig_coords = [v.co.copy() for v in vertices]
-
-    # For any vertex with an X coordinate > 0, try to find a vertex at
-    # the coordinate with X flipped.
-    for i, ref_vert in enumerate(reference_verts):
-        if symmetrize and abs(ref_vert.co[coord_i]) < 0.0001:
-            # If we are symmetrizing and a vertex falls on the symmetry axis,
-            # its offset on the symmetry axis should be exactly 0.
-            vertices[i].co[coord_i] = 0.0
-            continue
-        if symmetrize and skip_func(ref_vert.co[coord_i]):
-            continue
-        flipped_co = ref_vert.co.copy()
-        flipped_co[coord_i] *= -1
-        _opposite_co, opposite_idx, dist = kd.find(flipped_co)
-        opposite_vert = vertices[opposite_idx]
-        if dist > 0.1:  # pretty big threshold, for testing.
-            # TODO: Keep count of how many vertices were skipped and report it.
-            bad_counter += 1
-            continue
-        if opposite_idx in affected_vert_idxs:
-            # This vertex was already symmetrized, and another vertex just matched with it.
-            # No way to tell which is correct. Input mesh should just be more symmetrical.
-            bad_counter += 1
-            continue
-        opposite_vert.co = orig_coords[i].copy()
-        opposite_vert.co[coord_i] *= -1
-        good_counter += 1
-        affected_vert_idxs.append(opposite_idx)
+    coords[opposite_idxs] = orig_coords[source_idxs]
+    coords[opposite_idxs, coord_i] *= -1
+
+    # Same result as processing the vertices in index order: A vertex on the symmetry
+    # axis keeps its zeroed offset, unless a source vertex with a higher index is
+    # copied onto it.
+    overwritten_by = np.full(len(coords), -1)
+    overwritten_by[opposite_idxs] = source_idxs
+    on_axis_idxs = np.flatnonzero(on_axis)
+    on_axis_idxs = on_axis_idxs[overwritten_by[on_axis_idxs] < on_axis_idxs]
+    coords[on_axis_idxs, coord_i] = 0.0
+
+    vertices.foreach_set('co', coords.ravel())
 
+    # Number of vertices successfully symmetrized.
+    good_counter = len(opposite_idxs)
     return good_counter, bad_counter
 
 
@@ -150,7 +203,6 @@ class OBJECT_OT_symmetrize_shape_key(Operator):
 
         key_blocks = [obj.active_shape_key]
         if self.all_keys:
-            # TODO: This could be more optimized, right now we re-build the kdtree for each key block unneccessarily.
             key_blocks = obj.data.shape_keys.key_blocks[:]
 
         for kb in key_blocks:
@@ -23,3 +23,21 @@ def test_force_apply_mirror(context_ew):
 
     assert mirrored_shape_key.vertex_group == 'Side.R'
     assert suzanne.vertex_groups.get('Side.R')
+
+
+def test_symmetrize_weights(context_ew):
+    bpy.ops.wm.read_homefile(use_empty=True)
+    bpy.ops.mesh.primitive_monkey_add()
+    suzanne = context_ew.active_object
+    verts = suzanne.data.vertices
+
+    left = suzanne.vertex_groups.new(name="Ear.L")
+    left.add([v.index for v in verts if v.co.x > 0.5], 1.0, 'REPLACE')
+
+    assert bpy.ops.object.symmetrize_vertex_weights(groups='ALL', direction='LEFT_TO_RIGHT') == {'FINISHED'}
+
+    right = suzanne.vertex_groups.get('Ear.R')
+    assert right
+    right_weighted = {v.index for v in verts if any(g.group == right.index for g in v.groups)}
+    assert right_weighted
+    assert all(verts[i].co.x < 0 for i in right_weighted)
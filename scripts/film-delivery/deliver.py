@@ -19,9 +19,21 @@ Running deliver.py will:
 - encode the content of 'audio' into an aac file .m4a file
 - encode the frames found in 'frames' as high-quality x264 .m4v file
 - mux the .m4a and .m4v files in a .mp4 in the 'mux' directory
+
+With --segmented the frames are split in GOP aligned segments that are encoded
+in parallel with the same settings and then concatenated without re-encoding.
+Segments are written as MPEG-TS, which keeps the timestamps of B-frames valid
+at the joins.
+Segments are kept in 'mux/segments' together with a checksum of their input
+frames, so an interrupted delivery resumes with the segments that are missing
+or whose frames changed.
 """
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
 import subprocess
 from pathlib import Path
 
@@ -31,6 +43,12 @@ DEFAULT_FRAMES_DIR_PATH = str(CURRENT_DIR / 'frames')
 DEFAULT_AUDIO_FILE_PATH = str(CURRENT_DIR / 'mux' / 'audio.m4a')
 DEFAULT_VIDEO_FILE_PATH = str(CURRENT_DIR / 'mux' / 'video.m4v')
 DEFAULT_MUX_FILE_PATH = str(CURRENT_DIR / 'mux.mp4')
+DEFAULT_SEGMENTS_DIR_PATH = CURRENT_DIR / 'mux' / 'segments'
+
+FRAMERATE = 24
+GOP_SIZE = 12
+DEFAULT_SEGMENT_SIZE = GOP_SIZE * 100
+SEGMENT_SUFFIX = '.ts'
 
 
 def get_next_versioned_filename(base_filename):
@@ -54,26 +72,199 @@ def encode_audio(input_audio):
     subprocess.run(cmd, check=True)
 
 
+# Encoding settings shared by the single pass and the segmented encode, so that
+# segments can be concatenated without re-encoding.
+CODEC_SETTINGS = {
+    'codec': ['-c:v', 'libx264'],
+    'codec_preset': ['-preset', 'slow'],
+    'codec_profile': ['-profile:v', 'high'],
+    'codec_crf': ['-crf', '18'],
+    'codec_coder': ['-coder', '1'],
+    'codec_pix_fmt': ['-pix_fmt', 'yuv420p'],
+    'codec_gop': ['-g', str(GOP_SIZE)],
+    'codec_b_frames': ['-bf', '2'],
+}
+MP4_FLAGS = ['-movflags', '+faststart']
+
+
 def encode_frames(input_frames=DEFAULT_FRAMES_DIR_PATH, frames_extension='png'):
     ffmpeg_command = {
         'command': ['ffmpeg'],
-        'framerate': ['-framerate', '24'],
+        'framerate': ['-framerate', str(FRAMERATE)],
         'pattern': ['-pattern_type', 'glob', '-i', f'{input_frames}/*.{frames_extension}'],
-        'codec': ['-c:v', 'libx264'],
-        'codec_preset': ['-preset', 'slow'],
-        'codec_profile': ['-profile:v', 'high'],
-        'codec_crf': ['-crf', '18'],
-        'codec_coder': ['-coder', '1'],
-        'codec_pix_fmt': ['-pix_fmt', 'yuv420p'],
-        'codec_flags': ['-movflags', '+faststart'],
-        'codec_gop': ['-g', '12'],
-        'codec_b_frames': ['-bf', '2'],
-        'output': [str(CURRENT_DIR / 'mux' / 'video.m4v')],
+        **CODEC_SETTINGS,
+        'codec_flags': MP4_FLAGS,
+        'output': [DEFAULT_VIDEO_FILE_PATH],
+    }
+    cmd = [arg for args_list in ffmpeg_command.values() for arg in args_list]
+    subprocess.run(cmd, check=True)
+
+
+def list_frames(input_frames, frames_extension='png'):
+    """Return the frames in the same (alphabetical) order as the ffmpeg glob pattern."""
+    return sorted(Path(input_frames).glob(f'*.{frames_extension}'))
+
+
+def split_segments(frames, segment_size=DEFAULT_SEGMENT_SIZE):
+    """Split frames in segments of segment_size, rounded to a multiple of the GOP size.
+
+    Every segment starts with a keyframe, since each segment is its own encode, and
+    has only complete GOPs, so the concatenated stream has the same GOP structure
+    as a single pass encode.
+    """
+    segment_size = max(GOP_SIZE, segment_size - segment_size % GOP_SIZE)
+    return [frames[i : i + segment_size] for i in range(0, len(frames), segment_size)]
+
+
+def get_segment_checksum(segment_frames):
+    """Checksum of the input of a segment: frame names, sizes, mtimes and encoding settings."""
+    checksum = hashlib.sha256()
+    checksum.update(json.dumps(CODEC_SETTINGS, sort_keys=True).encode())
+    checksum.update(str(FRAMERATE).encode())
+    for frame in segment_frames:
+        stat = frame.stat()
+        checksum.update(f'{frame.name}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode())
+    return checksum.hexdigest()
+
+
+def get_segment_paths(segments_dir, segment_index):
+    video_path = Path(segments_dir) / f'{segment_index:05d}{SEGMENT_SUFFIX}'
+    return video_path, video_path.with_suffix('.json')
+
+
+def get_segment_tmp_path(video_path):
+    return video_path.with_name(f'{video_path.stem}.tmp{video_path.suffix}')
+
+
+def is_segment_valid(segments_dir, segment_index, checksum):
+    """A segment is valid if its output exists with the recorded size and its input did not change."""
+    video_path, manifest_path = get_segment_paths(segments_dir, segment_index)
+    if not video_path.exists() or not manifest_path.exists():
+        return False
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return manifest.get('checksum') == checksum and manifest.get('size') == video_path.stat().st_size
+
+
+def encode_segment(segment_frames, segments_dir, segment_index, checksum):
+    """Encode one segment by piping its frames into ffmpeg.
+
+    The output is written to a temporary file and the manifest is only written after
+    ffmpeg succeeded, so a failed or interrupted segment is never considered valid.
+    The temporary file is removed if the encode fails or is interrupted.
+    """
+    video_path, manifest_path = get_segment_paths(segments_dir, segment_index)
+    tmp_path = get_segment_tmp_path(video_path)
+
+    ffmpeg_command = {
+        'command': ['ffmpeg', '-y', '-v', 'error'],
+        'framerate': ['-framerate', str(FRAMERATE)],
+        'input': ['-f', 'image2pipe', '-i', '-'],
+        **CODEC_SETTINGS,
+        'output': ['-f', 'mpegts', str(tmp_path)],
     }
     cmd = [arg for args_list in ffmpeg_command.values() for arg in args_list]
+
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        try:
+            for frame in segment_frames:
+                process.stdin.write(frame.read_bytes())
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+    except BaseException:
+        # Also on KeyboardInterrupt, so no partial segment is left behind.
+        process.kill()
+        process.wait()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp_path, video_path)
+    with open(manifest_path, 'w') as f:
+        json.dump(
+            {
+                'checksum': checksum,
+                'first_frame': segment_frames[0].name,
+                'frame_count': len(segment_frames),
+                'size': video_path.stat().st_size,
+            },
+            f,
+            indent=4,
+        )
+    print(f'Encoded segment {segment_index} ({len(segment_frames)} frames)')
+    return video_path
+
+
+def concatenate_segments(segment_paths, segments_dir, output_file=DEFAULT_VIDEO_FILE_PATH):
+    file_list_path = Path(segments_dir) / 'file_list.txt'
+    with open(file_list_path, 'w') as file_list:
+        for segment_path in segment_paths:
+            file_list.write(f"file '{segment_path.name}'\n")
+
+    cmd = [
+        'ffmpeg',
+        '-y',
+        '-f',
+        'concat',
+        '-safe',
+        '0',
+        '-i',
+        str(file_list_path),
+        '-c',
+        'copy',
+        *MP4_FLAGS,
+        str(output_file),
+    ]
     subprocess.run(cmd, check=True)
 
 
+def encode_frames_segmented(
+    input_frames=DEFAULT_FRAMES_DIR_PATH,
+    frames_extension='png',
+    segment_size=DEFAULT_SEGMENT_SIZE,
+    jobs=None,
+    segments_dir=DEFAULT_SEGMENTS_DIR_PATH,
+):
+    """Encode frames in parallel segments, skip the ones that are still valid and concatenate."""
+    frames = list_frames(input_frames, frames_extension)
+    if not frames:
+        print(f'No {frames_extension} frames found in {input_frames}')
+        return
+
+    segments_dir = Path(segments_dir)
+    segments_dir.mkdir(parents=True, exist_ok=True)
+    segments = split_segments(frames, segment_size)
+
+    # Remove segments of a previous delivery that had more frames.
+    for stale_path in segments_dir.glob(f'*{SEGMENT_SUFFIX}'):
+        if stale_path.stem.isdigit() and int(stale_path.stem) >= len(segments):
+            stale_path.unlink()
+            stale_path.with_suffix('.json').unlink(missing_ok=True)
+
+    # Remove partial segments of a delivery that was killed while encoding.
+    for tmp_path in segments_dir.glob(f'*.tmp{SEGMENT_SUFFIX}'):
+        tmp_path.unlink()
+
+    checksums = [get_segment_checksum(segment) for segment in segments]
+    todo = [i for i, checksum in enumerate(checksums) if not is_segment_valid(segments_dir, i, checksum)]
+    print(f'{len(frames)} frames in {len(segments)} segments, {len(segments) - len(todo)} still valid.')
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(encode_segment, segments[i], segments_dir, i, checksums[i]) for i in todo]
+        for future in futures:
+            # Raises if any of the segments failed.
+            future.result()
+
+    segment_paths = [get_segment_paths(segments_dir, i)[0] for i in range(len(segments))]
+    concatenate_segments(segment_paths, segments_dir)
+
+
 def mux_av(
     video_input=DEFAULT_VIDEO_FILE_PATH,
     audio_input=DEFAULT_AUDIO_FILE_PATH,
@@ -111,6 +302,23 @@ def main():
         required=False,
         help="Input frames directory path",
     )
+    parser.add_argument(
+        "--segmented",
+        action='store_true',
+        help="Encode frames in parallel GOP aligned segments, resuming from valid segments",
+    )
+    parser.add_argument(
+        "--segment_size",
+        type=int,
+        default=DEFAULT_SEGMENT_SIZE,
+        help=f"Frames per segment, rounded down to a multiple of {GOP_SIZE}",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Number of segments encoded at the same time",
+    )
     parser.add_argument(
         "--mux",
         action='store_true',
@@ -126,6 +334,13 @@ def main():
     if args.encode_audio:
         encode_audio(args.encode_audio)
     if args.encode_frames:
-        encode_frames(args.encode_frames)
+        if args.segmented:
+            encode_frames_segmented(args.encode_frames, segment_size=args.segment_size, jobs=args.jobs)
+        else:
+            encode_frames(args.encode_frames)
     if args.mux:
         mux_av()
+
+
+if __name__ == "__main__":
+    main()
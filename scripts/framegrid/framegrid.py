@@ -13,6 +13,11 @@ How does it work? We use ffmpeg, ffprobe and montage to do the heavy lifting.
 2. Generate scaled thumbnails at regular intervals with ffmpeg
 3. Combine the thumbnails in a grid with montage
 
+With --mode direct there is no montage step and no intermediate files: every
+cell is extracted with its own seeking ffmpeg process (run in parallel), the
+raw RGB frames are read from a pipe, tiled with NumPy and the grid is encoded
+once by ffmpeg.
+
 More info in:
 * https://trac.ffmpeg.org/wiki/Seeking
 
@@ -25,6 +30,7 @@ Open Movie project.
 """
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 from pathlib import Path
@@ -33,6 +39,11 @@ import subprocess
 import sys
 import tempfile
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 parser = argparse.ArgumentParser(description='Generate film grids.')
 parser.add_argument('-i', '--in_file', help='Input movie file', required=True)
@@ -47,6 +58,15 @@ parser.add_argument('-o', '--output_file', help='Output file path', default='out
 parser.add_argument('-y', '--skip_confirmation', help='Skip confirmation', action='store_true')
 parser.add_argument('-ss', '--ss', help='Trim start', default='00:00:00')
 parser.add_argument('-to', '--to', help='Trim end')
+parser.add_argument(
+    '-m',
+    '--mode',
+    help='montage: extract thumbnails to disk and tile them with montage. '
+    'direct: seek every cell in parallel and tile in memory (requires numpy)',
+    choices=['montage', 'direct'],
+    default='montage',
+)
+parser.add_argument('-j', '--jobs', help='Number of parallel ffmpeg processes in direct mode', type=int)
 args = parser.parse_args()
 
 
@@ -139,6 +159,13 @@ toolset = {
     'montage': os.environ.get('MONTAGE_BIN', 'montage'),
 }
 
+if args.mode == 'direct':
+    # Grid is assembled in memory, montage is not needed.
+    del toolset['montage']
+    if np is None:
+        print('numpy is required to run in direct mode, but it was not found.')
+        sys.exit()
+
 for s in toolset:
     which(toolset[s])
 
@@ -181,6 +208,103 @@ def gather_video_info():
     return info_json
 
 
+def get_video_stream(info_json):
+    for stream in info_json['streams']:
+        if stream['codec_type'] == 'video':
+            return stream
+
+
+def get_thumbnail_dimensions(video_stream, size_str):
+    """Resolve the width:height ffmpeg scale string to actual pixel dimensions.
+
+    Raw frames have no header, so we need to know the exact size to read them from
+    the pipe. A -1 dimension is computed from the display aspect ratio of the stream.
+    """
+    width, height = (int(d) for d in size_str.split(':'))
+    video_width = video_stream['width']
+    video_height = video_stream['height']
+
+    sample_aspect = video_stream.get('sample_aspect_ratio', '1:1')
+    num, den = (int(x) for x in sample_aspect.split(':'))
+    if num > 0 and den > 0:
+        video_width = video_width * num / den
+
+    if width < 0 and height < 0:
+        width, height = round(video_width), video_height
+    elif width < 0:
+        width = round(height * video_width / video_height)
+    elif height < 0:
+        height = round(width * video_height / video_width)
+
+    # Keep dimensions even, like most encoders expect.
+    return width - width % 2, height - height % 2
+
+
+def extract_raw_frame(time_in_seconds: float, width: int, height: int):
+    """Extract a single scaled RGB frame at the given time and return it as numpy array.
+
+    The -ss before -i makes ffmpeg seek to the keyframe before the requested time and only
+    decode from there, which is fast and still frame accurate.
+    """
+    ffmpeg_command = [
+        toolset['ffmpeg'],
+        '-v',
+        'error',
+        '-ss',
+        f'{time_in_seconds:.5f}',
+        '-i',
+        f'{in_file_absolute_path}',
+        '-frames:v',
+        '1',
+        '-vf',
+        f'scale={width}:{height}',
+        '-f',
+        'rawvideo',
+        '-pix_fmt',
+        'rgb24',
+        '-',
+    ]
+    frame_size = width * height * 3
+    out = subprocess.run(ffmpeg_command, stdout=subprocess.PIPE, check=False).stdout
+    if len(out) < frame_size:
+        # Seeking past the last frame, e.g. rounding at the end of the video.
+        return None
+    return np.frombuffer(out[:frame_size], dtype=np.uint8).reshape((height, width, 3))
+
+
+def make_grid_direct(timestamps, columns: int, rows: int, width: int, height: int, output_file):
+    """Extract all cells in parallel, tile them and encode the grid with a single ffmpeg call."""
+    grid = np.zeros((rows * height, columns * width, 3), dtype=np.uint8)
+
+    with ThreadPoolExecutor(max_workers=args.jobs or os.cpu_count()) as executor:
+        frames = executor.map(lambda t: extract_raw_frame(t, width, height), timestamps)
+        for index, frame in enumerate(frames):
+            if frame is None:
+                print(f'Could not extract frame at {get_time_str(timestamps[index])}, cell is left empty.')
+                continue
+            row, column = divmod(index, columns)
+            grid[row * height : (row + 1) * height, column * width : (column + 1) * width] = frame
+
+    ffmpeg_command = [
+        toolset['ffmpeg'],
+        '-v',
+        'error',
+        '-y',
+        '-f',
+        'rawvideo',
+        '-pix_fmt',
+        'rgb24',
+        '-s',
+        f'{columns * width}x{rows * height}',
+        '-i',
+        '-',
+        '-frames:v',
+        '1',
+        f'{output_file}',
+    ]
+    return subprocess.run(ffmpeg_command, input=grid.tobytes(), check=False).returncode
+
+
 # Calculate the amount of thumbnails
 grid_size = args.grid_size.split('x')
 try:
@@ -221,6 +345,16 @@ if not args.skip_confirmation:
     if not confirm:
         sys.exit()
 
+if args.mode == 'direct':
+    width, height = get_thumbnail_dimensions(get_video_stream(info), thumbnail_size)
+    start_seconds = get_sec(video_start_time)
+    # Sample in the middle of every interval, to stay away from the very last frame.
+    timestamps = [start_seconds + interval * (i + 0.5) for i in range(thumbnails_count)]
+    if make_grid_direct(timestamps, int(grid_size[0]), int(grid_size[1]), width, height, args.output_file) != 0:
+        print('Grid encoding failed, no grid was created.')
+        sys.exit(1)
+    sys.exit()
+
 tmp_dir = tempfile.TemporaryDirectory()
 
 
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2025 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Benchmark loading the tasks of a user from the mock Kitsu server.
+
+Compares the previous loading of the Blender Kitsu add-on, a single blocking
+all_tasks_to_do() request on the main thread, with its background TaskListLoader,
+which also fetches the task statuses and entities shown in the task list.
+While the loader runs, the main thread keeps ticking like Blender's timers would,
+and the longest gap between two ticks is reported as the main thread stall.
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict
+
+import gazu
+
+from mock_server import add_fixture_arguments, load_fixtures, start_server
+
+LOADER_PATH = (
+    Path(__file__).parents[2] / "scripts-blender/addons/blender_kitsu/tasks/loader.py"
+)
+# Same interval in which Blender polls the loader.
+POLL_INTERVAL = 0.1
+TICK_INTERVAL = 0.01
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="[%(levelname)s] %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+
+
+def import_loader():
+    # Import the module on its own, the add-on package can only be imported in Blender.
+    spec = importlib.util.spec_from_file_location("kitsu_task_loader", LOADER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def server_request(url: str, method: str = "GET") -> Dict[str, Any]:
+    request = urllib.request.Request(url, method=method)
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def load_blocking() -> Dict[str, Any]:
+    """Load tasks the way the add-on did before the loader, with one request on the main thread."""
+    start = time.perf_counter()
+    tasks = gazu.user.all_tasks_to_do()
+    total = time.perf_counter() - start
+    return {
+        "tasks": len(tasks),
+        # Entities weren't loaded, the task list only showed what the tasks contain.
+        "entities": 0,
+        "first_tasks": total,
+        "total": total,
+        # The request blocks the main thread.
+        "max_stall": total,
+    }
+
+
+def load_background(loader_module, max_workers: int) -> Dict[str, Any]:
+    """Load tasks with the TaskListLoader, polling it from the main thread."""
+    start = time.perf_counter()
+    loader = loader_module.TaskListLoader(max_workers=max_workers)
+    loader.start()
+
+    first_tasks = None
+    task_count = 0
+    entity_count = 0
+    max_stall = 0.0
+    last_tick = last_poll = time.perf_counter()
+    while not loader.done:
+        time.sleep(TICK_INTERVAL)
+        now = time.perf_counter()
+        max_stall = max(max_stall, now - last_tick - TICK_INTERVAL)
+        last_tick = now
+        if now - last_poll < POLL_INTERVAL:
+            continue
+        last_poll = now
+
+        for kind, payload in loader.poll():
+            if kind == loader_module.MSG_TASKS:
+                first_tasks = time.perf_counter() - start
+                task_count = len(payload)
+            elif kind == loader_module.MSG_ENTITIES:
+                entity_count = len(payload)
+            elif kind == loader_module.MSG_ERROR:
+                raise payload
+        # Don't count the time spent handling messages as latency of the loader.
+        last_tick = time.perf_counter()
+
+    return {
+        "tasks": task_count,
+        "entities": entity_count,
+        "first_tasks": first_tasks,
+        "total": time.perf_counter() - start,
+        "max_stall": max_stall,
+    }
+
+
+def run(name: str, server, func, *args) -> Dict[str, Any]:
+    server_request(f"{server.url}/stats/reset", method="POST")
+    result = func(*args)
+    result["requests"] = server_request(f"{server.url}/stats")["total"]
+    logging.info(
+        "%-10s %5i requests, %4i tasks, %4i entities, first tasks %.3fs, total %.3fs, "
+        "max main thread stall %.3fs",
+        name,
+        result["requests"],
+        result["tasks"],
+        result["entities"],
+        result["first_tasks"] or 0.0,
+        result["total"],
+        result["max_stall"],
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="Threads used by the loader")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of each method")
+    add_fixture_arguments(parser)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args)
+    server = start_server(fixtures, latency=args.latency)
+    logging.info(
+        "Mock server with %i tasks and %.0fms latency at %s",
+        len(fixtures["tasks"]),
+        args.latency * 1000,
+        server.url,
+    )
+
+    gazu.set_host(f"{server.url}/api")
+    gazu.log_in(fixtures["user"]["email"], "password")
+    loader_module = import_loader()
+
+    for _ in range(args.repeat):
+        run("blocking", server, load_blocking)
+        run("background", server, load_background, loader_module, args.workers)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: 2025 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Deterministic fixture data for the mock Kitsu server."""
+
+import random
+import uuid
+from typing import Any, Dict, List
+
+TASK_STATUSES = [
+    ("Todo", "todo", False),
+    ("Work In Progress", "wip", False),
+    ("Waiting For Approval", "wfa", False),
+    ("Retake", "retake", False),
+    ("Done", "done", True),
+]
+SHOT_TASK_TYPES = ["Layout", "Animation", "Lighting", "Rendering"]
+ASSET_TASK_TYPES = ["Modeling", "Shading", "Rigging"]
+ASSET_TYPES = ["Characters", "Props", "Sets"]
+
+
+def generate_fixtures(
+    task_count: int = 500,
+    project_count: int = 2,
+    shots_per_sequence: int = 20,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Returns the data of a production with task_count tasks assigned to one user.
+    Roughly two thirds of the tasks are shot tasks, the rest are asset tasks."""
+    rng = random.Random(seed)
+
+    def new_id() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128)))
+
+    user = {
+        "id": new_id(),
+        "type": "Person",
+        "first_name": "Mock",
+        "last_name": "Artist",
+        "full_name": "Mock Artist",
+        "email": "artist@example.com",
+        "role": "user",
+        "active": True,
+    }
+    task_statuses = [
+        {
+            "id": new_id(),
+            "type": "TaskStatus",
+            "name": name,
+            "short_name": short_name,
+            "is_done": is_done,
+            "color": "#999999",
+        }
+        for name, short_name, is_done in TASK_STATUSES
+    ]
+    task_types = [
+        {"id": new_id(), "type": "TaskType", "name": name, "for_entity": for_entity}
+        for names, for_entity in ((SHOT_TASK_TYPES, "Shot"), (ASSET_TASK_TYPES, "Asset"))
+        for name in names
+    ]
+    asset_types = [{"id": new_id(), "type": "AssetType", "name": name} for name in ASSET_TYPES]
+
+    projects: List[Dict[str, Any]] = []
+    sequences: List[Dict[str, Any]] = []
+    shots: List[Dict[str, Any]] = []
+    assets: List[Dict[str, Any]] = []
+    tasks: List[Dict[str, Any]] = []
+
+    shot_task_types = [t for t in task_types if t["for_entity"] == "Shot"]
+    asset_task_types = [t for t in task_types if t["for_entity"] == "Asset"]
+    tasks_per_project = task_count // project_count + 1
+
+    for project_index in range(project_count):
+        project = {
+            "id": new_id(),
+            "type": "Project",
+            "name": f"Project {project_index + 1:02}",
+            "production_type": "short",
+        }
+        projects.append(project)
+
+        # Each entity gets one task per task type, so there are enough entities
+        # that most tasks refer to a different one.
+        shot_task_count = tasks_per_project * 2 // 3
+        shot_count = shot_task_count // len(shot_task_types) + 1
+        asset_count = (tasks_per_project - shot_task_count) // len(asset_task_types) + 1
+
+        project_shots = []
+        for shot_index in range(shot_count):
+            if shot_index % shots_per_sequence == 0:
+                sequence = {
+                    "id": new_id(),
+                    "type": "Sequence",
+                    "name": f"{len(sequences) + 1:03}",
+                    "project_id": project["id"],
+                }
+                sequences.append(sequence)
+            shot = {
+                "id": new_id(),
+                "type": "Shot",
+                "name": f"{sequence['name']}_{(shot_index % shots_per_sequence + 1) * 10:04}",
+                "project_id": project["id"],
+                "parent_id": sequence["id"],
+                "sequence_name": sequence["name"],
+                "nb_frames": rng.randint(24, 240),
+                "data": {},
+            }
+            project_shots.append(shot)
+
+        project_assets = []
+        for asset_index in range(asset_count):
+            asset_type = asset_types[asset_index % len(asset_types)]
+            asset = {
+                "id": new_id(),
+                "type": "Asset",
+                "name": f"{asset_type['name'][:-1].lower()}_{asset_index:03}",
+                "project_id": project["id"],
+                "entity_type_id": asset_type["id"],
+                "asset_type_name": asset_type["name"],
+                "data": {},
+            }
+            project_assets.append(asset)
+
+        entity_tasks = [
+            (shot, task_type, "Shot") for shot in project_shots for task_type in shot_task_types
+        ][:shot_task_count] + [
+            (asset, task_type, asset["asset_type_name"])
+            for asset in project_assets
+            for task_type in asset_task_types
+        ][: tasks_per_project - shot_task_count]
+
+        for entity, task_type, entity_type_name in entity_tasks:
+            if len(tasks) == task_count:
+                break
+            task_status = rng.choice(task_statuses)
+            tasks.append(
+                {
+                    "id": new_id(),
+                    "type": "Task",
+                    "name": "main",
+                    "project_id": project["id"],
+                    "project_name": project["name"],
+                    "task_type_id": task_type["id"],
+                    "task_type_name": task_type["name"],
+                    "task_status_id": task_status["id"],
+                    "task_status_name": task_status["name"],
+                    "task_status_short_name": task_status["short_name"],
+                    "entity_id": entity["id"],
+                    "entity_name": entity["name"],
+                    "entity_type_name": entity_type_name,
+                    "sequence_name": entity.get("sequence_name", ""),
+                    "assignees": [user["id"]],
+                }
+            )
+
+        shots.extend(project_shots)
+        assets.extend(project_assets)
+
+    return {
+        "user": user,
+        "projects": projects,
+        "task_statuses": task_statuses,
+        "task_types": task_types,
+        "asset_types": asset_types,
+        "sequences": sequences,
+        "shots": shots,
+        "assets": assets,
+        "tasks": tasks,
+    }
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2025 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Minimal Kitsu API server serving fixture data, for benchmarking clients without network.
+
+Implements the read-only routes that gazu uses to load the tasks of a user and the
+entities they refer to. Every request waits for a configurable latency, and requests
+are counted per route. The counters are served outside of the API:
+    GET  /stats        request counts per route
+    POST /stats/reset  reset the counters
+"""
+
+import argparse
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from fixtures import generate_fixtures
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="[%(levelname)s] %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+
+
+class KitsuMockData:
+    """Fixture data indexed for the API routes."""
+
+    def __init__(self, fixtures: Dict[str, Any]):
+        self.fixtures = fixtures
+        self.user = fixtures["user"]
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        for key in ("projects", "task_statuses", "task_types", "asset_types"):
+            self.by_id.update({e["id"]: e for e in fixtures[key]})
+        for key in ("sequences", "shots", "assets", "tasks"):
+            self.by_id.update({e["id"]: e for e in fixtures[key]})
+
+        self.project_entities: Dict[Tuple[str, str], list] = {}
+        for route, key in (("sequences", "sequences"), ("shots", "shots"), ("assets", "assets")):
+            for entity in fixtures[key]:
+                self.project_entities.setdefault((entity["project_id"], route), []).append(entity)
+
+        self.collections = {
+            "projects": fixtures["projects"],
+            "task-status": fixtures["task_statuses"],
+            "task-types": fixtures["task_types"],
+            "asset-types": fixtures["asset_types"],
+            "user/tasks": fixtures["tasks"],
+        }
+        self.entity_routes = {
+            "projects",
+            "task-status",
+            "task-types",
+            "asset-types",
+            "sequences",
+            "shots",
+            "assets",
+            "tasks",
+            "entities",
+        }
+
+    def get(self, path: str) -> Tuple[str, Optional[Any]]:
+        """Returns the route name and the response for an API path, None if not found."""
+        if path in ("", "/"):
+            return "api", {"api": "Zou", "version": "mock"}
+        if path == "auth/authenticated":
+            return path, {"authenticated": True, "user": self.user}
+        if not path.startswith("data/"):
+            return path, None
+        path = path[len("data/") :]
+
+        if path in self.collections:
+            return f"data/{path}", self.collections[path]
+
+        match = re.fullmatch(r"projects/([^/]+)/(sequences|shots|assets)", path)
+        if match:
+            project_id, route = match.groups()
+            if project_id not in self.by_id:
+                return f"data/projects/<id>/{route}", None
+            return f"data/projects/<id>/{route}", self.project_entities.get(
+                (project_id, route), []
+            )
+
+        match = re.fullmatch(r"([a-z\-]+)/([^/]+)", path)
+        if match and match.group(1) in self.entity_routes:
+            route, entity_id = match.groups()
+            return f"data/{route}/<id>", self.by_id.get(entity_id)
+
+        return f"data/{path}", None
+
+
+class KitsuMockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, data: KitsuMockData, latency: float = 0.0):
+        super().__init__(address, KitsuMockHandler)
+        self.data = data
+        self.latency = latency
+        self.request_counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self, route: str) -> None:
+        with self._lock:
+            self.request_counts[route] += 1
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.request_counts.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.request_counts)
+        return {"total": sum(counts.values()), "routes": counts}
+
+
+class KitsuMockHandler(BaseHTTPRequestHandler):
+    server: KitsuMockServer
+
+    def log_message(self, format, *args):
+        logging.debug(format, *args)
+
+    def send_json(self, data: Any, status: int = 200) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def api_path(self) -> Optional[str]:
+        path = self.path.split("?", 1)[0]
+        if path != "/api" and not path.startswith("/api/"):
+            return None
+        return path[len("/api/") :].rstrip("/")
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.send_json(self.server.get_stats())
+            return
+
+        path = self.api_path()
+        if path is None:
+            self.send_json({"message": "Not found"}, 404)
+            return
+
+        route, response = self.server.data.get(path)
+        self.server.count_request(route)
+        time.sleep(self.server.latency)
+        if response is None:
+            logging.warning("No mock data for GET %s", self.path)
+            self.send_json({"message": "Not found"}, 404)
+            return
+        self.send_json(response)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+
+        if self.path == "/stats/reset":
+            self.server.reset_stats()
+            self.send_json({})
+            return
+
+        path = self.api_path()
+        self.server.count_request(path or self.path)
+        time.sleep(self.server.latency)
+        if path == "auth/login":
+            self.send_json(
+                {
+                    "login": True,
+                    "user": self.server.data.user,
+                    "access_token": "mock-access-token",
+                    "refresh_token": "mock-refresh-token",
+                }
+            )
+            return
+        self.send_json({"message": "Not found"}, 404)
+
+
+def start_server(
+    fixtures: Dict[str, Any], host: str = "127.0.0.1", port: int = 0, latency: float = 0.0
+) -> KitsuMockServer:
+    """Start serving in a background thread. Port 0 picks a free port."""
+    server = KitsuMockServer((host, port), KitsuMockData(fixtures), latency=latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def load_fixtures(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.fixtures:
+        return json.loads(Path(args.fixtures).read_text())
+    return generate_fixtures(task_count=args.tasks, project_count=args.projects, seed=args.seed)
+
+
+def add_fixture_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--fixtures", help="JSON file with fixture data, generated if not set")
+    parser.add_argument("--tasks", type=int, default=500, help="Number of generated user tasks")
+    parser.add_argument("--projects", type=int, default=2, help="Number of generated projects")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated fixtures")
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Seconds each request waits before responding"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--dump-fixtures", help="Write the fixture data to this JSON file and exit")
+    add_fixture_arguments(parser)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args)
+    if args.dump_fixtures:
+        Path(args.dump_fixtures).write_text(json.dumps(fixtures, indent=2))
+        logging.info("Wrote fixtures to %s", args.dump_fixtures)
+        return
+
+    server = KitsuMockServer((args.host, args.port), KitsuMockData(fixtures), latency=args.latency)
+    logging.info(
+        "Serving %i tasks for %s at %s/api",
+        len(fixtures["tasks"]),
+        fixtures["user"]["email"],
+        server.url,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# SPDX-FileCopyrightText: 2025 Blender Studio Tools Authors
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Benchmark saving and pushing a Pose Key of the Pose Shape Keys add-on on a dense mesh.
+
+Builds a grid deformed by a posed armature, saves its Pose Key, sculpts a corrective
+change on a part of the stored shape and pushes it into a shape key. Run with:
+    blender --background --factory-startup --python benchmark.py -- --vertices 100000
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import addon_utils
+import bpy
+import numpy as np
+
+ADDONS_DIR = Path(__file__).resolve().parents[2] / "scripts-blender" / "addons"
+ADDON_NAME = "pose_shape_keys"
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vertices", type=int, default=100_000, help="Vertex count of the mesh")
+    parser.add_argument(
+        "--moved",
+        type=float,
+        default=0.05,
+        help="Fraction of the vertices moved by the corrective change",
+    )
+    parser.add_argument(
+        "--targets", type=int, default=4, help="Number of target shape keys of the Pose Key"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of each operator")
+    return parser.parse_args(argv)
+
+
+def enable_addon():
+    sys.path.insert(0, str(ADDONS_DIR))
+    addon_utils.enable(ADDON_NAME, default_set=True, handle_error=None)
+
+
+def build_scene(vertex_count: int, target_count: int) -> bpy.types.Object:
+    """Return a grid mesh with vertex_count vertices, deformed by a posed one bone armature,
+    with a Pose Key that has an action and target_count target shape keys."""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    scene = bpy.context.scene
+
+    side = math.ceil(math.sqrt(vertex_count))
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=side, y_subdivisions=side, size=2)
+    mesh_ob = bpy.context.object
+
+    arm_data = bpy.data.armatures.new("Rig")
+    rig = bpy.data.objects.new("Rig", arm_data)
+    scene.collection.objects.link(rig)
+    bpy.context.view_layer.objects.active = rig
+    bpy.ops.object.mode_set(mode='EDIT')
+    bone = arm_data.edit_bones.new("Bone")
+    bone.head = (0, 0, 0)
+    bone.tail = (0, 0, 1)
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    vgroup = mesh_ob.vertex_groups.new(name="Bone")
+    vgroup.add(range(len(mesh_ob.data.vertices)), 1.0, 'REPLACE')
+    mod = mesh_ob.modifiers.new("Armature", 'ARMATURE')
+    mod.object = rig
+
+    # The pose of the Pose Key, keyed on frame 1.
+    action = bpy.data.actions.new("Pose")
+    rig.animation_data_create()
+    rig.animation_data.action = action
+    pose_bone = rig.pose.bones["Bone"]
+    pose_bone.rotation_mode = 'XYZ'
+    pose_bone.rotation_euler = (0.4, 0.2, 0.1)
+    pose_bone.keyframe_insert("rotation_euler", frame=1)
+    scene.frame_set(1)
+
+    mesh_ob.shape_key_add(name="Basis")
+    target_names = [f"Corrective.{i:02}" for i in range(target_count)]
+    for name in target_names:
+        mesh_ob.shape_key_add(name=name)
+
+    bpy.context.view_layer.objects.active = mesh_ob
+    pose_key = mesh_ob.data.pose_keys.add()
+    pose_key.name = "Pose"
+    pose_key.action = action
+    pose_key.frame = 1
+    for name in target_names:
+        target = pose_key.target_shapes.add()
+        target.name = name
+    mesh_ob.data.active_pose_key_index = 0
+    return mesh_ob
+
+
+def sculpt_storage(mesh_ob: bpy.types.Object, moved_fraction: float) -> int:
+    """Offset a part of the vertices of the stored shape, like a corrective sculpt would.
+    Return the number of moved vertices."""
+    storage_ob = mesh_ob.data.pose_keys[0].storage_object
+    key_block = storage_ob.data.shape_keys.key_blocks["New Changes"]
+    coords = np.empty(len(key_block.data) * 3, dtype=np.float32)
+    key_block.data.foreach_get("co", coords)
+    coords = coords.reshape(-1, 3)
+    moved_count = int(len(coords) * moved_fraction)
+    coords[:moved_count, 2] += 0.1
+    key_block.data.foreach_set("co", coords.ravel())
+    storage_ob.data.update()
+    return moved_count
+
+
+def time_operator(operator, mesh_ob: bpy.types.Object) -> float:
+    bpy.context.view_layer.objects.active = mesh_ob
+    start = time.perf_counter()
+    result = operator()
+    duration = time.perf_counter() - start
+    if result != {'FINISHED'}:
+        raise RuntimeError(f"{operator} returned {result}")
+    return duration
+
+
+def time_full_crazyspace(mesh_ob: bpy.types.Object) -> float:
+    """Time converting the displacement of every vertex, as done before unmoved vertices were skipped."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    start = time.perf_counter()
+    mesh_ob.crazyspace_eval(depsgraph, bpy.context.scene)
+    for i in range(len(mesh_ob.data.vertices)):
+        mesh_ob.crazyspace_displacement_to_original(vertex_index=i, displacement=(0, 0, 0.1))
+    mesh_ob.crazyspace_eval_clear()
+    return time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    enable_addon()
+    mesh_ob = build_scene(args.vertices, args.targets)
+    print(f"Mesh with {len(mesh_ob.data.vertices)} vertices and {args.targets} target shape keys")
+
+    save_times = [time_operator(bpy.ops.object.posekey_save, mesh_ob) for _ in range(args.repeat)]
+    moved_count = sculpt_storage(mesh_ob, args.moved)
+    push_times = [time_operator(bpy.ops.object.posekey_push, mesh_ob) for _ in range(args.repeat)]
+    full_crazyspace_time = time_full_crazyspace(mesh_ob)
+
+    print(f"Save Pose Key: {min(save_times):.3f}s (best of {args.repeat})")
+    print(f"Push Pose Key: {min(push_times):.3f}s (best of {args.repeat}, {moved_count} moved vertices)")
+    print(f"Crazyspace conversion of all vertices: {full_crazyspace_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ film project, to visually detect spikes in render time.
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 import csv
 import datetime
 import json
@@ -17,9 +18,11 @@ import os
 import re
 from pathlib import Path
 import shutil
+import struct
 import subprocess
 import sys
 import tempfile
+import zlib
 
 
 parser = argparse.ArgumentParser(description='Generate shots stats.')
@@ -30,7 +33,7 @@ parser.add_argument('-f', '--framerate', help='Framerate', default=24)
 parser.add_argument('--image_format', help='Either PNG or EXR', default='PNG')
 parser.add_argument('--memory_unit', default='G')
 parser.add_argument('--render_time_unit', help='How display render time', default='m')
-args = parser.parse_args()
+parser.add_argument('-j', '--jobs', help='Number of processes used to read frame metadata', type=int, default=None)
 
 
 def which(command):
@@ -45,26 +48,132 @@ def which(command):
 toolset = {
     'ffmpeg': os.environ.get('FFMPEG_BIN', 'ffmpeg'),
     'ffprobe': os.environ.get('FFPROBE_BIN', 'ffprobe'),
-    'exrheader': os.environ.get('EXRHEADER_BIN', 'exrheader'),
     'gnuplot': os.environ.get('GNUPLOT_BIN', 'gnuplot'),
     'identify': os.environ.get('IDENTIFY_BIN', 'identify'),
 }
 
 # Get render time and memory from frames
 
-# If exr, use exrheader (we will also need jpeg previews later)
-
-
-def parse_metadata(metadata_string: str):
-    if args.image_format == 'EXR':
-        # Metadata looks like this:
-        # Memory (type string): "0.00M"
-        re_result = re.search('"(.*)"', metadata_string)
-        return re_result.group(1)
-    elif args.image_format == 'PNG':
-        # Metadata looks like this:
-        #     Memory: 0.00M
-        return metadata_string.split(':', 1)[1].strip()
+# Metadata is read directly from the file headers, only the EXR header attributes
+# and the PNG text chunks are parsed, pixel data is never decoded.
+
+METADATA_KEYS = {'Memory', 'RenderTime', 'Frame'}
+EXR_MAGIC = 20000630
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+READ_CHUNK_SIZE = 16 * 1024
+
+
+class HeaderReader:
+    """Minimal buffered reader to walk binary headers without reading the whole file."""
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.buffer = b''
+        self.pos = 0
+
+    def _fill(self, size):
+        while len(self.buffer) - self.pos < size:
+            data = self.fp.read(READ_CHUNK_SIZE)
+            if not data:
+                raise EOFError('Unexpected end of file while reading header')
+            self.buffer = self.buffer[self.pos:] + data
+            self.pos = 0
+
+    def read(self, size):
+        self._fill(size)
+        data = self.buffer[self.pos:self.pos + size]
+        self.pos += size
+        return data
+
+    def read_null_terminated(self):
+        while True:
+            end = self.buffer.find(b'\0', self.pos)
+            if end != -1:
+                data = self.buffer[self.pos:end]
+                self.pos = end + 1
+                return data
+            self._fill(len(self.buffer) - self.pos + 1)
+
+
+def read_exr_metadata(path):
+    """Read string, int and float attributes from the (first part) header of an EXR file."""
+    metadata = {}
+    with open(path, 'rb') as fp:
+        reader = HeaderReader(fp)
+        magic, _version = struct.unpack('<ii', reader.read(8))
+        if magic != EXR_MAGIC:
+            raise ValueError(f'{path} is not an OpenEXR file')
+
+        while True:
+            name = reader.read_null_terminated()
+            if not name:
+                # Empty name marks the end of the header.
+                break
+            attribute_type = reader.read_null_terminated()
+            (size,) = struct.unpack('<i', reader.read(4))
+            value = reader.read(size)
+
+            name = name.decode('utf-8', 'replace')
+            if attribute_type == b'string':
+                metadata[name] = value.decode('utf-8', 'replace')
+            elif attribute_type == b'int':
+                metadata[name] = str(struct.unpack('<i', value)[0])
+            elif attribute_type == b'float':
+                metadata[name] = str(struct.unpack('<f', value)[0])
+    return metadata
+
+
+def read_png_metadata(path, keys=METADATA_KEYS):
+    """Read tEXt, zTXt and iTXt chunks of a PNG file, seeking over all other chunks.
+
+    Stops as soon as all requested keys were found.
+    """
+    metadata = {}
+    with open(path, 'rb') as fp:
+        if fp.read(8) != PNG_SIGNATURE:
+            raise ValueError(f'{path} is not a PNG file')
+
+        while True:
+            chunk_header = fp.read(8)
+            if len(chunk_header) < 8:
+                break
+            length, chunk_type = struct.unpack('>I4s', chunk_header)
+            if chunk_type == b'IEND':
+                break
+            if chunk_type not in {b'tEXt', b'zTXt', b'iTXt'}:
+                # Skip chunk data and CRC.
+                fp.seek(length + 4, os.SEEK_CUR)
+                continue
+
+            data = fp.read(length)
+            fp.seek(4, os.SEEK_CUR)
+            key, _, value = data.partition(b'\0')
+            if chunk_type == b'tEXt':
+                text = value.decode('latin-1')
+            elif chunk_type == b'zTXt':
+                # First byte is the compression method, always zlib.
+                text = zlib.decompress(value[1:]).decode('latin-1')
+            else:
+                compressed = value[0]
+                _language, _, value = value[2:].partition(b'\0')
+                _translated_key, _, value = value.partition(b'\0')
+                text = (zlib.decompress(value) if compressed else value).decode('utf-8', 'replace')
+
+            metadata[key.decode('latin-1')] = text
+            if keys and keys.issubset(metadata):
+                break
+    return metadata
+
+
+def read_frame_metadata(frame, image_format):
+    """Worker function, returns (frame, metadata) so it can run in a process pool."""
+    try:
+        if image_format == 'EXR':
+            return frame, read_exr_metadata(frame)
+        return frame, read_png_metadata(frame)
+    except (OSError, ValueError, EOFError, struct.error, zlib.error) as err:
+        print(f'Could not read metadata of {frame}: {err}')
+        return frame, {}
 
 
 def parse_memory(memory: str):
@@ -72,7 +181,6 @@ def parse_memory(memory: str):
 
     We strip the last char, and assume it's M. Then we cast to float.
     """
-    memory = parse_metadata(memory)
     memory_in_mb = float(memory[:-1])
     if args.memory_unit == 'G':
         m = memory_in_mb / 1024
@@ -83,7 +191,6 @@ def parse_memory(memory: str):
 
 def parse_render_time(time_metadata):
     """Get the render time in seconds."""
-    time_metadata = parse_metadata(time_metadata)
     time_array = time_metadata.split(':')
     if len(time_array) < 2:  # Only seconds
         time_in_seconds = float(time_metadata)
@@ -103,206 +210,220 @@ def parse_render_time(time_metadata):
 
 def parse_frame_number(frame_number_metadata):
     """Get the frame number."""
-    frame_number_metadata = parse_metadata(frame_number_metadata)
     return int(frame_number_metadata)
 
 
-def parse_exr_frames(frames_list):
-    """Parse EXR frames using the 'exrheader' command."""
-    frames_stats = []
-    for frame in frames_list:
-        exrheader_command = [
-            toolset['exrheader'],
-            frame
-        ]
-        p = subprocess.Popen(exrheader_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        out, err = p.communicate()
-
-        lines = iter(out.decode('utf-8').splitlines())
-        frame_stats = {
-            'name': frame.stem,
-            'frame_number': 0,
-            'memory_in_mb': 0,
-            'render_time_in_s': 0
-        }
-        for line in lines:
-            if line.startswith('Memory'):
-                frame_stats['memory_in_mb'] = parse_memory(line)
-            elif line.startswith('RenderTime'):
-                frame_stats['render_time_in_s'] = parse_render_time(line)
-            elif line.startswith('Frame'):
-                frame_stats['frame_number'] = parse_frame_number(line)
-        frames_stats.append(frame_stats)
+def frame_stats_from_metadata(frame, metadata):
+    frame_stats = {
+        'name': frame.stem,
+        'frame_number': 0,
+        'memory_in_mb': 0,
+        'render_time_in_s': 0
+    }
+    if 'Memory' in metadata:
+        frame_stats['memory_in_mb'] = parse_memory(metadata['Memory'])
+    if 'RenderTime' in metadata:
+        frame_stats['render_time_in_s'] = parse_render_time(metadata['RenderTime'])
+    if args.image_format == 'EXR':
+        if 'Frame' in metadata:
+            frame_stats['frame_number'] = parse_frame_number(metadata['Frame'])
+    else:
+        frame_stats['frame_number'] = int(frame.stem)
+    return frame_stats
 
-    return frames_stats
 
+def parse_frames(frames_list, on_frame_stats):
+    """Read metadata of all frames across a process pool.
 
-# If png use identify -verbose
-def parse_png_frames(frames_list):
+    Results are passed to on_frame_stats in input order, as soon as they are available.
+    """
     frames_stats = []
-    for frame in frames_list:
-        identify_command = [
-            toolset['identify'],
-            '-verbose',
-            frame
-        ]
-        p = subprocess.Popen(identify_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        out, err = p.communicate()
-        lines = iter(out.decode('utf-8').splitlines())
-        frame_stats = {
-            'name': frame.stem,
-            'frame_number': 0,
-            'memory_in_mb': 0,
-            'render_time_in_s': 0
-        }
-        for line in lines:
-            line = line.strip()
-            if line.startswith('Memory'):
-                frame_stats['memory_in_mb'] = parse_memory(line)
-            elif line.startswith('RenderTime'):
-                frame_stats['render_time_in_s'] = parse_render_time(line)
-            # elif line.startswith('Frame'):
-            #     frame_stats['frame_number'] = parse_frame_number(line)
-            frame_stats['frame_number'] = int(frame.stem)
-        print(f"Frame {frame_stats['frame_number']}: {frame_stats['memory_in_mb']} - {frame_stats['render_time_in_s']}")
-        frames_stats.append(frame_stats)
+    chunksize = max(1, len(frames_list) // ((args.jobs or os.cpu_count() or 1) * 8))
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        results = executor.map(
+            read_frame_metadata, frames_list, [args.image_format] * len(frames_list), chunksize=chunksize
+        )
+        for frame, metadata in results:
+            frame_stats = frame_stats_from_metadata(frame, metadata)
+            print(f"Frame {frame_stats['frame_number']}: {frame_stats['memory_in_mb']} - {frame_stats['render_time_in_s']}")
+            on_frame_stats(frame_stats)
+            frames_stats.append(frame_stats)
 
     return frames_stats
 
 
-# Get current directory
-cwd = Path.cwd()
+FRAMES_STATS_FIELDNAMES = ['frame_number', 'name', 'memory_in_mb', 'render_time_in_s']
 
-# Get absolute path of input dir (if relative it will be combined with cwd)
-in_dir_absolute_path = cwd.joinpath(args.in_path)
 
-# Look for files (png or exr)
-frames = sorted(in_dir_absolute_path.glob(f'*.{args.image_format.lower()}'))
+def read_frames_stats_csv(frames_stats_path):
+    if not frames_stats_path.exists():
+        return []
+    with open(frames_stats_path) as csvfile:
+        reader = csv.DictReader(csvfile, delimiter='\t')
+        return [row for row in reader]
 
 
-frames_stats_path = in_dir_absolute_path.parent / f'{in_dir_absolute_path.name}-frames_stats.csv'
+def write_frames_stats_csv(frames_stats_path, stats):
+    with open(frames_stats_path, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=FRAMES_STATS_FIELDNAMES, delimiter='\t')
+        writer.writeheader()
+        for s in stats:
+            writer.writerow(s)
 
 
-def get_frame_stats():
-    if frames_stats_path.exists():
-        with open(frames_stats_path) as csvfile:
-            reader = csv.DictReader(csvfile, delimiter='\t')
-            return [row for row in reader]
-    if frames:
-        if args.image_format == 'EXR':
-            stats = parse_exr_frames(frames)
-        elif args.image_format == 'PNG':
-            stats = parse_png_frames(frames)
-        with open(frames_stats_path, 'w', newline='') as csvfile:
-            fieldnames = ['frame_number', 'name', 'memory_in_mb', 'render_time_in_s']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter='\t')
+def get_frame_stats(frames, frames_stats_path):
+    """Return stats of all frames, reading metadata only of frames not yet in the csv file.
 
-            writer.writeheader()
-            for s in stats:
-                writer.writerow(s)
-            print(f'{frames_stats_path} is ready.')
-            return stats
-    else:
+    New rows are appended to the csv file while they are read, so an interrupted run
+    does not have to start over.
+    """
+    stats = read_frames_stats_csv(frames_stats_path)
+    known_names = {row['name'] for row in stats}
+    new_frames = [frame for frame in frames if frame.stem not in known_names]
+
+    if not stats and not new_frames:
         print(f'No {args.image_format} images found.')
         sys.exit()
 
+    if new_frames:
+        print(f'Reading metadata of {len(new_frames)} new frames ({len(stats)} already known).')
+        write_header = not frames_stats_path.exists()
+        with open(frames_stats_path, 'a', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FRAMES_STATS_FIELDNAMES, delimiter='\t')
+            if write_header:
+                writer.writeheader()
 
-stats = get_frame_stats()
-# Get frame resolution
+            def on_frame_stats(frame_stats):
+                writer.writerow(frame_stats)
+                csvfile.flush()
 
-# TODO(fsiddi) handle missing image
-first_frame = frames[0]
-# If we are working with exr, look for a .jpg file
-if args.image_format == 'EXR':
-    first_frame = frames[0].with_suffix('.jpg')
+            new_stats = parse_frames(new_frames, on_frame_stats)
 
-identify_format = '%[fx:w]x%[fx:h]'
+        in_order = not stats or not new_stats or stats[-1]['name'] < new_stats[0]['name']
+        stats.extend(new_stats)
+        if not in_order:
+            # New frames were inserted in between, keep the csv sorted for the chart.
+            stats.sort(key=lambda row: row['name'])
+            write_frames_stats_csv(frames_stats_path, stats)
 
-identify_command = [
-    'identify',
-    '-format',
-    identify_format,
-    first_frame
-]
+    print(f'{frames_stats_path} is ready.')
+    return stats
 
-p = subprocess.Popen(identify_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-out, err = p.communicate()
 
-result = out.decode('utf-8').splitlines()[0]
-frame_width, frame_height = result.split('x')
+def main():
+    # Get current directory
+    cwd = Path.cwd()
 
-# Make chart with memory usage and render time, using the size of frame
+    # Get absolute path of input dir (if relative it will be combined with cwd)
+    in_dir_absolute_path = cwd.joinpath(args.in_path)
 
-# tmp_dir = tempfile.TemporaryDirectory()
-# tmp_dir_path = Path(tmp_dir.name)
-gnuplot_chart_config_path = in_dir_absolute_path.parent / f'{in_dir_absolute_path.name}-gnuplot_chart'
-chart_file_path = in_dir_absolute_path.parent / f'{in_dir_absolute_path.name}-chart.png'
+    # Look for files (png or exr)
+    frames = sorted(in_dir_absolute_path.glob(f'*.{args.image_format.lower()}'))
 
-template_vars = {
-    'tmp_chart_file': chart_file_path,
-    'frames_stats_file': frames_stats_path,
-    'frame_start_number': stats[0]['frame_number'],
-    'width': frame_width,
-    'height': frame_height,
-}
+    frames_stats_path = in_dir_absolute_path.parent / f'{in_dir_absolute_path.name}-frames_stats.csv'
+
+    stats = get_frame_stats(frames, frames_stats_path)
+    # Get frame resolution
 
-with open('gnuplot_chart.tpl') as fp:
-    line = fp.readline()
-    with open(gnuplot_chart_config_path, 'w') as fc:
-        while line:
-            parsed_line = line.format(**template_vars)
-            fc.write(parsed_line)
-            line = fp.readline()
-
-gnuplot_command = [
-    'gnuplot',
-    '-c',
-    gnuplot_chart_config_path,
-]
-
-subprocess.call(gnuplot_command)
-
-#sys.exit()
-
-# Combine the chart with images sequence and overlay the playhead
-# For instance if we have a 260 frames clip
-#
-# 260 frames = 260 / <args.framerate> = 10.83333 seconds
-# video_width / video_duration = 2048 / 10.83333 = 189.04621 pixels / second.
-
-# Arbitrary offset defined by the chart
-chart_margin_x_pixel = 45
-
-chart_width = int(frame_width) - chart_margin_x_pixel - 17
-
-pixel_per_second = chart_width / (len(frames) / args.framerate)
-
-overlay_string = f"overlay, overlay=x='if(gte(t,0), -w+{chart_margin_x_pixel}+(t)*{pixel_per_second}, NAN)':y=0"
-
-# Get the number of the first frame of the sequence
-start_number = stats[0]['frame_number']
-
-output_file_name = f'{in_dir_absolute_path.name}-{datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}.mp4'
-output_file_path = Path(args.out_path) / output_file_name
-
-extension = 'png' if args.image_format == 'PNG' else 'jpg'
-input_path = in_dir_absolute_path.joinpath(f'%6d.{extension}')
-
-ffmpeg_command = [
-    'ffmpeg',
-    '-framerate',
-    f'{args.framerate}',
-    '-start_number',
-    f'{start_number}',
-    '-i',
-    f'{input_path}',
-    '-i',
-    f'{chart_file_path}',
-    '-i',
-    'playhead.png',
-    '-filter_complex',
-    f'{overlay_string}',
-    str(output_file_path)
-]
-
-subprocess.call(ffmpeg_command)
+    # TODO(fsiddi) handle missing image
+    first_frame = frames[0]
+    # If we are working with exr, look for a .jpg file
+    if args.image_format == 'EXR':
+        first_frame = frames[0].with_suffix('.jpg')
+
+    identify_format = '%[fx:w]x%[fx:h]'
+
+    identify_command = [
+        'identify',
+        '-format',
+        identify_format,
+        first_frame
+    ]
+
+    p = subprocess.Popen(identify_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    out, err = p.communicate()
+
+    result = out.decode('utf-8').splitlines()[0]
+    frame_width, frame_height = result.split('x')
+
+    # Make chart with memory usage and render time, using the size of frame
+
+    # tmp_dir = tempfile.TemporaryDirectory()
+    # tmp_dir_path = Path(tmp_dir.name)
+    gnuplot_chart_config_path = in_dir_absolute_path.parent / f'{in_dir_absolute_path.name}-gnuplot_chart'
+    chart_file_path = in_dir_absolute_path.parent / f'{in_dir_absolute_path.name}-chart.png'
+
+    template_vars = {
+        'tmp_chart_file': chart_file_path,
+        'frames_stats_file': frames_stats_path,
+        'frame_start_number': stats[0]['frame_number'],
+        'width': frame_width,
+        'height': frame_height,
+    }
+
+    with open('gnuplot_chart.tpl') as fp:
+        line = fp.readline()
+        with open(gnuplot_chart_config_path, 'w') as fc:
+            while line:
+                parsed_line = line.format(**template_vars)
+                fc.write(parsed_line)
+                line = fp.readline()
+
+    gnuplot_command = [
+        'gnuplot',
+        '-c',
+        gnuplot_chart_config_path,
+    ]
+
+    subprocess.call(gnuplot_command)
+
+    # sys.exit()
+
+    # Combine the chart with images sequence and overlay the playhead
+    # For instance if we have a 260 frames clip
+    #
+    # 260 frames = 260 / <args.framerate> = 10.83333 seconds
+    # video_width / video_duration = 2048 / 10.83333 = 189.04621 pixels / second.
+
+    # Arbitrary offset defined by the chart
+    chart_margin_x_pixel = 45
+
+    chart_width = int(frame_width) - chart_margin_x_pixel - 17
+
+    pixel_per_second = chart_width / (len(frames) / args.framerate)
+
+    overlay_string = f"overlay, overlay=x='if(gte(t,0), -w+{chart_margin_x_pixel}+(t)*{pixel_per_second}, NAN)':y=0"
+
+    # Get the number of the first frame of the sequence
+    start_number = stats[0]['frame_number']
+
+    output_file_name = f'{in_dir_absolute_path.name}-{datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}.mp4'
+    output_file_path = Path(args.out_path) / output_file_name
+
+    extension = 'png' if args.image_format == 'PNG' else 'jpg'
+    input_path = in_dir_absolute_path.joinpath(f'%6d.{extension}')
+
+    ffmpeg_command = [
+        'ffmpeg',
+        '-framerate',
+        f'{args.framerate}',
+        '-start_number',
+        f'{start_number}',
+        '-i',
+        f'{input_path}',
+        '-i',
+        f'{chart_file_path}',
+        '-i',
+        'playhead.png',
+        '-filter_complex',
+        f'{overlay_string}',
+        str(output_file_path)
+    ]
+
+    subprocess.call(ffmpeg_command)
+
+
+if __name__ == '__main__':
+    # Parsed here, so processes spawned by the pool do not run the script again.
+    args = parser.parse_args()
+    main()